@@ -4,20 +4,37 @@ Zenith — System Diagnostics Controller (Presentation Layer).
 This module is the Streamlit entrypoint. It captures user input,
 delegates to the Service layer, and renders results via UI renderers.
 No business logic or data access lives here.
+
+Only what every script run draws is imported up front; the service layer
+and result renderers are imported when a diagnosis is first requested.
 """
 
+import hmac
+import uuid
+from typing import TYPE_CHECKING
+
 import streamlit as st
 import streamlit.components.v1 as components
 
 
+from config import (
+    ADMIN_TOKEN,
+    DETAILS_ON_DEMAND,
+    DIAGNOSIS_MODE,
+    SPECULATIVE_PREFETCH,
+    STREAM_RESULTS,
+)
 from domain.models import TelemetryInput
 from domain.exceptions import ZenithException
-from service.diagnostics_service import DiagnosticsService
-from ui.renderers import render_full_results, render_error
 from ui.components import HARDWARE_TOPOLOGY_HTML
-from ui.js_components import AUTO_SCROLL_JS, HOW_TO_USE_DIALOG_HTML
+from ui.js_components import HOW_TO_USE_DIALOG_HTML
 from ui_constants import BRUTALIST_CSS
 
+if TYPE_CHECKING:
+    from repository.deadline import Deadline
+    from service.diagnostics_service import DiagnosticsService
+    from service.speculation import Speculator
+
 # ──────────────────────────────────────────────────────────────
 # 1. PAGE CONFIG (must be first Streamlit call)
 # ──────────────────────────────────────────────────────────────
@@ -28,6 +45,95 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+
+@st.cache_resource(show_spinner=False)
+def get_diagnostics_service() -> "DiagnosticsService":
+    """Build the process-wide service once and share it across sessions."""
+    from metrics import start_metrics_server
+    from service.diagnostics_service import DiagnosticsService
+
+    start_metrics_server()
+    return DiagnosticsService()
+
+
+@st.cache_resource(show_spinner=False)
+def get_speculator() -> "Speculator":
+    """Build the process-wide speculator around the configured diagnosis mode."""
+    from service.speculation import Speculator
+
+    service = get_diagnostics_service()
+    if DIAGNOSIS_MODE == "two_phase":
+        return Speculator(service.triage_diagnostics)
+    if DIAGNOSIS_MODE == "parallel":
+        return Speculator(service.run_parallel_diagnostics)
+    return Speculator(service.run_diagnostics)
+
+
+# Build the shared service on first page load so the Gemini client is
+# warmed up (on a background thread) before anyone clicks. Configuration
+# errors surface on click.
+try:
+    get_diagnostics_service()
+except ZenithException:
+    pass
+
+# Identifies this browser session in the token ledger.
+session_id = st.session_state.setdefault("zenith_session_id", uuid.uuid4().hex)
+
+# Set by the LOAD_OPTIMIZATIONS button of a two-phase diagnosis; the rerun it
+# triggers repeats the (cached) triage and then fetches the details.
+details_requested = st.session_state.pop("zenith_details_requested", False)
+
+
+def request_details() -> None:
+    st.session_state["zenith_details_requested"] = True
+
+
+def hardware_hint(text: str, kind: str, widget_key: str) -> None:
+    """Show the catalog spec of a typed CPU/GPU, or up to three suggestions."""
+    if not (text or "").strip():
+        return
+    from service.telemetry_canonicalizer import (
+        canonicalize_hardware,
+        resolve_hardware,
+        suggest_hardware,
+    )
+    from ui.renderers import render_hardware_hint
+
+    spec = resolve_hardware(canonicalize_hardware(text), kind)
+    suggestions = [] if spec else suggest_hardware(text, kind, limit=3)
+    render_hardware_hint(spec, suggestions, widget_key)
+
+
+def request_deadline() -> "Deadline":
+    """A deadline for this run's diagnosis, cancelled once the session moves on.
+
+    Streamlit only stops a script at its next st.* call, which a blocked
+    diagnosis never reaches, so the deadline itself polls for a pending
+    rerun or stop and for a closed tab; the wait then ends and the call's
+    thread and connection are released.
+    """
+    from repository.deadline import Deadline
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    from streamlit.runtime.scriptrunner.script_requests import ScriptRequestType
+
+    ctx = get_script_run_ctx()
+    if ctx is None or not Runtime.exists():
+        return Deadline()
+    runtime = Runtime.instance()
+    requests = ctx.script_requests
+
+    def moved_on() -> bool:
+        if not runtime.is_active_session(ctx.session_id):
+            return True
+        # No public API reports a pending rerun or stop; _state is private to
+        # the pinned streamlit==1.35.0 (tests/test_streamlit_contract.py).
+        return requests._state != ScriptRequestType.CONTINUE
+
+    return Deadline(abandoned=moved_on)
+
+
 # ──────────────────────────────────────────────────────────────
 # 2. EMBEDDED CSS — Retro CRT / Terminal Aesthetic
 # ──────────────────────────────────────────────────────────────
@@ -109,10 +215,12 @@ with col_right:
     row1_col1, row1_col2 = st.columns(2)
     with row1_col1:
         cpu = st.text_input("CPU TIER", placeholder="e.g. AMD Ryzen 5", key="input_cpu")
+        hardware_hint(cpu, "cpu", "input_cpu")
     with row1_col2:
         gpu = st.text_input(
             "GPU COMPUTE", placeholder="e.g. NVIDIA RTX 3050", key="input_gpu"
         )
+        hardware_hint(gpu, "gpu", "input_gpu")
 
     row2_col1, row2_col2, row2_col3 = st.columns(3)
     with row2_col1:
@@ -159,40 +267,104 @@ with col_right:
 # 5. MAIN EXECUTION (Controller Logic)
 # ──────────────────────────────────────────────────────────────
 
-if diagnose_clicked:
-    # 1. Capture Domain Model Input
-    telemetry = TelemetryInput(
-        cpu=cpu,
-        gpu=gpu,
-        ram=(ram or "").strip() if (ram or "").strip() else "Not specified",
-        storage=storage,
-        os_name=os_name,
-        application=application,
-        symptoms=(symptoms or "").strip()
-        if (symptoms or "").strip()
-        else "Not specified",
+# Capture Domain Model Input on every rerun, so a speculative diagnosis can
+# start while the user is still typing
+telemetry = TelemetryInput(
+    cpu=cpu,
+    gpu=gpu,
+    ram=(ram or "").strip() if (ram or "").strip() else "Not specified",
+    storage=storage,
+    os_name=os_name,
+    application=application,
+    symptoms=(symptoms or "").strip()
+    if (symptoms or "").strip()
+    else "Not specified",
+)
+
+if SPECULATIVE_PREFETCH:
+    try:
+        if diagnose_clicked or details_requested:
+            get_speculator().promote(telemetry, session_id)
+        else:
+            get_speculator().observe(telemetry, session_id)
+    except ZenithException:
+        pass
+
+if diagnose_clicked or details_requested:
+    from ui.renderers import (
+        render_detail_results,
+        render_full_results,
+        render_streaming_results,
+        render_triage_results,
+        render_error,
     )
+    from ui.js_components import AUTO_SCROLL_JS
+    from metrics import request_trace, span
+
+    # 1. Domain Model Input was captured with the form above
 
     try:
-        # 2. Spin up the specific business logic application service
-        service = DiagnosticsService()
-
-        # 3. Present Feedback
-        with st.spinner(""):
-            st.markdown(
-                """
-                <div style="font-family:var(--font-mono); color:var(--text-muted); font-size:0.85rem; text-transform:uppercase; margin-bottom:2rem;">
-                    >>> EXECUTING DIAGNOSTIC PROTOCOL...<br>
-                    [■■■■■■■■■■□□□□□□]
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-            # 4. Invoke Core Domain Use Case
-        result = service.run_diagnostics(telemetry)
-
-        # 5. Render Response
-        render_full_results(result)
+        # 2. Fetch the shared business logic application service, and bound
+        # this request's time (cancelled if the session reruns or closes)
+        service = get_diagnostics_service()
+        deadline = request_deadline()
+
+        # 3. Present Feedback (cleared once the first result section is ready)
+        progress = st.empty()
+        progress.markdown(
+            """
+            <div style="font-family:var(--font-mono); color:var(--text-muted); font-size:0.85rem; text-transform:uppercase; margin-bottom:2rem;">
+                >>> EXECUTING DIAGNOSTIC PROTOCOL...<br>
+                [■■■■■■■■■■□□□□□□]
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        # 4. Invoke Core Domain Use Case and 5. Render Response
+        # (one request trace covers the service call and rendering)
+        with request_trace("ui"):
+            if DIAGNOSIS_MODE == "two_phase":
+                triage = service.triage_diagnostics(telemetry, session_id, deadline)
+                fetch_details = details_requested or not DETAILS_ON_DEMAND
+                if fetch_details:
+                    # Tweaks generate while the verdict is drawn
+                    service.prefetch_details(telemetry, triage, session_id, deadline)
+                progress.empty()
+                with span("render"):
+                    render_triage_results(triage)
+                if fetch_details or triage.is_complete:
+                    with st.spinner(""):
+                        result = service.detail_diagnostics(
+                            telemetry, triage, session_id, deadline
+                        )
+                    with span("render"):
+                        render_detail_results(result)
+                else:
+                    st.button(
+                        ">>> LOAD_OPTIMIZATIONS",
+                        on_click=request_details,
+                        use_container_width=True,
+                    )
+            elif DIAGNOSIS_MODE == "parallel":
+                with st.spinner(""):
+                    result = service.run_parallel_diagnostics(
+                        telemetry, session_id, deadline
+                    )
+                progress.empty()
+                with span("render"):
+                    render_full_results(result)
+            elif STREAM_RESULTS:
+                render_streaming_results(
+                    service.stream_diagnostics(telemetry, session_id, deadline),
+                    progress,
+                )
+            else:
+                with st.spinner(""):
+                    result = service.run_diagnostics(telemetry, session_id, deadline)
+                progress.empty()
+                with span("render"):
+                    render_full_results(result)
         components.html(AUTO_SCROLL_JS, height=0)
 
     except ZenithException as internal_err:
@@ -214,6 +386,16 @@ else:
         unsafe_allow_html=True,
     )
 
+# Token usage admin view, only at ?admin=<ZENITH_ADMIN_TOKEN>
+if ADMIN_TOKEN and hmac.compare_digest(
+    st.query_params.get("admin", "").encode("utf-8"), ADMIN_TOKEN.encode("utf-8")
+):
+    from service.token_ledger import get_shared_ledger
+    from ui.renderers import render_token_admin
+
+    ledger = get_shared_ledger()
+    render_token_admin(ledger.top_sessions(), ledger.by_model(), ledger.by_day())
+
 # ──────────────────────────────────────────────────────────────
 # 6. FOOTER
 # ──────────────────────────────────────────────────────────────
@@ -0,0 +1 @@
+# benchmarks — Reproducible performance benchmarks (run with `python -m benchmarks.<name>`).
@@ -0,0 +1,86 @@
+"""
+Zenith — Gemini Client Reuse Benchmark.
+
+Compares the old per-click behaviour (a fresh GeminiDiagnosticsRepository,
+and therefore a fresh genai.Client and TCP connection, for every request)
+against the shared, warmed-up, keep-alive repository, using the local
+Gemini stand-in. Reports first-request and steady-state latency plus the
+number of TCP connections the server accepted.
+
+The stand-in speaks plain HTTP, so TLS handshake savings against the real
+endpoint come on top of the numbers reported here.
+
+Usage:
+    python -m benchmarks.bench_client_reuse [--requests 50] [--server-latency 0.02]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from repository.gemini_client import GeminiDiagnosticsRepository
+
+_PROMPT = "## System Specs\n- **CPU**: AMD Ryzen 5 5600X\n"
+
+
+def _per_click(base_url: str, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        repository = GeminiDiagnosticsRepository("local-key", base_url=base_url)
+        repository.fetch_diagnosis(_PROMPT)
+        timings.append(time.perf_counter() - start)
+        repository.close()
+    return timings
+
+
+def _shared(base_url: str, requests: int) -> tuple:
+    start = time.perf_counter()
+    repository = GeminiDiagnosticsRepository("local-key", base_url=base_url)
+    repository.warm_up()
+    warm_up = time.perf_counter() - start
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        repository.fetch_diagnosis(_PROMPT)
+        timings.append(time.perf_counter() - start)
+    repository.close()
+    return warm_up, timings
+
+
+def _report(label: str, timings: list, connections: int) -> None:
+    steady = timings[1:] or timings
+    print(f"{label}")
+    print(f"  first request:       {timings[0] * 1000:8.2f} ms")
+    print(f"  steady-state p50:    {statistics.median(steady) * 1000:8.2f} ms")
+    print(f"  steady-state mean:   {statistics.fmean(steady) * 1000:8.2f} ms")
+    print(f"  TCP connections:     {connections:8d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--server-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    with GeminiStandIn(latency_seconds=args.server_latency) as standin:
+        per_click = _per_click(standin.base_url, args.requests)
+        per_click_connections = standin.connections
+
+    with GeminiStandIn(latency_seconds=args.server_latency) as standin:
+        warm_up, shared = _shared(standin.base_url, args.requests)
+        shared_connections = standin.connections
+
+    print(
+        f"server latency: {args.server_latency * 1000:.1f} ms, "
+        f"requests: {args.requests}"
+    )
+    _report("per-click repository (before)", per_click, per_click_connections)
+    _report("shared warmed repository (after)", shared, shared_connections)
+    print(f"  warm-up (off the user's path): {warm_up * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
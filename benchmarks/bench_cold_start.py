@@ -0,0 +1,163 @@
+"""
+Zenith — Cold-Start Benchmark.
+
+Reports, for a fresh interpreter each time:
+
+* per-module import cost of the application layers, parsed from
+  ``python -X importtime`` (self and cumulative microseconds, plus the
+  heaviest transitive imports);
+* wall-clock time for ``python -m zenith --help``;
+* time-to-first-render of app.py, measured as the first AppTest script run
+  (includes importing everything the page needs on its first draw).
+
+Results can be written as JSON and compared with a previous run so import
+regressions are caught before they ship.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--repeat 3] [--json out.json]
+        [--baseline previous.json] [--threshold 1.25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGET_MODULES = [
+    "domain.models",
+    "repository.gemini_client",
+    "service.diagnostics_service",
+    "ui.renderers",
+    "zenith.cli",
+]
+
+_FIRST_RENDER_SNIPPET = """
+import time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=60)
+start = time.perf_counter()
+app.run()
+print(time.perf_counter() - start)
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Keep the page off the network: no key means no client is built.
+    env.pop("GOOGLE_API_KEY", None)
+    env["ZENITH_WARM_UP"] = "0"
+    return env
+
+
+def _importtime(module: str) -> dict:
+    """Import module in a fresh interpreter and parse -X importtime output."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    own = next((r for r in reversed(rows) if r[0] == module), (module, 0, 0))
+    heaviest = sorted(rows, key=lambda r: r[1], reverse=True)[:5]
+    return {
+        "cumulative_us": own[2],
+        "modules_loaded": len(rows),
+        "heaviest_self_us": {name: self_us for name, self_us, _ in heaviest},
+    }
+
+
+def _wall(argv: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(argv, cwd=REPO_ROOT, env=_env(), capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def _first_render() -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_RENDER_SNIPPET],
+        cwd=REPO_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def run(repeat: int) -> dict:
+    imports = {}
+    for module in TARGET_MODULES:
+        samples = [_importtime(module) for _ in range(repeat)]
+        best = min(samples, key=lambda s: s["cumulative_us"])
+        imports[module] = best
+    return {
+        "imports": imports,
+        "cli_help_s": statistics.median(
+            _wall([sys.executable, "-m", "zenith", "--help"]) for _ in range(repeat)
+        ),
+        "first_render_s": statistics.median(_first_render() for _ in range(repeat)),
+    }
+
+
+def _flatten(results: dict) -> Dict[str, float]:
+    flat = {f"import:{m}": r["cumulative_us"] for m, r in results["imports"].items()}
+    flat["cli_help_s"] = results["cli_help_s"]
+    flat["first_render_s"] = results["first_render_s"]
+    return flat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    for module, r in results["imports"].items():
+        print(
+            f"import {module:<30} {r['cumulative_us'] / 1000:8.1f} ms "
+            f"({r['modules_loaded']} modules)"
+        )
+        for name, self_us in r["heaviest_self_us"].items():
+            print(f"    {name:<40} {self_us / 1000:8.1f} ms self")
+    print(f"python -m zenith --help          {results['cli_help_s'] * 1000:8.1f} ms")
+    print(
+        f"app.py time-to-first-render      {results['first_render_s'] * 1000:8.1f} ms"
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = _flatten(json.load(handle))
+        regressions = [
+            (name, baseline[name], value)
+            for name, value in _flatten(results).items()
+            if baseline.get(name) and value > baseline[name] * args.threshold
+        ]
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.4g} -> {after:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Zenith — Deadline and Cancellation Benchmark.
+
+Runs a workload through DiagnosticsService against a synthetic backend in
+which a share of calls get stuck upstream (they only return after
+--stuck-seconds), while a share of callers abandon their request after
+--abandon-after seconds, as a Streamlit session does when the user reruns
+or closes the tab. With deadlines off, stuck calls and abandoned requests
+hold their threads to the end; with them on, each request is bounded by
+--deadline and abandoned ones are cancelled. Reports wall time, the
+thread-seconds spent inside backend calls, and how requests ended.
+
+Usage:
+    python -m benchmarks.bench_deadlines [--requests 200] [--deadline 1.0]
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.exceptions import DeadlineExceededError, RequestCancelledError
+from domain.models import TelemetryInput
+from repository.deadline import Deadline, bounded_sleep
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+from service.single_flight import SingleFlight
+
+# Stands in for "no deadline": longer than any run of this benchmark.
+_UNBOUNDED_SECONDS = 3600.0
+
+
+class _Stalling:
+    """Synthetic backend whose calls sometimes hang before answering.
+
+    Keeps the thread-seconds its calls occupy, the resource a deadline
+    is meant to give back.
+    """
+
+    def __init__(self, backend, stuck_rate: float, stuck_seconds: float, seed: int):
+        self.backend = backend
+        self.stuck_rate = stuck_rate
+        self.stuck_seconds = stuck_seconds
+        self.busy_seconds = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch_diagnosis(self, structured_prompt, **kwargs):
+        started = time.perf_counter()
+        try:
+            with self._lock:
+                stuck = self._random.random() < self.stuck_rate
+            if stuck:
+                bounded_sleep(self.stuck_seconds, "network")
+            return self.backend.fetch_diagnosis(structured_prompt, **kwargs)
+        finally:
+            with self._lock:
+                self.busy_seconds += time.perf_counter() - started
+
+
+def _workload(count: int) -> list:
+    return [
+        TelemetryInput(
+            cpu="AMD Ryzen 5 5600X",
+            gpu="NVIDIA GeForce RTX 3060",
+            ram="16GB",
+            storage="NVMe SSD",
+            os_name="Windows 11",
+            application=f"Benchmark App {i}",
+            symptoms=f"stutter after {i} minutes of play",
+        )
+        for i in range(count)
+    ]
+
+
+def _run(args: argparse.Namespace, deadline_seconds: float) -> None:
+    backend = _Stalling(
+        SyntheticDiagnosisBackend(latency_ms=args.latency_ms),
+        args.stuck_rate,
+        args.stuck_seconds,
+        args.seed,
+    )
+    service = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=backend,
+        similar=SimilarityIndex(),
+        flights=SingleFlight(max_workers=args.concurrency),
+    )
+    rng = random.Random(args.seed + 1)
+    bounded = deadline_seconds < _UNBOUNDED_SECONDS
+    # Without deadlines nothing observes the abandonment, so nobody abandons.
+    abandons = [
+        bounded and rng.random() < args.abandon_rate for _ in range(args.requests)
+    ]
+
+    def one(item) -> str:
+        telemetry, abandons_early = item
+        started = time.monotonic()
+        abandoned = None
+        if abandons_early:
+            abandoned = lambda: time.monotonic() - started >= args.abandon_after
+        try:
+            service.run_diagnostics(
+                telemetry, deadline=Deadline(deadline_seconds, abandoned)
+            )
+        except RequestCancelledError:
+            return "cancelled"
+        except DeadlineExceededError:
+            return "timed out"
+        return "completed"
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = Counter(pool.map(one, zip(_workload(args.requests), abandons)))
+    # Leader work left running by callers that gave up still holds a thread.
+    while service.flights.stats()["in_flight"]:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    label = f"deadline {deadline_seconds:g}s" if bounded else "deadlines off"
+    print(
+        f"{label:16s} wall {elapsed:6.2f} s  backend thread-seconds "
+        f"{backend.busy_seconds:7.2f}  "
+        + "  ".join(
+            f"{outcome} {outcomes[outcome]}"
+            for outcome in ("completed", "timed out", "cancelled")
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--stuck-rate", type=float, default=0.05)
+    parser.add_argument("--stuck-seconds", type=float, default=5.0)
+    parser.add_argument("--abandon-rate", type=float, default=0.2)
+    parser.add_argument("--abandon-after", type=float, default=0.02)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(
+        f"requests: {args.requests}, {args.stuck_rate:.0%} stuck for "
+        f"{args.stuck_seconds:g}s, {args.abandon_rate:.0%} abandoned after "
+        f"{args.abandon_after * 1000:.0f} ms"
+    )
+    for deadline_seconds in (_UNBOUNDED_SECONDS, args.deadline):
+        _run(args, deadline_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Zenith — Hardware Catalog Benchmark.
+
+Builds a HardwareCatalog over a synthetic SKU list far larger than the
+bundled one and measures exact resolution (full name, bare model number,
+miss) and type-ahead suggestion latency for prefixes of growing length.
+
+Usage:
+    python -m benchmarks.bench_hardware_catalog [--skus 50000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from domain.models import HardwareSpec
+from service.hardware_catalog import HardwareCatalog
+
+_FAMILIES = (
+    ("NVIDIA", "GeForce RTX"),
+    ("NVIDIA", "GeForce GTX"),
+    ("AMD", "Radeon RX"),
+    ("AMD", "Radeon Pro"),
+    ("Intel", "Arc A"),
+    ("Intel", "Arc B"),
+    ("Acme", "Vector"),
+    ("Acme", "Vector Pro"),
+)
+_SUFFIXES = ("", "", " Ti", " SUPER", " XT", " XTX", " Max", " Mobile")
+
+
+def _skus(count: int, rng: random.Random) -> list:
+    names = set()
+    while len(names) < count:
+        vendor, family = rng.choice(_FAMILIES)
+        number = rng.randrange(100, 99_999)
+        names.add(f"{vendor} {family} {number}{rng.choice(_SUFFIXES)}")
+    return [
+        HardwareSpec(
+            name=name,
+            kind="gpu",
+            cores=rng.randrange(512, 16_384),
+            boost_clock_ghz=round(rng.uniform(1.2, 2.9), 2),
+            vram_gb=rng.choice((4, 6, 8, 12, 16, 24)),
+            release_year=rng.randrange(2014, 2026),
+            tier="mainstream",
+        )
+        for name in sorted(names)
+    ]
+
+
+def _measure(fn, queries: list) -> tuple:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter_ns()
+        fn(query)
+        latencies.append(time.perf_counter_ns() - start)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49] / 1000, quantiles[98] / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--skus", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    specs = _skus(args.skus, rng)
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = HardwareCatalog(specs)
+    build = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"skus: {len(catalog)}, build {build * 1000:.0f} ms, "
+        f"index {memory / len(catalog):.0f} B/sku"
+    )
+
+    sample = [rng.choice(specs).name for _ in range(args.queries)]
+    cases = [
+        ("resolve full name", catalog.resolve, sample),
+        ("resolve model no.", catalog.resolve, [n.split(" ", 3)[-1] for n in sample]),
+        ("resolve miss", catalog.resolve, [f"Unknown {n}" for n in sample]),
+    ]
+    for chars in (1, 3, 6, 12):
+        prefixes = [name[:chars] for name in sample]
+        cases.append(
+            (f"suggest {chars:2d} chars", lambda q: catalog.suggest(q, 5), prefixes)
+        )
+    for label, fn, queries in cases:
+        p50, p99 = _measure(fn, queries)
+        print(f"{label:18s} p50 {p50:6.2f} us  p99 {p99:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
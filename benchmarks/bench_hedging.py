@@ -0,0 +1,78 @@
+"""
+Zenith — Hedged Request Benchmark.
+
+Runs the same workload against a synthetic backend with lognormal latency,
+once plain and once behind a HedgedBackend, and compares latency
+percentiles with the share of extra calls hedging cost. The hedged run
+warms the latency window before measuring.
+
+Usage:
+    python -m benchmarks.bench_hedging [--calls 2000] [--latency-ms 100]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from repository.hedging import HedgedBackend, HedgePolicy
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+
+
+def _run(backend, calls: int, concurrency: int, stream: bool) -> list:
+    def one(i: int) -> float:
+        started = time.perf_counter()
+        prompt = f"prompt {i}"
+        if stream:
+            for _ in backend.stream_diagnosis(prompt):
+                pass
+        else:
+            backend.fetch_diagnosis(prompt)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(calls)))
+
+
+def _report(label: str, latencies: list, extra: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=1000)
+    print(
+        f"{label:16s} p50 {quantiles[499] * 1000:7.1f} ms  "
+        f"p99 {quantiles[989] * 1000:7.1f} ms  p99.9 {quantiles[998] * 1000:7.1f} ms  "
+        f"extra calls {extra:5.1%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--max-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"calls: {args.calls}, lognormal median {args.latency_ms:.0f} ms")
+    for stream in (False, True):
+        kind = "stream" if stream else "fetch"
+        plain = SyntheticDiagnosisBackend(latency_ms=args.latency_ms, seed=1)
+        _report(f"{kind} plain", _run(plain, args.calls, args.concurrency, stream), 0)
+
+        policy = HedgePolicy(
+            percentile=args.percentile, max_rate=args.max_rate, min_delay_seconds=0
+        )
+        hedged = HedgedBackend(
+            SyntheticDiagnosisBackend(latency_ms=args.latency_ms, seed=1), policy
+        )
+        _run(hedged, policy.min_samples * 2, args.concurrency, stream)
+        before = policy.stats()
+        latencies = _run(hedged, args.calls, args.concurrency, stream)
+        after = policy.stats()
+        extra = (after["hedged"] - before["hedged"]) / args.calls
+        _report(f"{kind} hedged", latencies, extra)
+        wins = after["hedge_wins"] - before["hedge_wins"]
+        print(f"{'':16s} hedges won {wins} of {after['hedged'] - before['hedged']}")
+
+
+if __name__ == "__main__":
+    main()
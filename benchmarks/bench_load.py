@@ -0,0 +1,102 @@
+"""
+Zenith — Offline Load Test.
+
+Drives DiagnosticsService.run_diagnostics_async with the synthetic backend
+(no network, no API key) at increasing concurrency and reports throughput
+and tail latency of everything except the model itself. This covers
+validation, canonicalisation, coalescing, hydration and the event loop.
+Every request uses distinct telemetry and caching is disabled, so each one
+reaches the backend.
+
+Usage:
+    python -m benchmarks.bench_load [--requests 2000] [--concurrency 1,16,128]
+        [--latency-ms 50] [--distribution lognormal] [--error-rate 0.01]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from domain.exceptions import ZenithException
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+
+
+def _telemetry(i: int) -> TelemetryInput:
+    return TelemetryInput(
+        cpu="AMD Ryzen 5 5600X",
+        gpu="NVIDIA RTX 3060",
+        ram="16GB",
+        storage="NVMe SSD",
+        os_name="Windows 11",
+        application=f"Load Test Title {i}",
+        symptoms="stutters in big fights",
+    )
+
+
+async def _run(service: DiagnosticsService, requests: int, concurrency: int) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await service.run_diagnostics_async(_telemetry(i))
+            except ZenithException:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start, latencies, errors
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,16,128")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--distribution", default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    backend = SyntheticDiagnosisBackend(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.distribution,
+        error_rate=args.error_rate,
+    )
+    service = DiagnosticsService(
+        cache=DiagnosisCache(max_entries=0),
+        repository=backend,
+        similar=SimilarityIndex(max_entries=0),
+    )
+    print(
+        f"synthetic backend: {args.distribution} latency, median "
+        f"{args.latency_ms:.0f} ms, error rate {args.error_rate:.1%}"
+    )
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        requests = min(args.requests, concurrency * 200)
+        elapsed, latencies, errors = asyncio.run(_run(service, requests, concurrency))
+        print(
+            f"  concurrency {concurrency:4d}: {requests / elapsed:8.1f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+            f"p99 {_percentile(latencies, 0.99) * 1000:7.1f} ms   "
+            f"errors {errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
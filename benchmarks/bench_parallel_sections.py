@@ -0,0 +1,90 @@
+"""
+Zenith — Parallel Section Generation Benchmark.
+
+Measures end-to-end latency of run_parallel_diagnostics, which generates
+the verdict, the tweaks and the do-not-do warnings in concurrent calls,
+against the single-call run_diagnostics path. It uses the local Gemini
+stand-in with a per-chunk delay to emulate per-token generation, so each
+call's latency grows with the length of the sections it asks for. Caching
+is disabled so every run reaches the stand-in.
+
+Usage:
+    python -m benchmarks.bench_parallel_sections [--runs 5] [--chunk-delay 0.03]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.gemini_client import GeminiDiagnosticsRepository
+from service.token_ledger import TokenLedger
+
+_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="stutters in big fights",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "local-key")
+    from service.diagnostics_service import DiagnosticsService
+    from service.similarity_index import SimilarityIndex
+
+    single, parallel = [], []
+    with GeminiStandIn(
+        latency_seconds=args.latency, chunk_delay_seconds=args.chunk_delay
+    ) as standin:
+        repository = GeminiDiagnosticsRepository("local-key", standin.base_url)
+        single_ledger, parallel_ledger = TokenLedger(), TokenLedger()
+        single_service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            ledger=single_ledger,
+            similar=SimilarityIndex(max_entries=0),
+        )
+        parallel_service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            ledger=parallel_ledger,
+            similar=SimilarityIndex(max_entries=0),
+        )
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            expected = single_service.run_diagnostics(_TELEMETRY)
+            single.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = parallel_service.run_parallel_diagnostics(_TELEMETRY)
+            parallel.append(time.perf_counter() - start)
+            assert result.tweaks == expected.tweaks
+        repository.close()
+
+    ms = lambda values: statistics.median(values) * 1000  # noqa: E731
+    tokens = lambda ledger: ledger.stats()["today_tokens"] // args.runs  # noqa: E731
+    print(
+        f"runs: {args.runs}, first-byte latency: {args.latency * 1000:.0f} ms, "
+        f"chunk delay: {args.chunk_delay * 1000:.0f} ms"
+    )
+    print(f"single call, latency:              {ms(single):8.1f} ms")
+    print(f"parallel sections, latency:        {ms(parallel):8.1f} ms")
+    print(f"single call, tokens per diagnosis: {tokens(single_ledger):8d}")
+    print(f"parallel, tokens per diagnosis:    {tokens(parallel_ledger):8d}")
+
+
+if __name__ == "__main__":
+    main()
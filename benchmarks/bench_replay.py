@@ -0,0 +1,145 @@
+"""
+Zenith — Cassette Replay Driver.
+
+Replays a recorded cassette (see repository/cassette.py) through
+DiagnosticsService.run_diagnostics and, optionally, render_full_results,
+then reports throughput and where the time went. Telemetry is rebuilt from
+each recorded prompt. Caching is disabled so every request reaches the
+replay backend. A latency scale of 0 replays at full speed, which leaves
+only Zenith's own code on the clock.
+
+Record a cassette from live traffic with:
+    ZENITH_CASSETTE=traffic.sqlite3 ZENITH_CASSETTE_MODE=record streamlit run app.py
+
+Usage:
+    python -m benchmarks.bench_replay traffic.sqlite3 [--latency-scale 0]
+        [--render] [--profile 20]
+    python -m benchmarks.bench_replay demo.sqlite3 --record-synthetic 500
+"""
+
+import argparse
+import cProfile
+import logging
+import os
+import pstats
+import re
+import time
+
+from domain.exceptions import ZenithException
+from domain.models import TelemetryInput
+from repository.cassette import CassetteStore, RecordingBackend, ReplayBackend
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+from service.single_flight import SingleFlight
+
+_PROMPT_RE = re.compile(
+    r"- \*\*CPU\*\*: (?P<cpu>.*)\n- \*\*GPU\*\*: (?P<gpu>.*)\n"
+    r"- \*\*RAM\*\*: (?P<ram>.*)\n- \*\*Storage\*\*: (?P<storage>.*)\n"
+    r"- \*\*OS\*\*: (?P<os_name>.*)\n\n## Target Application\n(?P<application>.*)\n\n"
+    r"## Reported Symptoms\n(?P<symptoms>.*)\n$",
+    re.DOTALL,
+)
+
+
+def _telemetry_from_prompt(prompt: str) -> TelemetryInput:
+    match = _PROMPT_RE.search(prompt)
+    if match is None:
+        raise ValueError("Recorded prompt is not a TelemetryInput prompt.")
+    return TelemetryInput(**match.groupdict())
+
+
+def _record_synthetic(path: str, count: int) -> None:
+    """Fill a cassette with synthetic traffic over a spread of telemetry."""
+    store = CassetteStore(path)
+    backend = RecordingBackend(
+        SyntheticDiagnosisBackend(latency_ms=5, latency_distribution="lognormal"),
+        store,
+    )
+    service = DiagnosticsService(
+        cache=DiagnosisCache(max_entries=0),
+        repository=backend,
+        similar=SimilarityIndex(max_entries=0),
+    )
+    for i in range(count):
+        telemetry = TelemetryInput(
+            cpu=("Ryzen 5 5600X", "Core i7-12700K", "Ryzen 7 7800X3D")[i % 3],
+            gpu=("RTX 3060", "RX 6700 XT", "RTX 4090", "Arc A770")[i % 4],
+            ram=("16GB", "32GB")[i % 2],
+            storage="NVMe SSD",
+            os_name=("Windows 11", "Linux")[i % 2],
+            application=f"Replay Title {i % 97}",
+            symptoms=f"stutters after {i % 13} minutes",
+        )
+        try:
+            service.run_diagnostics(telemetry)
+        except ZenithException:
+            pass
+    backend.close()
+
+
+def _replay(args: argparse.Namespace) -> None:
+    store = CassetteStore(args.cassette)
+    telemetry = [_telemetry_from_prompt(r.prompt) for r in store]
+    backend = ReplayBackend(store, latency_scale=args.latency_scale)
+    service = DiagnosticsService(
+        cache=DiagnosisCache(max_entries=0),
+        repository=backend,
+        flights=SingleFlight(),
+        similar=SimilarityIndex(max_entries=0),
+    )
+    render = None
+    if args.render:
+        from ui.renderers import render_full_results as render
+
+    profiler = cProfile.Profile() if args.profile else None
+    errors = 0
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    for item in telemetry:
+        try:
+            result = service.run_diagnostics(item)
+        except ZenithException:
+            errors += 1
+            continue
+        if render:
+            render(result)
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"replayed {len(telemetry)} requests from {args.cassette} "
+        f"(latency scale {args.latency_scale:g}) in {elapsed:.2f} s: "
+        f"{len(telemetry) / elapsed:.1f} req/s, {errors} errors, "
+        f"{backend.misses} cassette misses"
+    )
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.profile)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cassette")
+    parser.add_argument("--latency-scale", type=float, default=0.0)
+    parser.add_argument("--render", action="store_true", help="also run renderers")
+    parser.add_argument("--profile", type=int, default=0, help="show top N functions")
+    parser.add_argument(
+        "--record-synthetic",
+        type=int,
+        default=0,
+        help="first record this many synthetic requests into the cassette",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault("STREAMLIT_GLOBAL_SHOW_WARNING_ON_DIRECT_EXECUTION", "false")
+
+    if args.record_synthetic:
+        _record_synthetic(args.cassette, args.record_synthetic)
+    _replay(args)
+
+
+if __name__ == "__main__":
+    main()
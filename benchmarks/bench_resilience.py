@@ -0,0 +1,116 @@
+"""
+Zenith — Retry and Circuit Breaker Benchmark.
+
+Drives GeminiDiagnosticsRepository against the fault-injecting Gemini
+stand-in in two scenarios:
+
+* flaky upstream: a fraction of generate calls fail with 503. Compares the
+  user-visible success rate with retries disabled and with the default
+  retry policy, and reports how many upstream requests that cost.
+* outage: every call fails. Compares how long each doomed user request
+  takes with and without the circuit breaker, then lifts the outage and
+  checks that the breaker's half-open probe closes it again.
+
+Backoff delays are scaled down so the run finishes in seconds; the ratios
+are what matter.
+
+Usage:
+    python -m benchmarks.bench_resilience [--requests 200] [--error-rate 0.2]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from domain.exceptions import ExternalServiceError
+from repository.gemini_client import GeminiDiagnosticsRepository
+from repository.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+
+_PROMPT = "## System Specs\n- **CPU**: AMD Ryzen 5 5600X\n"
+
+
+def _repository(base_url: str, attempts: int, threshold: int, reset: float):
+    resilience = ResilientCaller(
+        RetryPolicy(
+            max_attempts=attempts, base_delay_seconds=0.005, max_delay_seconds=0.05
+        ),
+        CircuitBreaker(failure_threshold=threshold, reset_seconds=reset),
+    )
+    return GeminiDiagnosticsRepository(
+        "local-key", base_url=base_url, resilience=resilience
+    )
+
+
+def _drive(repository: GeminiDiagnosticsRepository, requests: int) -> tuple:
+    succeeded = 0
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            repository.fetch_diagnosis(_PROMPT)
+            succeeded += 1
+        except ExternalServiceError:
+            pass
+        timings.append(time.perf_counter() - start)
+    return succeeded, timings
+
+
+def _flaky(args: argparse.Namespace) -> None:
+    print(f"flaky upstream ({args.error_rate:.0%} of calls fail with 503)")
+    for label, attempts in (("no retries", 1), ("default policy", None)):
+        with GeminiStandIn(
+            latency_seconds=args.server_latency, error_rate=args.error_rate
+        ) as standin:
+            repository = _repository(
+                standin.base_url, attempts or RetryPolicy().max_attempts, 10**6, 1.0
+            )
+            succeeded, timings = _drive(repository, args.requests)
+            repository.close()
+            print(
+                f"  {label:<16} success {succeeded / args.requests:7.1%}   "
+                f"upstream calls {standin.requests:5d}   "
+                f"p50 {statistics.median(timings) * 1000:6.2f} ms   "
+                f"retries {repository.resilience.stats()['retries']}"
+            )
+
+
+def _outage(args: argparse.Namespace) -> None:
+    print("full outage (every call fails with 503)")
+    for label, threshold in (("no breaker", 10**6), ("circuit breaker", 5)):
+        with GeminiStandIn(latency_seconds=args.server_latency) as standin:
+            standin.inject_faults(error_rate=1.0)
+            repository = _repository(standin.base_url, 3, threshold, 0.2)
+            _, timings = _drive(repository, args.requests // 4)
+            print(
+                f"  {label:<16} mean per failed request "
+                f"{statistics.fmean(timings) * 1000:7.2f} ms   "
+                f"upstream calls {standin.requests:5d}   "
+                f"breaker {repository.resilience.breaker.state}"
+            )
+            if threshold < 10**6:
+                standin.inject_faults(error_rate=0.0)
+                time.sleep(0.25)
+                succeeded, _ = _drive(repository, 1)
+                print(
+                    f"  after recovery: probe {'succeeded' if succeeded else 'failed'}, "
+                    f"breaker {repository.resilience.breaker.state}"
+                )
+            repository.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--server-latency", type=float, default=0.005)
+    args = parser.parse_args()
+    # Every injected fault is logged by the repository; keep the report readable.
+    logging.disable(logging.CRITICAL)
+    _flaky(args)
+    _outage(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Zenith — Complexity Routing Benchmark.
+
+Runs a mixed workload (short and long symptom descriptions, catalogued and
+unknown hardware, applications inside and outside the rule table) through
+DiagnosticsService with a synthetic backend per model, the light model
+faster than the standard one. Each light-tier threshold in the sweep is
+compared with routing off: share of requests on the light tier, latency
+percentiles, and each tier's mean latency and parse-failure rate. Lower
+--light-max-tokens to see truncation show up as light-tier parse failures.
+
+Usage:
+    python -m benchmarks.bench_routing [--requests 400] [--light-max-tokens 2048]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import GEMINI_MODEL, GEMINI_TEMPERATURE, ROUTING_LIGHT_MODEL
+from domain.exceptions import DataParsingError
+from domain.models import GenerationSettings, TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.compatibility_rules import HARD_INCOMPATIBILITY_RULES
+from service.diagnostics_service import DiagnosticsService
+from service.hardware_specs import CPU_SPECS, GPU_SPECS
+from service.model_router import ComplexityRouter, ModelTier
+from service.similarity_index import SimilarityIndex
+from service.telemetry_canonicalizer import canonicalize_telemetry
+
+_WORDS = (
+    "stutter fps drop freeze crash launch load heat fan noise loud slow input "
+    "delay lag spike texture pop shader compile menu fight city map open world "
+    "vram ram disk usage 100 percent audio crackle black screen flicker tear "
+    "vsync gsync hdr alt tab minimise driver timeout bsod reboot update patch "
+    "ray tracing dlss fsr upscale blurry low high ultra setting 1080p 1440p 4k"
+).split()
+_APPLICATIONS = ("Elden Ring", "Blender", "Cyberpunk 2077", "Premiere Pro", "Starfield")
+
+
+class _ByModel:
+    """Sends each call to the synthetic backend standing in for its model."""
+
+    def __init__(self, backends: dict) -> None:
+        self.backends = backends
+
+    def fetch_diagnosis(self, structured_prompt, model=GEMINI_MODEL, **kwargs):
+        return self.backends[model].fetch_diagnosis(
+            structured_prompt, model=model, **kwargs
+        )
+
+
+def _workload(count: int, rng: random.Random) -> list:
+    cpus = [record[0] for record in CPU_SPECS]
+    gpus = [record[0] for record in GPU_SPECS]
+    covered = sorted(
+        {a for rule in HARD_INCOMPATIBILITY_RULES for a in rule["applications"]}
+    )
+    workload = []
+    for i in range(count):
+        words = rng.choice((0, 2, 4, 8, 16, 30))
+        workload.append(
+            TelemetryInput(
+                cpu=rng.choice(cpus) if rng.random() < 0.8 else f"Custom CPU {i}",
+                gpu=rng.choice(gpus) if rng.random() < 0.8 else f"Custom GPU {i}",
+                ram="16GB",
+                storage="NVMe SSD",
+                os_name="Windows 11",
+                application=rng.choice(
+                    covered if rng.random() < 0.3 else _APPLICATIONS
+                ),
+                symptoms=" ".join(rng.choices(_WORDS, k=words)) or "Not specified",
+            )
+        )
+    return workload
+
+
+def _run(service: DiagnosticsService, workload: list, concurrency: int) -> list:
+    def one(telemetry: TelemetryInput) -> float:
+        started = time.perf_counter()
+        try:
+            service.run_diagnostics(telemetry)
+        except DataParsingError:
+            pass
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, workload))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--light-latency-ms", type=float, default=30.0)
+    parser.add_argument("--light-max-tokens", type=int, default=2048)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workload = _workload(args.requests, random.Random(args.seed))
+    print(
+        f"requests: {args.requests}, standard {args.latency_ms:.0f} ms, "
+        f"light {args.light_latency_ms:.0f} ms (lognormal medians)"
+    )
+    for threshold in (None, 0.15, 0.25, 0.35, 0.5):
+        backend = _ByModel(
+            {
+                GEMINI_MODEL: SyntheticDiagnosisBackend(latency_ms=args.latency_ms),
+                ROUTING_LIGHT_MODEL: SyntheticDiagnosisBackend(
+                    latency_ms=args.light_latency_ms
+                ),
+            }
+        )
+        tiers = (
+            ModelTier(
+                "light",
+                ROUTING_LIGHT_MODEL,
+                GenerationSettings(0.2, args.light_max_tokens),
+                threshold or 0.0,
+            ),
+            ModelTier(
+                "standard", GEMINI_MODEL, GenerationSettings(GEMINI_TEMPERATURE), 1.0
+            ),
+        )
+        router = ComplexityRouter(tiers, enabled=threshold is not None)
+        service = DiagnosticsService(
+            cache=DiagnosisCache(),
+            repository=backend,
+            similar=SimilarityIndex(),
+            router=router,
+        )
+        latencies = _run(service, workload, args.concurrency)
+        quantiles = statistics.quantiles(latencies, n=100)
+        stats = router.stats()
+        light = stats.get("light", {})
+        label = "routing off" if threshold is None else f"light <= {threshold:.2f}"
+        print(
+            f"{label:14s} light {light.get('routed', 0) / args.requests:5.1%}  "
+            f"p50 {quantiles[49] * 1000:6.1f} ms  p95 {quantiles[94] * 1000:6.1f} ms"
+        )
+        for name in ("light", "standard"):
+            if name in stats and stats[name]["calls"]:
+                tier = stats[name]
+                print(
+                    f"{'':14s} {name:8s} mean {tier['mean_latency_seconds'] * 1000:6.1f} ms"
+                    f"  parse failures {tier['parse_failure_rate']:5.1%}"
+                )
+
+    router = ComplexityRouter(enabled=True)
+    canonical = [canonicalize_telemetry(t).telemetry for t in workload]
+    started = time.perf_counter()
+    for telemetry in canonical:
+        router.route(telemetry)
+    elapsed = time.perf_counter() - started
+    print(f"route overhead {elapsed / len(canonical) * 1e6:.2f} us per request")
+
+
+if __name__ == "__main__":
+    main()
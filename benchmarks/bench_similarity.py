@@ -0,0 +1,123 @@
+"""
+Zenith — Near-Duplicate Index Benchmark.
+
+Fills a SimilarityIndex with past diagnoses, each a distinct full-size
+document from the synthetic backend, and measures lookup latency for
+near-duplicate hits and for misses, and the memory the index holds. Two
+layouts are measured: entries spread over many hardware profiles, and the
+worst case of every entry on one profile, where only the symptom bands
+separate them. Lower --max-mb to see the size cap evict old entries.
+
+Usage:
+    python -m benchmarks.bench_similarity [--entries 20000] [--max-mb 64]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import replace
+
+from domain.models import TelemetryInput
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.similarity_index import SimilarityIndex
+
+# Stands in for the generation-config digest every entry shares.
+_CONFIG = "config"
+
+_WORDS = (
+    "stutter fps drop freeze crash launch load heat fan noise loud slow input "
+    "delay lag spike texture pop shader compile menu fight city map open world "
+    "vram ram disk usage 100 percent audio crackle black screen flicker tear "
+    "vsync gsync hdr alt tab minimise driver timeout bsod reboot update patch "
+    "ray tracing dlss fsr upscale blurry low high ultra setting 1080p 1440p 4k"
+).split()
+
+_BASE = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="",
+)
+
+
+def _symptoms(rng: random.Random) -> str:
+    return " ".join(rng.sample(_WORDS, rng.randint(3, 7)))
+
+
+def _telemetry(rng: random.Random, profiles: int) -> TelemetryInput:
+    return replace(_BASE, cpu=f"CPU {rng.randrange(profiles)}", symptoms=_symptoms(rng))
+
+
+def _near(telemetry: TelemetryInput, rng: random.Random) -> TelemetryInput:
+    """Reword a symptom description: reorder it and mention one more thing."""
+    words = telemetry.symptoms.split()
+    rng.shuffle(words)
+    extra = rng.choice([word for word in _WORDS if word not in words])
+    return replace(telemetry, symptoms=" ".join(words + ["during", extra]))
+
+
+def _measure(index: SimilarityIndex, queries: list) -> tuple:
+    latencies, hits = [], 0
+    for telemetry in queries:
+        start = time.perf_counter_ns()
+        found = index.lookup(telemetry, _CONFIG)
+        latencies.append(time.perf_counter_ns() - start)
+        hits += found is not None
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49] / 1000, quantiles[98] / 1000, hits / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--max-mb", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--profiles", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"entries: {args.entries}, queries: {args.queries}, cap {args.max_mb} MiB")
+    backend = SyntheticDiagnosisBackend(latency_ms=0)
+    for layout, profiles in (("spread", args.profiles), ("one profile", 1)):
+        rng = random.Random(args.seed)
+        index = SimilarityIndex(
+            max_entries=args.entries, max_bytes=args.max_mb * 1024 * 1024
+        )
+        stored = []
+        tracemalloc.start()
+        for _ in range(args.entries):
+            telemetry = _telemetry(rng, profiles)
+            # A fresh document per entry, as the model would return
+            document = backend.fetch_diagnosis(telemetry.format_prompt())
+            index.add(telemetry, _CONFIG, document)
+            stored.append(telemetry)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        stats = index.stats()
+
+        near = [_near(rng.choice(stored), rng) for _ in range(args.queries)]
+        other = [
+            replace(_telemetry(rng, profiles), symptoms="weird coil whine at idle")
+            for _ in range(args.queries)
+        ]
+        p50, p99, rate = _measure(index, near)
+        print(
+            f"{layout:12s} near-duplicate: p50 {p50:6.1f} us  p99 {p99:6.1f} us  "
+            f"reused {rate:.0%}"
+        )
+        p50, p99, rate = _measure(index, other)
+        print(f"{layout:12s} miss:           p50 {p50:6.1f} us  p99 {p99:6.1f} us")
+        print(
+            f"{layout:12s} memory:         {memory / 2**20:6.1f} MiB traced, "
+            f"{stats['bytes'] / 2**20:6.1f} MiB accounted, "
+            f"{stats['entries']} entries kept, {stats['evictions']} evicted"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Zenith — Request Coalescing Benchmark.
+
+Simulates a burst of Streamlit sessions submitting the same popular
+configuration at once. Every session first calls the repository directly
+(the behaviour before coalescing), then goes through
+DiagnosticsService.run_diagnostics, where concurrent identical requests
+share one upstream call. Reports the upstream requests the Gemini stand-in
+received and the burst's wall-clock time for each. Caching is disabled, so
+only coalescing can save calls.
+
+Usage:
+    python -m benchmarks.bench_single_flight [--sessions 50] [--bursts 5]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from domain.models import DiagnosticResponse, TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.gemini_client import GeminiDiagnosticsRepository
+
+_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="Not specified",
+)
+
+
+def _burst(sessions: int, request) -> float:
+    barrier = threading.Barrier(sessions)
+
+    def session() -> None:
+        barrier.wait()
+        request()
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "local-key")
+    from service.diagnostics_service import DiagnosticsService
+    from service.similarity_index import SimilarityIndex
+
+    prompt = _TELEMETRY.format_prompt()
+    with GeminiStandIn(latency_seconds=args.latency) as standin:
+        repository = GeminiDiagnosticsRepository("local-key", standin.base_url)
+        service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            similar=SimilarityIndex(max_entries=0),
+        )
+
+        uncoalesced = [
+            _burst(
+                args.sessions,
+                lambda: DiagnosticResponse.from_dict(
+                    repository.fetch_diagnosis(prompt)
+                ),
+            )
+            for _ in range(args.bursts)
+        ]
+        uncoalesced_requests = standin.requests
+
+        coalesced = [
+            _burst(args.sessions, lambda: service.run_diagnostics(_TELEMETRY))
+            for _ in range(args.bursts)
+        ]
+        coalesced_requests = standin.requests - uncoalesced_requests
+        repository.close()
+
+    print(
+        f"{args.bursts} bursts of {args.sessions} identical sessions, "
+        f"upstream latency {args.latency * 1000:.0f} ms"
+    )
+    print(
+        f"  independent calls: {uncoalesced_requests:5d} upstream requests, "
+        f"burst {max(uncoalesced) * 1000:7.1f} ms (worst)"
+    )
+    print(
+        f"  single-flight:     {coalesced_requests:5d} upstream requests, "
+        f"burst {max(coalesced) * 1000:7.1f} ms (worst)"
+    )
+    print(f"  {service.flights.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Zenith — Speculative Diagnosis Benchmark.
+
+Simulates users filling in the form against the synthetic backend, and
+measures click-to-result latency with and without speculative diagnosis,
+along with the speculative calls wasted per user.
+
+Each user fills in the required fields one at a time, then pauses (reading,
+typing symptoms) before clicking. A share of users also enter symptoms
+last: the field commits together with the click, so the speculation made
+without them is wasted and the click pays the full latency.
+
+Usage:
+    python -m benchmarks.bench_speculation [--users 40] [--symptoms-last 0.3]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from dataclasses import replace
+
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+from service.speculation import Speculator
+from service.token_ledger import TokenLedger
+
+_EMPTY = TelemetryInput(
+    cpu="",
+    gpu="",
+    ram="Not specified",
+    storage="",
+    os_name="",
+    application="",
+    symptoms="Not specified",
+)
+
+
+def _simulate(args: argparse.Namespace, speculate: bool) -> tuple:
+    rng = random.Random(args.seed)
+    service = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=SyntheticDiagnosisBackend(
+            latency_ms=args.latency_ms, latency_distribution="fixed"
+        ),
+        ledger=TokenLedger(),
+        similar=SimilarityIndex(max_entries=0),
+    )
+    speculator = Speculator(
+        service.run_diagnostics, debounce_seconds=args.debounce_ms / 1000
+    )
+    latencies = []
+    for user in range(args.users):
+        session_id = f"user-{user}"
+        form = _EMPTY
+        for name, value in (
+            ("cpu", f"Ryzen {user}"),
+            ("gpu", "RTX 3060"),
+            ("os_name", "Windows 11"),
+            ("storage", "NVMe SSD"),
+            ("application", "Elden Ring"),
+        ):
+            form = replace(form, **{name: value})
+            if speculate:
+                speculator.observe(form, session_id)
+            time.sleep(rng.uniform(0, args.edit_gap_ms / 1000))
+        time.sleep(rng.uniform(0, 2 * args.think_ms / 1000))
+        if rng.random() < args.symptoms_last:
+            form = replace(form, symptoms="stutters in big fights")
+        start = time.perf_counter()
+        if speculate:
+            speculator.promote(form, session_id)
+        service.run_diagnostics(form, session_id)
+        latencies.append(time.perf_counter() - start)
+    return latencies, speculator.stats(), service.ledger.stats()["today_requests"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--debounce-ms", type=float, default=150)
+    parser.add_argument("--edit-gap-ms", type=float, default=200)
+    parser.add_argument("--think-ms", type=float, default=600)
+    parser.add_argument("--symptoms-last", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    baseline, _, baseline_calls = _simulate(args, speculate=False)
+    speculative, stats, calls = _simulate(args, speculate=True)
+
+    def ms(values: list, q: int) -> float:
+        return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+    print(
+        f"users: {args.users}, backend latency: {args.latency_ms:.0f} ms, "
+        f"debounce: {args.debounce_ms:.0f} ms, mean think time: {args.think_ms:.0f} ms, "
+        f"symptoms last: {args.symptoms_last:.0%}"
+    )
+    print(
+        f"click to result, no speculation:  p50 {ms(baseline, 50):7.1f} ms  "
+        f"p90 {ms(baseline, 90):7.1f} ms"
+    )
+    print(
+        f"click to result, speculative:     p50 {ms(speculative, 50):7.1f} ms  "
+        f"p90 {ms(speculative, 90):7.1f} ms"
+    )
+    print(
+        f"backend calls per user:           {baseline_calls / args.users:.2f} -> "
+        f"{calls / args.users:.2f}"
+    )
+    print(
+        f"speculation: {stats['started']} started, {stats['promoted']} promoted, "
+        f"{stats['wasted']} wasted, {stats['superseded']} superseded before start"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Zenith — Streaming Diagnosis Benchmark.
+
+Measures time-to-first-section (the first meaningful paint) for the
+streaming path against full-response latency for the blocking path, using
+the local Gemini stand-in with a per-chunk delay to emulate token
+generation. Caching is disabled so every run reaches the stand-in.
+
+Usage:
+    python -m benchmarks.bench_streaming [--runs 5] [--chunk-delay 0.03]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.gemini_client import GeminiDiagnosticsRepository
+
+_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="stutters in big fights",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "local-key")
+    from service.diagnostics_service import DiagnosticsService
+    from service.similarity_index import SimilarityIndex
+
+    blocking, first_section, stream_total = [], [], []
+    with GeminiStandIn(
+        latency_seconds=args.latency, chunk_delay_seconds=args.chunk_delay
+    ) as standin:
+        repository = GeminiDiagnosticsRepository("local-key", standin.base_url)
+        service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            similar=SimilarityIndex(max_entries=0),
+        )
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            service.run_diagnostics(_TELEMETRY)
+            blocking.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            first = None
+            for _section in service.stream_diagnostics(_TELEMETRY):
+                if first is None:
+                    first = time.perf_counter() - start
+            first_section.append(first)
+            stream_total.append(time.perf_counter() - start)
+        repository.close()
+
+    ms = lambda values: statistics.median(values) * 1000  # noqa: E731
+    print(
+        f"runs: {args.runs}, first-byte latency: {args.latency * 1000:.0f} ms, "
+        f"chunk delay: {args.chunk_delay * 1000:.0f} ms"
+    )
+    print(f"blocking run_diagnostics (first paint = full): {ms(blocking):8.1f} ms")
+    print(f"streaming time to first section:               {ms(first_section):8.1f} ms")
+    print(f"streaming time to last section:                {ms(stream_total):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
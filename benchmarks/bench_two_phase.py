@@ -0,0 +1,93 @@
+"""
+Zenith — Two-Phase Diagnosis Benchmark.
+
+Measures time-to-verdict (the diagnosis and compatibility sections on
+screen) for a two-phase diagnosis against the blocking one-call path, and
+the time and tokens each takes to produce the complete result. It uses the
+local Gemini stand-in with a per-chunk delay to emulate token generation,
+so a response's latency grows with its length as the real API's does.
+Caching is disabled so every run reaches the stand-in.
+
+Usage:
+    python -m benchmarks.bench_two_phase [--runs 5] [--chunk-delay 0.03]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.gemini_standin import GeminiStandIn
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.gemini_client import GeminiDiagnosticsRepository
+from service.token_ledger import TokenLedger
+
+_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="stutters in big fights",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "local-key")
+    from service.diagnostics_service import DiagnosticsService
+    from service.similarity_index import SimilarityIndex
+
+    one_call, verdict, two_phase = [], [], []
+    with GeminiStandIn(
+        latency_seconds=args.latency, chunk_delay_seconds=args.chunk_delay
+    ) as standin:
+        repository = GeminiDiagnosticsRepository("local-key", standin.base_url)
+        one_call_ledger, two_phase_ledger = TokenLedger(), TokenLedger()
+        full_service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            ledger=one_call_ledger,
+            similar=SimilarityIndex(max_entries=0),
+        )
+        service = DiagnosticsService(
+            cache=DiagnosisCache(max_entries=0),
+            repository=repository,
+            ledger=two_phase_ledger,
+            similar=SimilarityIndex(max_entries=0),
+        )
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            full_service.run_diagnostics(_TELEMETRY)
+            one_call.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            triage = service.triage_diagnostics(_TELEMETRY)
+            verdict.append(time.perf_counter() - start)
+            result = service.detail_diagnostics(_TELEMETRY, triage)
+            two_phase.append(time.perf_counter() - start)
+            assert result.is_complete
+        repository.close()
+
+    ms = lambda values: statistics.median(values) * 1000  # noqa: E731
+    tokens = lambda ledger: ledger.stats()["today_tokens"] // args.runs  # noqa: E731
+    print(
+        f"runs: {args.runs}, first-byte latency: {args.latency * 1000:.0f} ms, "
+        f"chunk delay: {args.chunk_delay * 1000:.0f} ms"
+    )
+    print(f"one call, time to verdict (= complete):  {ms(one_call):8.1f} ms")
+    print(f"two-phase, time to verdict:              {ms(verdict):8.1f} ms")
+    print(f"two-phase, time to complete:             {ms(two_phase):8.1f} ms")
+    print(f"tokens per diagnosis, one call:          {tokens(one_call_ledger):8d}")
+    print(f"tokens per diagnosis, two-phase:         {tokens(two_phase_ledger):8d}")
+
+
+if __name__ == "__main__":
+    main()
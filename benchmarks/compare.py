@@ -0,0 +1,66 @@
+"""
+Zenith — Benchmark Result Comparison.
+
+Compares two JSON reports written by benchmarks.suite and flags every case
+whose p50 latency or peak memory grew by more than the threshold. Exits
+with status 1 when any regression is found, so it can gate CI.
+
+Usage:
+    python -m benchmarks.compare before.json after.json [--threshold 1.25]
+"""
+
+import argparse
+import json
+import sys
+
+_METRICS = ("p50_us", "p99_us", "peak_memory_kib")
+# p99 is noisy on shared machines; it is reported but never gates.
+_GATED = ("p50_us", "peak_memory_kib")
+
+
+def compare(before: dict, after: dict, threshold: float) -> list:
+    """Return (case, metric, before, after) for every gated regression."""
+    regressions = []
+    for case, new in after["results"].items():
+        old = before["results"].get(case)
+        if old is None:
+            continue
+        for metric in _GATED:
+            if old[metric] and new[metric] > old[metric] * threshold:
+                regressions.append((case, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as handle:
+        before = json.load(handle)
+    with open(args.after, encoding="utf-8") as handle:
+        after = json.load(handle)
+
+    print(f"{before.get('commit', '?')} -> {after.get('commit', '?')}")
+    print(f"{'case':<30} " + " ".join(f"{m:>22}" for m in _METRICS))
+    for case, new in after["results"].items():
+        old = before["results"].get(case)
+        if old is None:
+            print(f"{case:<30} (new)")
+            continue
+        cells = []
+        for metric in _METRICS:
+            ratio = new[metric] / old[metric] if old[metric] else 1.0
+            cells.append(f"{new[metric]:12.1f} ({ratio:5.2f}x)")
+        print(f"{case:<30} " + " ".join(f"{c:>22}" for c in cells))
+
+    regressions = compare(before, after, args.threshold)
+    for case, metric, old, new in regressions:
+        print(f"REGRESSION {case} {metric}: {old:.1f} -> {new:.1f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
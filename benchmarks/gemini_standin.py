@@ -0,0 +1,290 @@
+"""
+Zenith — Local Gemini HTTP Stand-in.
+
+A minimal HTTP/1.1 server that speaks just enough of the Gemini REST API
+(``models.get``, ``models.generateContent`` and the server-sent-events
+``models.streamGenerateContent``) for the real google-genai
+SDK to talk to it via ``base_url``. It lets benchmarks exercise the full
+client stack — connection pooling, keep-alive, JSON decoding — without
+network access or an API key.
+
+Faults can be injected into generate calls, either at a random error rate
+or deterministically for the next N requests, to exercise retry and
+circuit-breaker behaviour. Responses carry only the top-level sections the
+request's response schema asks for.
+
+Usage:
+    with GeminiStandIn(latency_seconds=0.05) as standin:
+        repo = GeminiDiagnosticsRepository("local-key", base_url=standin.base_url)
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+CANNED_DIAGNOSIS = {
+    "diagnosis": {
+        "bottleneck_type": "GPU",
+        "severity": 6,
+        "secondary_bottleneck": "RAM",
+        "plain_english": "Your graphics card is working at its limit in busy scenes.",
+        "reasoning": "The target title is GPU-bound at the reported resolution.",
+    },
+    "compatibility": {"score": 82, "note": "Runs well at medium settings."},
+    "tweaks": [
+        {
+            "title": f"Stand-in tweak {i}",
+            "type": "Config",
+            "safety": "Safe",
+            "steps": ["Open settings", "Lower the preset", "Restart the game"],
+            "commands": [],
+            "revert": "Restore the previous preset.",
+            "rationale": "Reduces GPU load in dense scenes.",
+        }
+        for i in range(1, 4)
+    ],
+    "do_not_do": [
+        {"action": "Overclock the GPU", "reason": "Risks instability."},
+        {"action": "Disable the antivirus", "reason": "Leaves the system exposed."},
+    ],
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer headers and body into one segment and disable Nagle so the
+    # stand-in does not add delayed-ACK stalls the real API would not have.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    server: "_StandInServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.record_connection()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send_json(self, status: int, body: dict) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        model = self.path.split("?")[0].rsplit("/", 1)[-1]
+        self._send_json(200, {"name": f"models/{model}", "displayName": model})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        request = json.loads(body or b"{}")
+        time.sleep(self.server.latency_seconds)
+        status = self.server.injected_fault()
+        if status:
+            self._send_json(
+                status,
+                {
+                    "error": {
+                        "code": status,
+                        "message": "Injected fault from the Gemini stand-in.",
+                        "status": "UNAVAILABLE",
+                    }
+                },
+            )
+            return
+        text = json.dumps(_requested_sections(self.server.payload, request))
+        if ":streamGenerateContent" in self.path:
+            self._stream(len(body), text)
+            return
+        # A blocking call still pays for generating every chunk up front.
+        chunks = -(-len(text) // self.server.chunk_chars)
+        time.sleep(self.server.chunk_delay_seconds * max(0, chunks - 1))
+        self._send_json(
+            200,
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": text}]},
+                        "finishReason": "STOP",
+                    }
+                ],
+                "usageMetadata": _usage(len(body), text),
+            },
+        )
+
+    def _stream(self, request_bytes: int, text: str) -> None:
+        """Send text as SSE events over chunked transfer encoding."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = self.server.chunk_chars
+        for start in range(0, len(text), size):
+            if start:
+                time.sleep(self.server.chunk_delay_seconds)
+            piece = text[start : start + size]
+            event = {
+                "candidates": [
+                    {"content": {"role": "model", "parts": [{"text": piece}]}}
+                ]
+            }
+            if start + size >= len(text):
+                event["candidates"][0]["finishReason"] = "STOP"
+                event["usageMetadata"] = _usage(request_bytes, text)
+            frame = f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(frame), frame))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def _requested_sections(payload: dict, request: dict) -> dict:
+    """Limit the payload to the top-level properties of the request's schema."""
+    config = request.get("generationConfig") or {}
+    schema = config.get("responseSchema") or config.get("response_schema") or {}
+    properties = schema.get("properties")
+    if not properties:
+        return payload
+    return {name: payload[name] for name in properties if name in payload}
+
+
+def _usage(request_bytes: int, text: str) -> dict:
+    """Token counts at roughly four characters per token."""
+    prompt = request_bytes // 4
+    return {
+        "promptTokenCount": prompt,
+        "candidatesTokenCount": len(text) // 4,
+        "totalTokenCount": prompt + len(text) // 4,
+    }
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        latency_seconds: float,
+        payload: dict,
+        chunk_chars: int,
+        chunk_delay_seconds: float,
+        error_rate: float,
+        error_status: int,
+        seed: int,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency_seconds = latency_seconds
+        self.payload = payload
+        self.chunk_chars = chunk_chars
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_next = 0
+        self.requests = 0
+        self.faults = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def injected_fault(self) -> int:
+        """Count a generate request and return an HTTP status to fail it with, or 0."""
+        with self._lock:
+            self.requests += 1
+            if self.fail_next > 0:
+                self.fail_next -= 1
+            elif not self._random.random() < self.error_rate:
+                return 0
+            self.faults += 1
+            return self.error_status
+
+
+class GeminiStandIn:
+    """Context manager running the stand-in server on a background thread.
+
+    Args:
+        latency_seconds: Delay before the first byte of every response.
+        payload: The diagnosis document returned as the model's text.
+        chunk_chars: Characters of model text per streamed SSE event.
+        chunk_delay_seconds: Delay between streamed events (per-token latency).
+        error_rate: Probability that a generate request fails with error_status.
+        error_status: HTTP status returned for injected faults.
+        seed: Seed for the fault-injection random generator.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        payload: Optional[dict] = None,
+        chunk_chars: int = 64,
+        chunk_delay_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ) -> None:
+        self._server = _StandInServer(
+            latency_seconds,
+            payload or CANNED_DIAGNOSIS,
+            chunk_chars,
+            chunk_delay_seconds,
+            error_rate,
+            error_status,
+            seed,
+        )
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        """Number of TCP connections accepted so far."""
+        return self._server.connections
+
+    @property
+    def requests(self) -> int:
+        """Number of generate requests received so far, including failed ones."""
+        return self._server.requests
+
+    @property
+    def faults(self) -> int:
+        """Number of generate requests answered with an injected error."""
+        return self._server.faults
+
+    def inject_faults(
+        self,
+        error_rate: Optional[float] = None,
+        fail_next: int = 0,
+        error_status: Optional[int] = None,
+    ) -> None:
+        """Change fault injection while the server is running.
+
+        Args:
+            error_rate: New probability of failing each generate request.
+            fail_next: Fail this many upcoming generate requests unconditionally.
+            error_status: New HTTP status for injected faults.
+        """
+        with self._server._lock:
+            if error_rate is not None:
+                self._server.error_rate = error_rate
+            if error_status is not None:
+                self._server.error_status = error_status
+            self._server.fail_next = fail_next
+
+    def __enter__(self) -> "GeminiStandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
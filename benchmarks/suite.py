@@ -0,0 +1,256 @@
+"""
+Zenith — Hot-Path Benchmark Suite.
+
+Times the diagnosis pipeline's hot paths:
+
+* TelemetryInput.format_prompt
+* json.loads + DiagnosticResponse.from_dict, on a typical payload and on
+  pathological ones (oversized text, hundreds of tweaks, wrong types), and
+  the from_schema_dict fast path on the typical payload
+* every renderer in ui/renderers.py, run outside a Streamlit session
+* run_diagnostics end to end against the zero-latency synthetic backend,
+  with both cold (backend) and warm (cache hit) lookups
+
+Each case reports throughput, p50/p99 latency per call, and the peak
+traced memory over a fixed number of calls. Results are written as JSON so
+two commits can be compared with benchmarks.compare.
+
+Usage:
+    python -m benchmarks.suite [--min-time 0.5] [--filter render] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import replace
+from typing import Callable, Dict, List, Tuple
+
+from domain.models import DiagnosticResponse, TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+
+_MEMORY_CALLS = 50
+
+_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="stutters in big fights",
+)
+
+# Valorant on Linux is a known hard blocker, answered by the local rules.
+_BLOCKED_TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Linux",
+    application="Valorant",
+    symptoms="stutters in big fights",
+)
+
+
+def _payloads() -> Dict[str, str]:
+    backend = SyntheticDiagnosisBackend(latency_ms=0)
+    typical = backend.build_payload(_TELEMETRY.format_prompt())
+    huge_text = SyntheticDiagnosisBackend(latency_ms=0, text_chars=200_000)
+    many_tweaks = SyntheticDiagnosisBackend(latency_ms=0, tweaks=500)
+    wrong_types = {
+        "diagnosis": {"bottleneck_type": None, "severity": "eleven", "extra": [1] * 50},
+        "compatibility": {"score": "n/a", "note": None},
+        "tweaks": [{"steps": "not-a-list", "commands": None}] * 100,
+        "do_not_do": [{}] * 100,
+        "unexpected": {"nested": [{"deep": list(range(100))}] * 100},
+    }
+    return {
+        "typical": json.dumps(typical),
+        "huge_text": json.dumps(huge_text.build_payload("x")),
+        "many_tweaks": json.dumps(many_tweaks.build_payload("x")),
+        "wrong_types": json.dumps(wrong_types),
+    }
+
+
+def _cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Build (name, zero-argument callable) for every benchmark case."""
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+    from service.diagnostics_service import DiagnosticsService
+    from service.similarity_index import SimilarityIndex
+    from service.single_flight import SingleFlight
+    from ui import renderers
+
+    cases: List[Tuple[str, Callable[[], object]]] = [
+        ("format_prompt", _TELEMETRY.format_prompt)
+    ]
+    for name, text in _payloads().items():
+        cases.append(
+            (
+                f"from_dict.{name}",
+                lambda text=text: DiagnosticResponse.from_dict(json.loads(text)),
+            )
+        )
+
+    typical = _payloads()["typical"]
+    cases.append(
+        (
+            "from_schema_dict.typical",
+            lambda: DiagnosticResponse.from_schema_dict(json.loads(typical)),
+        )
+    )
+
+    result = DiagnosticResponse.from_dict(json.loads(typical))
+    cases += [
+        (
+            "render.diagnosis_header",
+            lambda: renderers.render_diagnosis_header(result.diagnosis),
+        ),
+        (
+            "render.plain_english",
+            lambda: renderers.render_plain_english(result.diagnosis),
+        ),
+        (
+            "render.compatibility",
+            lambda: renderers.render_compatibility(result.compatibility),
+        ),
+        (
+            "render.tweak_card",
+            lambda: renderers.render_tweak_card(1, result.tweaks[0]),
+        ),
+        (
+            "render.do_not_do_item",
+            lambda: renderers.render_do_not_do_item(result.do_not_do[0]),
+        ),
+        ("render.do_not_do", lambda: renderers.render_do_not_do(result.do_not_do)),
+        (
+            "render.error",
+            lambda: renderers.render_error("ERR_BENCH", "Benchmark error <b>text</b>"),
+        ),
+        ("render.full_results", lambda: renderers.render_full_results(result)),
+        (
+            "render.streaming_results",
+            lambda: renderers.render_streaming_results(result.iter_sections()),
+        ),
+    ]
+
+    backend = SyntheticDiagnosisBackend(latency_ms=0)
+    cold = DiagnosticsService(
+        cache=DiagnosisCache(max_entries=0),
+        repository=backend,
+        flights=SingleFlight(),
+        similar=SimilarityIndex(max_entries=0),
+    )
+    warm = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=backend,
+        flights=SingleFlight(),
+        similar=SimilarityIndex(max_entries=0),
+    )
+    warm.run_diagnostics(_TELEMETRY)
+    # Remembers the diagnosis of _TELEMETRY; the cache never hits
+    similar = DiagnosticsService(
+        cache=DiagnosisCache(max_entries=0),
+        repository=backend,
+        flights=SingleFlight(),
+        similar=SimilarityIndex(),
+    )
+    similar.run_diagnostics(_TELEMETRY)
+    reworded = replace(_TELEMETRY, symptoms="stuttering during large fights on ultra")
+    cases += [
+        ("run_diagnostics.backend", lambda: cold.run_diagnostics(_TELEMETRY)),
+        ("run_diagnostics.cache_hit", lambda: warm.run_diagnostics(_TELEMETRY)),
+        (
+            "run_diagnostics.rule_hit",
+            lambda: cold.run_diagnostics(_BLOCKED_TELEMETRY),
+        ),
+        ("run_diagnostics.similar_hit", lambda: similar.run_diagnostics(reworded)),
+    ]
+    return cases
+
+
+def _percentile(ordered: List[int], fraction: float) -> int:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(func: Callable[[], object], min_time: float) -> dict:
+    """Time func repeatedly for at least min_time seconds, then trace its memory."""
+    for _ in range(3):
+        func()
+    samples: List[int] = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(min_time * 1e9)
+    while clock() < deadline or len(samples) < 20:
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    samples.sort()
+    total = sum(samples)
+
+    tracemalloc.start()
+    for _ in range(_MEMORY_CALLS):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": len(samples),
+        "ops_per_second": len(samples) / (total / 1e9),
+        "p50_us": _percentile(samples, 0.50) / 1000,
+        "p99_us": _percentile(samples, 0.99) / 1000,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--filter", default="", help="only run cases containing this")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    # Renderers warn about running without `streamlit run`; the backend logs.
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    print(f"{'case':<30} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for name, func in _cases():
+        if args.filter not in name:
+            continue
+        r = measure(func, args.min_time)
+        results[name] = r
+        print(
+            f"{name:<30} {r['ops_per_second']:12.1f} {r['p50_us']:10.1f} "
+            f"{r['p99_us']:10.1f} {r['peak_memory_kib']:10.1f}"
+        )
+
+    if args.json:
+        report = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,159 @@ Centralised constants for the Zenith diagnostics application.
 No secrets should be stored here; use environment variables for sensitive values.
 """
 
+import os
+
 GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_TEMPERATURE = 0.3
+
+# Gemini HTTP client: an optional base URL override (e.g. a local stand-in),
+# keep-alive pool sizing, and whether to open the connection at server start.
+GEMINI_BASE_URL = os.environ.get("ZENITH_GEMINI_BASE_URL", "").strip()
+HTTP_MAX_CONNECTIONS = 256
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 120.0
+CLIENT_WARM_UP = os.environ.get("ZENITH_WARM_UP", "1").strip() != "0"
+
+# Diagnosis backend: "gemini" (the real model) or "synthetic" (offline,
+# deterministic payloads for load tests; needs no API key).
+DIAGNOSIS_BACKEND = os.environ.get("ZENITH_BACKEND", "gemini").strip().lower()
+
+# Synthetic backend: median latency and its distribution (fixed, uniform,
+# exponential, lognormal), injected error rate, and payload shape.
+SYNTHETIC_LATENCY_MS = float(os.environ.get("ZENITH_SYNTHETIC_LATENCY_MS", "800"))
+SYNTHETIC_LATENCY_DISTRIBUTION = os.environ.get(
+    "ZENITH_SYNTHETIC_LATENCY_DIST", "lognormal"
+).strip()
+SYNTHETIC_ERROR_RATE = float(os.environ.get("ZENITH_SYNTHETIC_ERROR_RATE", "0"))
+SYNTHETIC_TWEAKS = 3
+SYNTHETIC_TEXT_CHARS = 160
+SYNTHETIC_CHUNK_CHARS = 64
+SYNTHETIC_SEED = 0
+
+# Record/replay cassettes: with mode "record" every backend call is appended
+# to the cassette file; with "replay" calls are served from it instead, with
+# recorded latency multiplied by the scale (0 = full speed).
+CASSETTE_PATH = os.environ.get("ZENITH_CASSETTE", "").strip()
+CASSETTE_MODE = os.environ.get("ZENITH_CASSETTE_MODE", "").strip().lower()
+REPLAY_LATENCY_SCALE = float(os.environ.get("ZENITH_REPLAY_LATENCY_SCALE", "1.0"))
+
+# Resilience around generate calls: retries with exponential backoff and
+# full jitter, an overall per-request deadline that bounds all attempts, and
+# a circuit breaker that fails fast after consecutive upstream failures.
+RETRY_MAX_ATTEMPTS = int(os.environ.get("ZENITH_RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8.0
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Request deadline: the time a diagnosis may take end to end, from the click
+# to the last section, including every wait, retry and network attempt.
+# Blocking waits poll for cancellation (a rerun or a closed tab) this often.
+REQUEST_DEADLINE_SECONDS = float(
+    os.environ.get("ZENITH_REQUEST_DEADLINE_SECONDS", "60")
+)
+DEADLINE_POLL_SECONDS = 0.1
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Hedged requests (opt-in): a generate call still unanswered at the given
+# percentile of its model's recent latency is sent again, to the hedge
+# model if one is set, and the first valid response wins. A model is only
+# hedged once it has enough latency samples, never sooner than the minimum
+# delay, and hedges are capped at a share of all calls.
+HEDGE_REQUESTS = os.environ.get("ZENITH_HEDGE", "0").strip() == "1"
+HEDGE_PERCENTILE = float(os.environ.get("ZENITH_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MODEL = os.environ.get("ZENITH_HEDGE_MODEL", "").strip()
+HEDGE_MAX_RATE = float(os.environ.get("ZENITH_HEDGE_MAX_RATE", "0.1"))
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_SECONDS = 0.1
+HEDGE_LATENCY_WINDOW = 500
+HEDGE_MAX_WORKERS = 64
 
 APP_VERSION = "1.0.0"
+
+# Render diagnosis sections progressively from a streaming generate call.
+STREAM_RESULTS = True
+
+# Diagnosis mode: "full" asks for the whole document in one call;
+# "two_phase" renders a small triage call (diagnosis and compatibility)
+# first, then fetches the tweaks and warnings with the triage as context,
+# right away or, with details on demand, only when the user asks for them;
+# "parallel" generates the verdict, tweaks and warnings in concurrent calls.
+DIAGNOSIS_MODE = os.environ.get("ZENITH_DIAGNOSIS_MODE", "full").strip().lower()
+DETAILS_ON_DEMAND = os.environ.get("ZENITH_DETAILS_ON_DEMAND", "0").strip() == "1"
+
+# Speculative diagnosis (opt-in): once the required fields are filled in,
+# a diagnosis starts in the background after the form has been unchanged
+# for the debounce delay, so the click finds it in flight or cached. Calls
+# superseded after they started are wasted; a session stops speculating
+# after its wasted-call allowance, and concurrent speculative calls are
+# capped process-wide.
+SPECULATIVE_PREFETCH = os.environ.get("ZENITH_SPECULATIVE", "0").strip() == "1"
+SPECULATION_DEBOUNCE_SECONDS = float(
+    os.environ.get("ZENITH_SPECULATION_DEBOUNCE_SECONDS", "1.5")
+)
+SPECULATION_MAX_IN_FLIGHT = 8
+SPECULATION_MAX_WASTED_PER_SESSION = 3
+SPECULATION_MAX_SESSIONS = 10_000
+
+# Local rule fast path: application/OS pairs known to be hard blockers are
+# answered from the bundled rule table without a model call.
+LOCAL_RULES = os.environ.get("ZENITH_LOCAL_RULES", "1").strip() != "0"
+
+# Diagnosis cache: in-memory LRU size, entry lifetime, and an optional
+# SQLite file for the on-disk tier (disabled when empty).
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 6 * 60 * 60
+CACHE_DB_PATH = os.environ.get("ZENITH_CACHE_DB", "").strip()
+
+# Near-duplicate reuse: a request on identical hardware whose symptoms
+# match a past diagnosis's with at least this Jaccard similarity (over
+# stemmed, synonym-folded terms) reuses it, labelled as reused. The index
+# keeps at most this many past diagnoses in memory, and at most this many
+# megabytes of them, for as long as the result cache's TTL.
+SIMILARITY_REUSE = os.environ.get("ZENITH_SIMILARITY_REUSE", "1").strip() != "0"
+SIMILARITY_THRESHOLD = float(os.environ.get("ZENITH_SIMILARITY_THRESHOLD", "0.7"))
+SIMILARITY_MAX_ENTRIES = int(os.environ.get("ZENITH_SIMILARITY_MAX_ENTRIES", "50000"))
+SIMILARITY_MAX_BYTES = (
+    int(os.environ.get("ZENITH_SIMILARITY_MAX_MB", "64")) * 1024 * 1024
+)
+
+# Identical in-flight diagnoses share one upstream call; this bounds the
+# worker pool those shared calls run on.
+COALESCE_MAX_WORKERS = 32
+
+# Metrics: port for the Prometheus /metrics endpoint (0 disables it), and
+# whether to print one structured JSON log line per diagnosis to stderr.
+METRICS_PORT = int(os.environ.get("ZENITH_METRICS_PORT", "0"))
+REQUEST_LOG = os.environ.get("ZENITH_REQUEST_LOG", "0").strip() == "1"
+
+# Token budgets: tokens one session may spend, and tokens all sessions may
+# spend per UTC day (0 = unlimited). Once a budget is spent, new diagnoses
+# are rejected ("reject") or served by the cheaper fallback model
+# ("downgrade"). Cache hits are free and never blocked.
+TOKEN_BUDGET_PER_SESSION = int(os.environ.get("ZENITH_TOKEN_BUDGET_SESSION", "0"))
+TOKEN_BUDGET_PER_DAY = int(os.environ.get("ZENITH_TOKEN_BUDGET_DAY", "0"))
+BUDGET_ACTION = os.environ.get("ZENITH_BUDGET_ACTION", "reject").strip().lower()
+BUDGET_FALLBACK_MODEL = "gemini-2.0-flash-lite"
+LEDGER_MAX_SESSIONS = 10_000
+
+# Complexity routing (opt-in): each diagnosis is scored from 0 (routine) to
+# 1 (demanding) on its symptom description, uncommon hardware and whether
+# the rule table knows the application, then sent to the first tier whose
+# maximum score covers it. A tier is (name, model, temperature, maximum
+# output tokens or None, maximum score); the last tier should cover 1.0.
+# With routing off every diagnosis uses the standard tier.
+MODEL_ROUTING = os.environ.get("ZENITH_MODEL_ROUTING", "0").strip() == "1"
+ROUTING_LIGHT_MODEL = os.environ.get(
+    "ZENITH_ROUTING_LIGHT_MODEL", BUDGET_FALLBACK_MODEL
+).strip()
+ROUTING_LIGHT_MAX_SCORE = float(
+    os.environ.get("ZENITH_ROUTING_LIGHT_MAX_SCORE", "0.25")
+)
+MODEL_TIERS = (
+    ("light", ROUTING_LIGHT_MODEL, 0.2, 2048, ROUTING_LIGHT_MAX_SCORE),
+    ("standard", GEMINI_MODEL, GEMINI_TEMPERATURE, None, 1.0),
+)
+
+# The token usage admin view is shown at ?admin=<token> (disabled when empty).
+ADMIN_TOKEN = os.environ.get("ZENITH_ADMIN_TOKEN", "").strip()
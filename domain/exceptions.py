@@ -35,3 +35,27 @@ class DataParsingError(ZenithException):
     """Raised when the models fail to parse data returned by an external service."""
 
     pass
+
+
+class CircuitOpenError(ExternalServiceError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+    pass
+
+
+class DeadlineExceededError(ExternalServiceError):
+    """Raised when a request runs out of time before its diagnosis is complete."""
+
+    pass
+
+
+class RequestCancelledError(DeadlineExceededError):
+    """Raised when the session that made a request reruns or disconnects first."""
+
+    pass
+
+
+class BudgetExceededError(ZenithException):
+    """Raised when a session or the whole deployment has spent its token budget."""
+
+    pass
@@ -1,5 +1,11 @@
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, List, Union
+
+# Closed vocabularies, enforced by the structured-output response schema
+# (see domain/schema.py, which reads each field's metadata).
+BOTTLENECK_TYPES = ("CPU", "GPU", "RAM", "Storage", "Thermal", "Software", "Mixed")
+TWEAK_TYPES = ("Software", "OS", "Driver", "Config", "In-App")
+SAFETY_LEVELS = ("Safe", "Caution", "Advanced")
 
 
 def _safe_int(value: object, default: int = 0) -> int:
@@ -15,12 +21,75 @@ def _clamp(value: int, min_val: int, max_val: int) -> int:
     return max(min_val, min(max_val, value))
 
 
+@dataclass(frozen=True)
+class HardwareSpec:
+    """
+    Catalog specifications of a recognised CPU or GPU model. For a GPU,
+    cores counts shader units and only the boost clock is given.
+    """
+
+    name: str
+    kind: str  # "cpu" | "gpu"
+    cores: int
+    boost_clock_ghz: float
+    release_year: int
+    tier: str  # "entry" | "mainstream" | "performance" | "enthusiast"
+    threads: Optional[int] = None
+    base_clock_ghz: Optional[float] = None
+    vram_gb: Optional[int] = None
+
+    def describe(self) -> str:
+        """One-line summary of the numbers, as carried in the prompt."""
+        if self.kind == "gpu":
+            parts = [
+                f"{self.cores} shader units",
+                f"{self.boost_clock_ghz:g} GHz boost",
+                f"{self.vram_gb} GB VRAM",
+            ]
+        else:
+            parts = [f"{self.cores} cores / {self.threads} threads"]
+            if self.base_clock_ghz is None:
+                parts.append(f"up to {self.boost_clock_ghz:g} GHz")
+            else:
+                parts.append(f"{self.base_clock_ghz:g}-{self.boost_clock_ghz:g} GHz")
+        parts.append(f"{self.release_year} {self.tier} tier")
+        return ", ".join(parts)
+
+
+@dataclass(frozen=True)
+class MemorySpec:
+    """
+    Structured reading of the RAM field: capacity, and the memory
+    generation and speed when given.
+    """
+
+    capacity_gb: float
+    generation: Optional[str] = None  # e.g. "DDR4"
+    speed_mhz: Optional[int] = None
+
+    def describe(self) -> str:
+        """One-line summary of the numbers, as carried in the prompt."""
+        parts = [f"{self.capacity_gb:g} GB"]
+        if self.generation:
+            parts.append(self.generation)
+        if self.speed_mhz:
+            parts.append(f"{self.speed_mhz} MHz")
+        return ", ".join(parts)
+
+
+def _spec_note(spec: Optional[Union[HardwareSpec, MemorySpec]]) -> str:
+    return f" ({spec.describe()})" if spec is not None else ""
+
+
 @dataclass
 class TelemetryInput:
     """
     Represents the raw, structured input telemetry gathered from the user.
     This model contains the critical specifications required to contextually
     diagnose performance issues.
+
+    The spec fields are derived, never entered: canonicalisation fills
+    them in from the hardware catalog when it recognises the free text.
     """
 
     cpu: str
@@ -30,13 +99,27 @@ class TelemetryInput:
     os_name: str
     application: str
     symptoms: str
+    cpu_spec: Optional[HardwareSpec] = None
+    gpu_spec: Optional[HardwareSpec] = None
+    ram_spec: Optional[MemorySpec] = None
+
+    @property
+    def has_required_fields(self) -> bool:
+        """True when every field a diagnosis needs is filled in (symptoms are optional)."""
+        return bool(
+            self.cpu.strip()
+            and self.gpu.strip()
+            and self.application.strip()
+            and self.os_name
+            and self.storage
+        )
 
     def format_prompt(self) -> str:
         return (
             f"## System Specs\n"
-            f"- **CPU**: {self.cpu}\n"
-            f"- **GPU**: {self.gpu}\n"
-            f"- **RAM**: {self.ram}\n"
+            f"- **CPU**: {self.cpu}{_spec_note(self.cpu_spec)}\n"
+            f"- **GPU**: {self.gpu}{_spec_note(self.gpu_spec)}\n"
+            f"- **RAM**: {self.ram}{_spec_note(self.ram_spec)}\n"
             f"- **Storage**: {self.storage}\n"
             f"- **OS**: {self.os_name}\n\n"
             f"## Target Application\n"
@@ -53,11 +136,28 @@ class Diagnosis:
     Includes both a machine-readable category and plain-english rationale.
     """
 
-    bottleneck_type: str
-    severity: int
-    plain_english: str
-    reasoning: str
-    secondary_bottleneck: Optional[str] = None
+    bottleneck_type: str = field(metadata={"enum": BOTTLENECK_TYPES})
+    severity: int = field(metadata={"minimum": 1, "maximum": 10})
+    plain_english: str = field(
+        metadata={"description": "2-3 sentence human-readable diagnosis"}
+    )
+    reasoning: str = field(
+        metadata={"description": "Technical reasoning for this determination"}
+    )
+    secondary_bottleneck: Optional[str] = field(
+        default=None, metadata={"enum": BOTTLENECK_TYPES}
+    )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Diagnosis":
+        """Safely parses the raw "diagnosis" JSON object."""
+        return cls(
+            bottleneck_type=str(data.get("bottleneck_type", "Unknown")),
+            severity=_clamp(_safe_int(data.get("severity", 0)), 0, 10),
+            secondary_bottleneck=data.get("secondary_bottleneck"),
+            plain_english=str(data.get("plain_english", "")),
+            reasoning=str(data.get("reasoning", "")),
+        )
 
 
 @dataclass
@@ -67,8 +167,16 @@ class Compatibility:
     running on the provided operating system and hardware tier.
     """
 
-    score: int
-    note: str
+    score: int = field(metadata={"minimum": 0, "maximum": 100})
+    note: str = field(metadata={"description": "One-line compatibility summary"})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Compatibility":
+        """Safely parses the raw "compatibility" JSON object."""
+        return cls(
+            score=_clamp(_safe_int(data.get("score", 0)), 0, 100),
+            note=str(data.get("note", "")),
+        )
 
 
 @dataclass
@@ -78,13 +186,32 @@ class Tweak:
     provided to the user, including terminal commands and revert instructions.
     """
 
-    title: str
-    type: str
-    safety: str
+    title: str = field(metadata={"description": "Short descriptive title"})
+    type: str = field(metadata={"enum": TWEAK_TYPES})
+    safety: str = field(metadata={"enum": SAFETY_LEVELS})
     steps: List[str]
-    rationale: str
-    commands: List[str]
-    revert: str
+    rationale: str = field(
+        metadata={"description": "Why this helps for the diagnosed bottleneck"}
+    )
+    commands: List[str] = field(
+        metadata={
+            "description": "CLI/PowerShell/terminal commands that apply the tweak"
+        }
+    )
+    revert: str = field(metadata={"description": "How to undo this tweak"})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Tweak":
+        """Safely parses a single raw "tweaks" array element."""
+        return cls(
+            title=data.get("title", ""),
+            type=data.get("type", ""),
+            safety=data.get("safety", ""),
+            steps=data.get("steps", []),
+            commands=data.get("commands", []),
+            revert=data.get("revert", ""),
+            rationale=data.get("rationale", ""),
+        )
 
 
 @dataclass
@@ -94,8 +221,52 @@ class DoNotDo:
     that the user is warned against attempting.
     """
 
-    action: str
-    reason: str
+    action: str = field(metadata={"description": "What NOT to do"})
+    reason: str = field(
+        metadata={"description": "Why it is dangerous or counterproductive"}
+    )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DoNotDo":
+        """Safely parses a single raw "do_not_do" array element."""
+        return cls(action=data.get("action", ""), reason=data.get("reason", ""))
+
+
+@dataclass
+class TokenUsage:
+    """
+    Token counts one model call consumed. Cached tokens are the part of the
+    prompt served from the model's context cache, so they are a subset of
+    prompt_tokens rather than an addition to it.
+    """
+
+    model: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            model=self.model,
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            output_tokens=self.output_tokens + other.output_tokens,
+        )
+
+
+@dataclass(frozen=True)
+class GenerationSettings:
+    """
+    Sampling settings of one generate call. A max_output_tokens of None
+    leaves the model's own output limit in place.
+    """
+
+    temperature: float
+    max_output_tokens: Optional[int] = None
 
 
 @dataclass
@@ -107,49 +278,34 @@ class DiagnosticResponse:
 
     diagnosis: Diagnosis
     compatibility: Optional[Compatibility]
-    tweaks: List[Tweak]
+    tweaks: List[Tweak] = field(metadata={"maxItems": 3})
     do_not_do: List[DoNotDo]
+    # Tokens spent producing this response; None when it came from the cache,
+    # a local compatibility rule, or an identical request that was already in
+    # flight. Local only, so it is left out of the response schema.
+    usage: Optional[TokenUsage] = field(default=None, metadata={"schema": False})
+    # Set when this is a past diagnosis reused for near-identical telemetry:
+    # the similarity of the two symptom descriptions (0-1). Local only.
+    reused_similarity: Optional[float] = field(default=None, metadata={"schema": False})
+
+    @property
+    def is_complete(self) -> bool:
+        """False for a two-phase triage still waiting for its tweaks and warnings."""
+        return bool(self.tweaks or self.do_not_do)
 
     @classmethod
     def from_dict(cls, data: dict) -> "DiagnosticResponse":
         """Safely parses raw JSON dict into domain models."""
 
-        diag_data = data.get("diagnosis", {})
-        diagnosis = Diagnosis(
-            bottleneck_type=str(diag_data.get("bottleneck_type", "Unknown")),
-            severity=_clamp(_safe_int(diag_data.get("severity", 0)), 0, 10),
-            secondary_bottleneck=diag_data.get("secondary_bottleneck"),
-            plain_english=str(diag_data.get("plain_english", "")),
-            reasoning=str(diag_data.get("reasoning", "")),
-        )
+        diagnosis = Diagnosis.from_dict(data.get("diagnosis", {}))
 
         compat_data = data.get("compatibility")
         compatibility = None
         if compat_data:
-            compatibility = Compatibility(
-                score=_clamp(_safe_int(compat_data.get("score", 0)), 0, 100),
-                note=str(compat_data.get("note", "")),
-            )
-
-        tweaks = []
-        for t in data.get("tweaks", []):
-            tweaks.append(
-                Tweak(
-                    title=t.get("title", ""),
-                    type=t.get("type", ""),
-                    safety=t.get("safety", ""),
-                    steps=t.get("steps", []),
-                    commands=t.get("commands", []),
-                    revert=t.get("revert", ""),
-                    rationale=t.get("rationale", ""),
-                )
-            )
-
-        do_not_do = []
-        for dnd in data.get("do_not_do", []):
-            do_not_do.append(
-                DoNotDo(action=dnd.get("action", ""), reason=dnd.get("reason", ""))
-            )
+            compatibility = Compatibility.from_dict(compat_data)
+
+        tweaks = [Tweak.from_dict(t) for t in data.get("tweaks", [])]
+        do_not_do = [DoNotDo.from_dict(dnd) for dnd in data.get("do_not_do", [])]
 
         return cls(
             diagnosis=diagnosis,
@@ -157,3 +313,54 @@ class DiagnosticResponse:
             tweaks=tweaks,
             do_not_do=do_not_do,
         )
+
+    @classmethod
+    def from_schema_dict(cls, data: dict) -> "DiagnosticResponse":
+        """Fast path for documents that already match the response schema.
+
+        Structured output guarantees the shape and types, so the per-field
+        coercion of from_dict is skipped. Raises KeyError or TypeError when
+        a field is missing or unexpected; callers fall back to from_dict.
+        """
+        compat_data = data["compatibility"]
+        return cls(
+            diagnosis=Diagnosis(**data["diagnosis"]),
+            compatibility=Compatibility(**compat_data) if compat_data else None,
+            tweaks=[Tweak(**t) for t in data["tweaks"]],
+            do_not_do=[DoNotDo(**dnd) for dnd in data["do_not_do"]],
+        )
+
+    def iter_sections(self) -> Iterator["DiagnosticSection"]:
+        """Yield this response as sections in the order a stream delivers them.
+
+        A reused diagnosis is preceded by a "reused" section carrying its
+        similarity, so streaming renderers can label it.
+        """
+        if self.reused_similarity is not None:
+            yield DiagnosticSection("reused", self.reused_similarity)
+        yield DiagnosticSection("diagnosis", self.diagnosis)
+        if self.compatibility:
+            yield DiagnosticSection("compatibility", self.compatibility)
+        for tweak in self.tweaks:
+            yield DiagnosticSection("tweak", tweak)
+        for item in self.do_not_do:
+            yield DiagnosticSection("do_not_do", item)
+
+
+@dataclass
+class DiagnosticSection:
+    """
+    A single completed section of a streamed diagnostic response, emitted
+    as soon as it has been received so the UI can render progressively.
+    """
+
+    kind: str  # "reused" | "diagnosis" | "compatibility" | "tweak" | "do_not_do"
+    value: Union[float, Diagnosis, Compatibility, Tweak, DoNotDo]
+
+
+SECTION_MODELS = {
+    "diagnosis": Diagnosis,
+    "compatibility": Compatibility,
+    "tweak": Tweak,
+    "do_not_do": DoNotDo,
+}
@@ -0,0 +1,113 @@
+"""
+Zenith — Structured Output Response Schema.
+
+Derives the response schema Gemini enforces on its output from the domain
+dataclasses, so domain/models.py is the single definition of the response
+shape. Type hints give the structure; field metadata adds what hints
+cannot express (enums, numeric ranges, item limits and descriptions).
+Fields whose metadata sets "schema" to False are local-only and omitted.
+
+Every property is required and Optional fields are nullable. The
+top-level sections are pinned to dataclass field order with
+propertyOrdering; Gemini otherwise emits them alphabetically, which would
+stream do_not_do ahead of tweaks. Nested objects are hydrated whole, so
+their order is left free (the schema counts toward input tokens).
+
+response_schema() restricts the document to some of its top-level
+sections. A two-phase diagnosis asks for TRIAGE_SECTIONS and then
+DETAIL_SECTIONS; a parallel one generates each of SECTION_GROUPS
+concurrently.
+"""
+
+import dataclasses
+import hashlib
+import json
+import typing
+from functools import lru_cache
+from typing import Tuple
+
+from domain.models import DiagnosticResponse
+
+_SCALAR_TYPES = {str: "STRING", int: "INTEGER", float: "NUMBER", bool: "BOOLEAN"}
+_FIELD_KEYWORDS = ("description", "enum", "minimum", "maximum", "minItems", "maxItems")
+
+
+def schema_for(annotation: object) -> dict:
+    """Build the Gemini schema for a type annotation.
+
+    Raises:
+        TypeError: If the annotation has no schema equivalent.
+    """
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        members = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(members) != 1:
+            raise TypeError(f"No response schema for union {annotation!r}.")
+        return {**schema_for(members[0]), "nullable": True}
+    if origin is list:
+        (item,) = typing.get_args(annotation)
+        return {"type": "ARRAY", "items": schema_for(item)}
+    if dataclasses.is_dataclass(annotation):
+        return _object_schema(annotation)
+    if annotation in _SCALAR_TYPES:
+        return {"type": _SCALAR_TYPES[annotation]}
+    raise TypeError(f"No response schema for type {annotation!r}.")
+
+
+def _object_schema(cls: type) -> dict:
+    hints = typing.get_type_hints(cls)
+    properties = {}
+    for item in dataclasses.fields(cls):
+        if item.metadata.get("schema", True) is False:
+            continue
+        prop = schema_for(hints[item.name])
+        for keyword in _FIELD_KEYWORDS:
+            if keyword in item.metadata:
+                value = item.metadata[keyword]
+                prop[keyword] = list(value) if keyword == "enum" else value
+        properties[item.name] = prop
+    return {"type": "OBJECT", "properties": properties, "required": list(properties)}
+
+
+_FULL_SCHEMA = schema_for(DiagnosticResponse)
+
+RESPONSE_SECTIONS: Tuple[str, ...] = tuple(_FULL_SCHEMA["properties"])
+TRIAGE_SECTIONS: Tuple[str, ...] = ("diagnosis", "compatibility")
+DETAIL_SECTIONS: Tuple[str, ...] = ("tweaks", "do_not_do")
+SECTION_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    TRIAGE_SECTIONS,
+    ("tweaks",),
+    ("do_not_do",),
+)
+
+
+@lru_cache(maxsize=None)
+def response_schema(sections: Tuple[str, ...] = RESPONSE_SECTIONS) -> dict:
+    """Return the response schema limited to the given top-level sections.
+
+    The result is shared between callers and must not be modified.
+
+    Raises:
+        KeyError: If a section is not a DiagnosticResponse field.
+    """
+    properties = {name: _FULL_SCHEMA["properties"][name] for name in sections}
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": list(sections),
+        "propertyOrdering": list(sections),
+    }
+
+
+@lru_cache(maxsize=None)
+def response_schema_hash(sections: Tuple[str, ...] = RESPONSE_SECTIONS) -> str:
+    """Hash of response_schema(sections), part of every cache and cassette key."""
+    return hashlib.sha256(
+        json.dumps(response_schema(sections), sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+RESPONSE_SCHEMA = response_schema()
+
+# Part of every cache and cassette key, so a schema change invalidates both.
+RESPONSE_SCHEMA_HASH = response_schema_hash()
@@ -0,0 +1,392 @@
+"""
+Zenith — Process Metrics and Request Tracing.
+
+A small, dependency-free metrics registry shared by every layer:
+
+* counters and fixed-bucket histograms with labels, exported in the
+  Prometheus text format (render_prometheus, or an optional HTTP endpoint
+  started with start_metrics_server);
+* span(stage), which times one stage of a diagnosis into the
+  zenith_stage_seconds histogram and the active RequestTrace;
+* request_trace(path), which scopes one diagnosis and, when the outermost
+  scope ends, writes a single structured JSON log line with the per-stage
+  breakdown to the "zenith.requests" logger.
+
+Recording a span costs two perf_counter reads, one dict lookup, one lock
+and one bisect, so instrumentation stays on in production.
+"""
+
+import bisect
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import METRICS_PORT, REQUEST_LOG
+
+logger = logging.getLogger(__name__)
+request_logger = logging.getLogger("zenith.requests")
+if REQUEST_LOG and not request_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    request_logger.addHandler(_handler)
+    request_logger.setLevel(logging.INFO)
+    request_logger.propagate = False
+
+# Seconds; covers cache hits (sub-millisecond) through slow generations.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """One labelled histogram series; guarded by its registry's lock."""
+
+    __slots__ = ("buckets", "counts", "total", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and histograms."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def histogram(
+        self,
+        name: str,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        **labels: str,
+    ) -> _Histogram:
+        """Return the series for name and labels, creating it on first use.
+
+        Hot paths keep the returned handle and call its observe() directly,
+        which skips the label lookup.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets, self._lock)
+            return histogram
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        **labels: str,
+    ) -> None:
+        self.histogram(name, buckets, **labels).observe(value)
+
+    def register_collector(
+        self, name: str, collect: Callable[[], Dict[str, float]]
+    ) -> None:
+        """Register a callable whose numeric results are exported as gauges
+        named zenith_<name>_<key> at scrape time. Re-registering replaces it.
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {
+                n: {
+                    k: (list(h.counts), h.total, h.count, h.buckets)
+                    for k, h in s.items()
+                }
+                for n, s in self._histograms.items()
+            }
+            collectors = list(self._collectors.items())
+
+        for name in sorted(counters):
+            self._header(lines, name, "counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for name in sorted(histograms):
+            self._header(lines, name, "histogram")
+            for labels, (counts, total, count, buckets) in sorted(
+                histograms[name].items()
+            ):
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    bucket_labels = labels + (("le", f"{bound:g}"),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                    )
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}"
+                )
+                lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for prefix, collect in collectors:
+            try:
+                values = collect()
+            except Exception as exc:
+                logger.warning("Metrics collector %s failed: %s", prefix, exc)
+                continue
+            for key, value in sorted(_flatten(values).items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"zenith_{prefix}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _flatten(values: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in values.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}_"))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _format_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+registry = MetricsRegistry()
+registry.describe("zenith_requests_total", "Diagnosis requests by path and outcome.")
+registry.describe(
+    "zenith_errors_total", "Failed diagnoses by ZenithException subclass."
+)
+registry.describe("zenith_response_bytes_total", "Model response text received.")
+registry.describe("zenith_stage_seconds", "Time spent in each diagnosis stage.")
+registry.describe("zenith_request_seconds", "End-to-end diagnosis latency.")
+
+
+@dataclass
+class RequestTrace:
+    """Per-request timing breakdown, logged as one line when the request ends."""
+
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    stages: Dict[str, float] = field(default_factory=dict)
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "zenith_request_trace", default=None
+)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def annotate(**attributes: object) -> None:
+    """Attach attributes (cache outcome, byte counts, ...) to the active trace."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+
+
+# Series handles by label value, so hot paths skip the registry lookup.
+_stage_histograms: Dict[str, _Histogram] = {}
+_request_histograms: Dict[str, _Histogram] = {}
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Record time spent in a stage that was measured by the caller."""
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms[stage] = registry.histogram(
+            "zenith_stage_seconds", stage=stage
+        )
+    histogram.observe(seconds)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+class span:
+    """Context manager timing the enclosed block as one stage of the current diagnosis."""
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        record_stage(self.stage, time.perf_counter() - self._start)
+
+
+@contextmanager
+def request_trace(path: str) -> Iterator[RequestTrace]:
+    """Scope one diagnosis request.
+
+    Nested scopes join the outermost trace, so a controller can wrap both
+    the service call and rendering in one request. Only the outermost scope
+    records the request counters and histogram and writes the log line.
+    Exceptions are counted by class name and re-raised.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        yield outer
+        return
+
+    trace = RequestTrace(path=path)
+    token = _current_trace.set(trace)
+    outcome = "ok"
+    try:
+        yield trace
+    except BaseException as exc:
+        outcome = "error"
+        trace.attributes["error"] = type(exc).__name__
+        raise
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # A generator-held scope was finalised from another context.
+            pass
+        total = time.perf_counter() - trace.started
+        if outcome == "error":
+            registry.inc("zenith_errors_total", type=trace.attributes["error"])
+        registry.inc("zenith_requests_total", path=path, outcome=outcome)
+        histogram = _request_histograms.get(path)
+        if histogram is None:
+            histogram = _request_histograms[path] = registry.histogram(
+                "zenith_request_seconds", path=path
+            )
+        histogram.observe(total)
+        if request_logger.isEnabledFor(logging.INFO):
+            request_logger.info(
+                json.dumps(
+                    {
+                        "event": "diagnosis",
+                        "path": path,
+                        "outcome": outcome,
+                        "total_ms": round(total * 1000, 3),
+                        "stages_ms": {
+                            k: round(v * 1000, 3) for k, v in trace.stages.items()
+                        },
+                        **trace.attributes,
+                    },
+                    default=str,
+                    separators=(",", ":"),
+                )
+            )
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> Optional[int]:
+    """Serve /metrics on a background thread; idempotent, disabled when port is 0.
+
+    Returns:
+        The bound port, or None when the exporter is disabled or failed to bind.
+    """
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            except OSError as exc:
+                logger.warning("Metrics exporter could not bind port %d: %s", port, exc)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(
+                target=_server.serve_forever, name="zenith-metrics", daemon=True
+            ).start()
+            logger.info("Metrics exporter listening on :%d/metrics.", port)
+        return _server.server_address[1]
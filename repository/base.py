@@ -0,0 +1,68 @@
+"""
+Zenith — Diagnosis Backend Protocol.
+
+The interface DiagnosticsService depends on. GeminiDiagnosticsRepository is
+the production implementation; SyntheticDiagnosisBackend is an offline
+stand-in for load tests. The backend is chosen by config.DIAGNOSIS_BACKEND.
+Implementations satisfy the protocol structurally and need not inherit it.
+"""
+
+from typing import Iterator, Optional, Protocol, Tuple, runtime_checkable
+
+from config import GEMINI_MODEL
+from domain.models import GenerationSettings
+from domain.schema import RESPONSE_SECTIONS
+
+
+@runtime_checkable
+class DiagnosisBackend(Protocol):
+    """Source of raw diagnosis JSON documents for a structured prompt.
+
+    Implementations raise ExternalServiceError when the backend fails and
+    DataParsingError when its output is not a JSON object. Each call reports
+    the tokens it consumed through repository.usage.report_usage(), and
+    asks for the top-level response sections named by sections only.
+    Settings of None mean the configured temperature and no output limit.
+    """
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        """Return the raw diagnosis dictionary for the prompt."""
+        ...
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        """Asyncio counterpart of fetch_diagnosis."""
+        ...
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        """Yield the raw JSON response text in fragments as it is produced."""
+        ...
+
+    def warm_up(self) -> bool:
+        """Prepare connections ahead of the first request; never raises."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release any resources held by the backend's asyncio side."""
+        ...
@@ -0,0 +1,435 @@
+"""
+Zenith — Record/Replay Cassettes.
+
+Captures diagnosis traffic to a compact on-disk cassette and serves it back
+without the network, so benchmarks and regression runs see realistic model
+output.
+
+* RecordingBackend wraps any DiagnosisBackend. For every call it stores the
+  request identity (prompt hash, model and a hash of the generation config
+  and of the response schema for the requested sections), the response
+  text, the observed latency, and for streams the arrival time of each
+  fragment. Failures are recorded as well, so a replay reproduces them;
+  a request's own deadline running out is not an upstream failure and is
+  not recorded.
+* ReplayBackend implements DiagnosisBackend from a cassette. It waits for
+  the recorded latency multiplied by latency_scale (0 replays at full
+  speed), within the current request's deadline.
+  When a request was recorded several times, the recordings are served
+  round-robin. Token usage is not recorded; replays report an estimate.
+
+Cassettes are SQLite files with zlib-compressed prompt and response text.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import GEMINI_MODEL, GEMINI_TEMPERATURE
+from ui_constants import SYSTEM_PROMPT
+from domain.exceptions import (
+    DataParsingError,
+    DeadlineExceededError,
+    ExternalServiceError,
+)
+from domain.schema import (
+    RESPONSE_SCHEMA_HASH,
+    RESPONSE_SECTIONS,
+    response_schema_hash,
+)
+from domain.models import GenerationSettings
+from repository.base import DiagnosisBackend
+from repository.deadline import bounded_sleep, bounded_sleep_async
+from repository.usage import estimate_usage, report_usage
+
+logger = logging.getLogger(__name__)
+
+_ERROR_TYPES = {
+    "ExternalServiceError": ExternalServiceError,
+    "DataParsingError": DataParsingError,
+}
+
+
+def config_fingerprint(
+    model: str = GEMINI_MODEL,
+    temperature: float = GEMINI_TEMPERATURE,
+    system_prompt: str = SYSTEM_PROMPT,
+    schema_hash: str = RESPONSE_SCHEMA_HASH,
+    max_output_tokens: Optional[int] = None,
+) -> str:
+    """Hash of everything besides the prompt that shapes a response."""
+    config = {
+        "temperature": temperature,
+        "system_prompt": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+        "schema": schema_hash,
+    }
+    if max_output_tokens is not None:
+        config["max_output_tokens"] = max_output_tokens
+    material = json.dumps(config, sort_keys=True)
+    return f"{model}:{hashlib.sha256(material.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _config_for(
+    default: str,
+    model: str,
+    sections: Tuple[str, ...],
+    settings: Optional[GenerationSettings] = None,
+) -> str:
+    """The backend's own fingerprint, or one for a non-default model, sections or settings."""
+    if model == GEMINI_MODEL and sections == RESPONSE_SECTIONS and settings is None:
+        return default
+    if settings is None:
+        return config_fingerprint(model, schema_hash=response_schema_hash(sections))
+    return config_fingerprint(
+        model,
+        temperature=settings.temperature,
+        schema_hash=response_schema_hash(sections),
+        max_output_tokens=settings.max_output_tokens,
+    )
+
+
+def request_key(structured_prompt: str, config: str) -> str:
+    """Identity of one request: the prompt hash under a config fingerprint."""
+    prompt_hash = hashlib.sha256(structured_prompt.encode("utf-8")).hexdigest()
+    return f"{config}:{prompt_hash}"
+
+
+@dataclass
+class Recording:
+    """One recorded call, as stored in a cassette."""
+
+    key: str
+    prompt: str
+    kind: str  # "fetch" | "stream"
+    latency_seconds: float
+    response_text: str
+    # (seconds since request start, fragment length) for each streamed fragment
+    fragments: List[Tuple[float, int]]
+    error_type: Optional[str] = None
+
+
+class CassetteStore:
+    """Thread-safe SQLite cassette of recorded diagnosis calls."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS recordings ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, "
+            "kind TEXT NOT NULL, latency REAL NOT NULL, fragments TEXT NOT NULL, "
+            "error_type TEXT, prompt BLOB NOT NULL, response BLOB NOT NULL, "
+            "recorded_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS recordings_key ON recordings (key)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def append(self, recording: Recording) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO recordings (key, kind, latency, fragments, error_type, "
+                "prompt, response, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    recording.key,
+                    recording.kind,
+                    recording.latency_seconds,
+                    json.dumps(recording.fragments, separators=(",", ":")),
+                    recording.error_type,
+                    zlib.compress(recording.prompt.encode("utf-8")),
+                    zlib.compress(recording.response_text.encode("utf-8")),
+                    time.time(),
+                ),
+            )
+            self._db.commit()
+
+    def __iter__(self) -> Iterator[Recording]:
+        """Yield every recording in the order it was captured."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, prompt, kind, latency, response, fragments, error_type "
+                "FROM recordings ORDER BY id"
+            ).fetchall()
+        for key, prompt, kind, latency, response, fragments, error_type in rows:
+            yield Recording(
+                key=key,
+                prompt=zlib.decompress(prompt).decode("utf-8"),
+                kind=kind,
+                latency_seconds=latency,
+                response_text=zlib.decompress(response).decode("utf-8"),
+                fragments=[tuple(f) for f in json.loads(fragments)],
+                error_type=error_type,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RecordingBackend:
+    """DiagnosisBackend decorator that records every call to a CassetteStore.
+
+    Args:
+        inner: The backend that actually serves requests.
+        store: Where recordings are appended.
+        config: Config fingerprint stored with each request.
+    """
+
+    def __init__(
+        self,
+        inner: DiagnosisBackend,
+        store: CassetteStore,
+        config: Optional[str] = None,
+    ) -> None:
+        self.inner = inner
+        self.store = store
+        self.config = config or config_fingerprint()
+        logger.info("Recording diagnosis traffic to cassette %s.", store.path)
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        started = time.perf_counter()
+        key = self._key(structured_prompt, model, sections, settings)
+        try:
+            payload = self.inner.fetch_diagnosis(
+                structured_prompt, model=model, sections=sections, settings=settings
+            )
+        except DeadlineExceededError:
+            raise
+        except (ExternalServiceError, DataParsingError) as exc:
+            self._record(key, structured_prompt, "fetch", started, str(exc), [], exc)
+            raise
+        self._record(key, structured_prompt, "fetch", started, json.dumps(payload), [])
+        return payload
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        started = time.perf_counter()
+        key = self._key(structured_prompt, model, sections, settings)
+        try:
+            payload = await self.inner.fetch_diagnosis_async(
+                structured_prompt, model=model, sections=sections, settings=settings
+            )
+        except DeadlineExceededError:
+            raise
+        except (ExternalServiceError, DataParsingError) as exc:
+            self._record(key, structured_prompt, "fetch", started, str(exc), [], exc)
+            raise
+        self._record(key, structured_prompt, "fetch", started, json.dumps(payload), [])
+        return payload
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        started = time.perf_counter()
+        key = self._key(structured_prompt, model, sections, settings)
+        pieces: List[str] = []
+        fragments: List[Tuple[float, int]] = []
+        try:
+            for piece in self.inner.stream_diagnosis(
+                structured_prompt, model=model, sections=sections, settings=settings
+            ):
+                fragments.append((round(time.perf_counter() - started, 6), len(piece)))
+                pieces.append(piece)
+                yield piece
+        except DeadlineExceededError:
+            raise
+        except (ExternalServiceError, DataParsingError) as exc:
+            self._record(key, structured_prompt, "stream", started, str(exc), [], exc)
+            raise
+        self._record(
+            key, structured_prompt, "stream", started, "".join(pieces), fragments
+        )
+
+    def warm_up(self) -> bool:
+        return self.inner.warm_up()
+
+    def close(self) -> None:
+        self.inner.close()
+        self.store.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def _key(
+        self,
+        structured_prompt: str,
+        model: str,
+        sections: Tuple[str, ...],
+        settings: Optional[GenerationSettings],
+    ) -> str:
+        return request_key(
+            structured_prompt, _config_for(self.config, model, sections, settings)
+        )
+
+    def _record(
+        self,
+        key: str,
+        structured_prompt: str,
+        kind: str,
+        started: float,
+        text: str,
+        fragments: List[Tuple[float, int]],
+        error: Optional[Exception] = None,
+    ) -> None:
+        try:
+            self.store.append(
+                Recording(
+                    key=key,
+                    prompt=structured_prompt,
+                    kind=kind,
+                    latency_seconds=time.perf_counter() - started,
+                    response_text=text,
+                    fragments=fragments,
+                    error_type=type(error).__name__ if error else None,
+                )
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Failed to write cassette recording: %s", exc)
+
+
+class ReplayBackend:
+    """DiagnosisBackend that serves recorded responses from a cassette.
+
+    Args:
+        store: The cassette to replay; it is read fully into memory.
+        latency_scale: Multiplier on recorded latency (0 replays at full speed).
+        config: Config fingerprint requests are matched under.
+    """
+
+    def __init__(
+        self,
+        store: CassetteStore,
+        latency_scale: float = 1.0,
+        config: Optional[str] = None,
+    ) -> None:
+        self.latency_scale = max(0.0, latency_scale)
+        self.config = config or config_fingerprint()
+        recordings: Dict[str, List[Recording]] = {}
+        for recording in store:
+            recordings.setdefault(recording.key, []).append(recording)
+        self._cursors = {
+            key: itertools.cycle(items) for key, items in recordings.items()
+        }
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        logger.info(
+            "Replaying %d recorded requests from cassette %s.",
+            len(recordings),
+            store.path,
+        )
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        recording = self._lookup(structured_prompt, model, sections, settings)
+        bounded_sleep(recording.latency_seconds * self.latency_scale, "network")
+        return self._decode(recording, model)
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        recording = self._lookup(structured_prompt, model, sections, settings)
+        await bounded_sleep_async(
+            recording.latency_seconds * self.latency_scale, "network"
+        )
+        return self._decode(recording, model)
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        recording = self._lookup(structured_prompt, model, sections, settings)
+        text = recording.response_text
+        fragments = recording.fragments
+        if recording.error_type or not fragments:
+            # Recorded as a blocking call (or a failure): one fragment at the end.
+            fragments = [(recording.latency_seconds, len(text))]
+        started = time.perf_counter()
+        position = 0
+        for offset, length in fragments:
+            wait = offset * self.latency_scale - (time.perf_counter() - started)
+            if wait > 0:
+                bounded_sleep(wait, "stream")
+            if recording.error_type:
+                self._raise(recording)
+            yield text[position : position + length]
+            position += length
+        report_usage(estimate_usage(model, structured_prompt, len(text)))
+
+    def warm_up(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def _lookup(
+        self,
+        structured_prompt: str,
+        model: str,
+        sections: Tuple[str, ...],
+        settings: Optional[GenerationSettings],
+    ) -> Recording:
+        key = request_key(
+            structured_prompt, _config_for(self.config, model, sections, settings)
+        )
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                return next(cursor)
+        logger.error("No cassette recording for request %s.", key[-12:])
+        raise ExternalServiceError("No cassette recording matches this request.")
+
+    def _decode(self, recording: Recording, model: str) -> dict:
+        if recording.error_type:
+            self._raise(recording)
+        report_usage(
+            estimate_usage(model, recording.prompt, len(recording.response_text))
+        )
+        return json.loads(recording.response_text)
+
+    @staticmethod
+    def _raise(recording: Recording) -> None:
+        error = _ERROR_TYPES.get(recording.error_type, ExternalServiceError)
+        raise error(recording.response_text)
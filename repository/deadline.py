@@ -0,0 +1,197 @@
+"""
+Zenith — Request Deadlines and Cancellation.
+
+A Deadline is created once per request (by the controller, or by the
+service when the caller passes none) and bounds everything the request
+does: waiting on a shared call, retry backoff, each HTTP attempt, every
+streamed chunk and the synthetic or replayed latency. It can also be
+cancelled, when the session that made the request reruns or disconnects,
+which expires it at once.
+
+Like token usage reports (see usage.py), the deadline travels beside the
+backend protocol rather than through it: the service enters
+deadline_scope() and backends read current_deadline() at their own
+checkpoints. Worker threads that run in a copy of the caller's context
+see the same deadline.
+
+Waits are sliced into short polls, so a cancellation is noticed within
+DEADLINE_POLL_SECONDS even while blocked. Every expiry is raised as
+DeadlineExceededError (RequestCancelledError when cancelled) and counted
+by stage in zenith_timeouts_total.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, NoReturn, Optional
+
+from config import DEADLINE_POLL_SECONDS, REQUEST_DEADLINE_SECONDS
+from domain.exceptions import DeadlineExceededError, RequestCancelledError
+from metrics import registry
+
+registry.describe(
+    "zenith_timeouts_total",
+    "Requests stopped by their deadline, by stage and reason (expired or cancelled).",
+)
+
+_current: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "zenith_deadline", default=None
+)
+
+
+class Deadline:
+    """Expiry time and cancellation flag of one request. Thread-safe.
+
+    Args:
+        timeout_seconds: Time the request may take from now.
+        abandoned: Optional check, polled while waiting, that returns True
+            once nobody is waiting for the result any more; the deadline
+            then cancels itself.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = REQUEST_DEADLINE_SECONDS,
+        abandoned: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.timeout_seconds = timeout_seconds
+        self._expires_at = time.monotonic() + timeout_seconds
+        self._parent: Optional[Deadline] = None
+        self._abandoned = abandoned
+        self._cancelled = threading.Event()
+
+    @property
+    def expires_at(self) -> float:
+        """Monotonic time at which the deadline passes."""
+        if self._parent is not None:
+            return self._parent.expires_at
+        return self._expires_at
+
+    def cancel(self) -> None:
+        """Expire the deadline now; waits and checkpoints raise RequestCancelledError."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancelled.is_set() and self._abandoned is not None:
+            if self._abandoned():
+                self._cancelled.set()
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed or been cancelled."""
+        return self.cancelled or time.monotonic() >= self.expires_at
+
+    def remaining(self) -> float:
+        """Seconds left, 0.0 once expired or cancelled."""
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def detached(self) -> "Deadline":
+        """Return a deadline with the same expiry that is only cancelled explicitly.
+
+        Shared work gets one, so it outlives a waiter that gives up.
+        """
+        detached = Deadline(self.timeout_seconds)
+        detached._expires_at = self.expires_at
+        return detached
+
+    def child(self) -> "Deadline":
+        """Return a deadline that expires and is cancelled with this one.
+
+        It can also be cancelled on its own, without touching this one: a
+        hedged call gets one per attempt, so the losing attempt can be stopped.
+        """
+        child = Deadline(self.timeout_seconds, abandoned=lambda: self.cancelled)
+        child._parent = self
+        return child
+
+    def extend_to(self, other: "Deadline") -> None:
+        """Push the expiry out to other's, if that is later."""
+        self._expires_at = max(self._expires_at, other.expires_at)
+
+    def check(self, stage: str) -> None:
+        """Raise if the deadline has expired or been cancelled.
+
+        Raises:
+            RequestCancelledError: If the request was cancelled.
+            DeadlineExceededError: If its time is up.
+        """
+        if self.expired:
+            self.expire(stage)
+
+    def expire(self, stage: str) -> NoReturn:
+        """Count and raise the error for a request stopped by this deadline."""
+        if self.cancelled:
+            registry.inc("zenith_timeouts_total", stage=stage, reason="cancelled")
+            raise RequestCancelledError(
+                f"Diagnosis cancelled during {stage}: the session moved on."
+            )
+        registry.inc("zenith_timeouts_total", stage=stage, reason="expired")
+        raise DeadlineExceededError(
+            f"Diagnosis timed out during {stage} after {self.timeout_seconds:g}s."
+        )
+
+    def poll_interval(self) -> float:
+        """How long one slice of a blocking wait may last."""
+        return min(DEADLINE_POLL_SECONDS, self.remaining())
+
+    def sleep(self, seconds: float, stage: str) -> None:
+        """Sleep, waking early and raising if the deadline passes first."""
+        until = time.monotonic() + seconds
+        while True:
+            self.check(stage)
+            left = until - time.monotonic()
+            if left <= 0:
+                return
+            self._cancelled.wait(min(left, self.poll_interval()))
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline of the request being served, or None outside one."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make deadline the current one for backend calls made inside the block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # A generator-held scope was finalised from another context.
+            pass
+
+
+def checkpoint(stage: str) -> None:
+    """Raise if the current request's deadline has expired or been cancelled."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def bounded_sleep(seconds: float, stage: str) -> None:
+    """time.sleep bounded by the current deadline, if any."""
+    deadline = _current.get()
+    if deadline is None:
+        time.sleep(seconds)
+    else:
+        deadline.sleep(seconds, stage)
+
+
+async def bounded_sleep_async(seconds: float, stage: str) -> None:
+    """asyncio.sleep bounded by the current deadline, if any."""
+    deadline = _current.get()
+    if deadline is None:
+        await asyncio.sleep(seconds)
+        return
+    deadline.check(stage)
+    await asyncio.sleep(min(seconds, deadline.remaining()))
+    deadline.check(stage)
@@ -0,0 +1,248 @@
+"""
+Zenith — Diagnosis Result Cache.
+
+Content-addressed cache for raw Gemini diagnosis payloads. Entries are
+keyed by the canonical telemetry fingerprint together with everything
+that shapes the model's answer (model name, temperature, the system
+prompt and the response schema), so changing any of those automatically
+invalidates old entries.
+
+Two tiers are provided: a bounded in-memory LRU and an optional SQLite
+file that survives process restarts. Both tiers honour the same TTL.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from config import CACHE_DB_PATH, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_KEY_VERSION = "v3"
+
+
+def build_cache_key(
+    fingerprint: str,
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    schema_hash: str,
+    max_output_tokens: Optional[int] = None,
+) -> str:
+    """Derive the content-addressed cache key for a diagnosis request.
+
+    Args:
+        fingerprint: The stable fingerprint of the canonical telemetry.
+        model: The Gemini model name used for generation.
+        temperature: The sampling temperature used for generation.
+        system_prompt: The system instruction sent alongside the telemetry.
+        schema_hash: Digest of the structured-output response schema.
+        max_output_tokens: The output limit of the call, if one was set.
+
+    Returns:
+        A hex SHA-256 digest that is stable across processes and platforms.
+    """
+    prompt_digest = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    request = {
+        "version": _KEY_VERSION,
+        "telemetry": fingerprint,
+        "model": model,
+        "temperature": temperature,
+        "system_prompt": prompt_digest,
+        "schema": schema_hash,
+    }
+    # Only limited calls carry the field, so unlimited keys stay as they were.
+    if max_output_tokens is not None:
+        request["max_output_tokens"] = max_output_tokens
+    material = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+# A handful of model tiers and settings; hashing the system prompt per
+# lookup would otherwise cost more than the lookup itself.
+@lru_cache(maxsize=64)
+def build_config_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    schema_hash: str,
+    max_output_tokens: Optional[int] = None,
+) -> str:
+    """Digest of everything in a cache key except the telemetry.
+
+    Two answers with the same config key were generated the same way, so
+    one may stand in for the other (see SimilarityIndex).
+    """
+    return build_cache_key(
+        "", model, temperature, system_prompt, schema_hash, max_output_tokens
+    )
+
+
+class DiagnosisCache:
+    """Thread-safe two-tier (memory LRU + optional SQLite) cache of raw payloads.
+
+    Cached payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        db_path: Optional[str] = None,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._evictions = 0
+        self._expirations = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS diagnosis_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+            logger.info("Diagnosis cache SQLite tier opened at %s.", db_path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._db is not None
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached payload for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    self._memory_hits += 1
+                    return payload
+                del self._memory[key]
+                self._expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM diagnosis_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    expires_at, raw = row
+                    if expires_at > now:
+                        payload = json.loads(raw)
+                        self._remember(key, expires_at, payload)
+                        self._hits += 1
+                        self._disk_hits += 1
+                        return payload
+                    self._db.execute(
+                        "DELETE FROM diagnosis_cache WHERE key = ?", (key,)
+                    )
+                    self._db.commit()
+                    self._expirations += 1
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, payload: dict) -> None:
+        """Store payload under key in every enabled tier."""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO diagnosis_cache (key, expires_at, payload) "
+                    "VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(payload, separators=(",", ":"))),
+                )
+                self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry from both tiers and return how many were removed."""
+        now = time.time()
+        with self._lock:
+            stale = [k for k, (exp, _) in self._memory.items() if exp <= now]
+            for k in stale:
+                del self._memory[k]
+            removed = len(stale)
+            if self._db is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM diagnosis_cache WHERE expires_at <= ?", (now,)
+                )
+                self._db.commit()
+                removed += cursor.rowcount
+            self._expirations += removed
+            return removed
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers. Counters are left untouched."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM diagnosis_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Return a snapshot of hit/miss counters and current tier sizes."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self) -> None:
+        """Close the SQLite tier, if one is open."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, expires_at: float, payload: dict) -> None:
+        """Insert into the memory tier and evict LRU entries. Caller holds the lock."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._evictions += 1
+
+
+_shared_cache: Optional[DiagnosisCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> DiagnosisCache:
+    """Return the process-wide cache, creating it from config on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = DiagnosisCache(db_path=CACHE_DB_PATH or None)
+    return _shared_cache
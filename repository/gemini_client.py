@@ -4,72 +4,420 @@ Zenith — Gemini Diagnostics Repository.
 This module encapsulates all interactions with the Google Gemini API.
 No business logic lives here — only SDK calls, response validation,
 and structured error wrapping.
+
+Responses are constrained to domain.schema.response_schema() (structured
+output), so the returned JSON always has the shape of DiagnosticResponse,
+or of the requested subset of its sections.
+
+A single repository (and therefore a single genai.Client with its pooled
+keep-alive HTTP connections) is shared per process via
+get_shared_repository(); it is closed automatically at interpreter exit.
+Every generate call runs under the repository's ResilientCaller, which
+retries transient failures and fails fast while the circuit is open, and
+reports the response's token usage metadata via report_usage(). Each
+attempt's HTTP timeout is what is left of the current request's Deadline,
+a stream is checked against it between chunks and closed once it passes,
+and a failure after it has passed is raised as DeadlineExceededError.
+
+The Gemini SDK and httpx account for most of the process cold-start time,
+so they are imported the first time a client is actually built rather than
+when this module is loaded.
 """
 
+import atexit
+import itertools
 import json
 import logging
+import threading
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
 
-from google import genai
-from google.genai import types
-
-from config import GEMINI_MODEL
+from config import (
+    GEMINI_BASE_URL,
+    GEMINI_MODEL,
+    GEMINI_TEMPERATURE,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
 from ui_constants import SYSTEM_PROMPT
-from domain.exceptions import ExternalServiceError, DataParsingError
+from domain.exceptions import (
+    CircuitOpenError,
+    DataParsingError,
+    DeadlineExceededError,
+    ExternalServiceError,
+)
+from domain.models import GenerationSettings, TokenUsage
+from domain.schema import RESPONSE_SECTIONS, response_schema
+from repository.deadline import checkpoint, current_deadline
+from repository.resilience import ResilientCaller
+from repository.usage import report_usage
+from metrics import annotate, registry, span
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
 
 logger = logging.getLogger(__name__)
 
 
+def _sdk_types() -> "types":
+    """Import google.genai.types on first use (module cache makes repeats cheap)."""
+    from google.genai import types
+
+    return types
+
+
 class GeminiDiagnosticsRepository:
-    """Repository layer responsible strictly for interacting with the Google Gemini API."""
+    """Repository layer responsible strictly for interacting with the Google Gemini API.
 
-    def __init__(self, api_key: str) -> None:
+    Instances are thread-safe: the underlying httpx connection pool may be
+    shared by concurrent Streamlit sessions.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = GEMINI_BASE_URL,
+        resilience: Optional[ResilientCaller] = None,
+    ) -> None:
         if not api_key:
             raise ExternalServiceError(
                 "Gemini API key is required but was not provided."
             )
-        self.client = genai.Client(api_key=api_key)
+        self._api_key = api_key
+        self._base_url = base_url
+        self._client: Optional["genai.Client"] = None
+        self._client_lock = threading.Lock()
+        self.resilience = resilience or ResilientCaller()
         logger.info("GeminiDiagnosticsRepository initialised successfully.")
 
-    def fetch_diagnosis(self, structured_prompt: str) -> dict:
+    @property
+    def client(self) -> "genai.Client":
+        """The pooled genai.Client, built (and the SDK imported) on first access."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> "genai.Client":
+        import httpx
+        from google import genai
+
+        types = _sdk_types()
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        http_options = types.HttpOptions(
+            base_url=self._base_url or None,
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        )
+        logger.info("Building Gemini client.")
+        return genai.Client(api_key=self._api_key, http_options=http_options)
+
+    def warm_up(self) -> bool:
+        """Open a pooled connection to the API ahead of the first diagnosis.
+
+        Issues a lightweight model metadata lookup so DNS, TCP and TLS setup
+        are paid before a user is waiting. Failures are logged, never raised.
+
+        Returns:
+            True if the warm-up request succeeded.
+        """
+        try:
+            self.client.models.get(model=GEMINI_MODEL)
+        except Exception as exc:
+            logger.warning("Gemini client warm-up failed: %s", exc)
+            return False
+        logger.info("Gemini client warm-up complete (model=%s).", GEMINI_MODEL)
+        return True
+
+    def close(self) -> None:
+        """Release pooled HTTP connections held by the underlying client."""
+        if self._client is None:
+            return
+        try:
+            self._client.close()
+        except Exception as exc:
+            logger.warning("Error while closing Gemini client: %s", exc)
+
+    async def aclose(self) -> None:
+        """Release pooled connections held by the asyncio client."""
+        if self._client is None:
+            return
+        try:
+            await self._client.aio.aclose()
+        except Exception as exc:
+            logger.warning("Error while closing async Gemini client: %s", exc)
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
         """Send the structured telemetry prompt to Gemini and return the raw JSON dictionary.
 
         Args:
             structured_prompt: The markdown-formatted prompt containing system specs and symptoms.
+            model: The Gemini model to generate with.
+            sections: The top-level response sections to generate.
+            settings: Temperature and output limit (None for the configured defaults).
 
         Returns:
             A dictionary parsed from the Gemini JSON response.
 
         Raises:
             ExternalServiceError: If the API request fails, times out, or returns an empty payload.
+            DeadlineExceededError: If the request's deadline passes first.
             DataParsingError: If the response cannot be parsed as valid JSON.
         """
-        logger.info("Sending diagnostic prompt to Gemini API (model=%s).", GEMINI_MODEL)
+        logger.info("Sending diagnostic prompt to Gemini API (model=%s).", model)
 
         try:
-            response = self.client.models.generate_content(
-                model=GEMINI_MODEL,
-                config=types.GenerateContentConfig(
-                    system_instruction=SYSTEM_PROMPT,
-                    response_mime_type="application/json",
-                    temperature=0.3,
-                ),
-                contents=structured_prompt,
-            )
+            with span("network"):
+                response = self.resilience.call(
+                    lambda: self.client.models.generate_content(
+                        model=model,
+                        config=self._generate_config(sections, settings),
+                        contents=structured_prompt,
+                    )
+                )
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
         except Exception as exc:
+            # A timeout caused by the request's own deadline is reported as such
+            checkpoint("network")
             logger.error("Gemini API call failed: %s", exc)
             raise ExternalServiceError(f"Gemini API generation failed: {exc}") from exc
 
+        return self._parse_response(response, model)
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        """Asyncio counterpart of fetch_diagnosis built on the SDK's async client.
+
+        Args:
+            structured_prompt: The markdown-formatted prompt containing system specs and symptoms.
+            model: The Gemini model to generate with.
+            sections: The top-level response sections to generate.
+            settings: Temperature and output limit (None for the configured defaults).
+
+        Returns:
+            A dictionary parsed from the Gemini JSON response.
+
+        Raises:
+            ExternalServiceError: If the API request fails, times out, or returns an empty payload.
+            DeadlineExceededError: If the request's deadline passes first.
+            DataParsingError: If the response cannot be parsed as valid JSON.
+        """
+        logger.info("Sending async diagnostic prompt to Gemini API (model=%s).", model)
+
+        try:
+            with span("network"):
+                response = await self.resilience.call_async(
+                    lambda: self.client.aio.models.generate_content(
+                        model=model,
+                        config=self._generate_config(sections, settings),
+                        contents=structured_prompt,
+                    )
+                )
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except Exception as exc:
+            # A timeout caused by the request's own deadline is reported as such
+            checkpoint("network")
+            logger.error("Gemini API call failed: %s", exc)
+            raise ExternalServiceError(f"Gemini API generation failed: {exc}") from exc
+
+        return self._parse_response(response, model)
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        """Stream the raw JSON response text from Gemini as it is generated.
+
+        Args:
+            structured_prompt: The markdown-formatted prompt containing system specs and symptoms.
+            model: The Gemini model to generate with.
+            sections: The top-level response sections to generate.
+            settings: Temperature and output limit (None for the configured defaults).
+
+        Opening the stream (up to its first chunk) is retried like any other
+        call; a failure after text has been yielded is not, because the
+        caller has already consumed part of the response.
+
+        Yields:
+            Successive non-empty text fragments of the JSON response.
+
+        Raises:
+            ExternalServiceError: If the API request fails mid-stream or yields no text at all.
+            DeadlineExceededError: If the request's deadline passes before the last chunk.
+        """
+        logger.info("Streaming diagnostic prompt to Gemini API (model=%s).", model)
+
+        def open_stream() -> tuple:
+            stream = iter(
+                self.client.models.generate_content_stream(
+                    model=model,
+                    config=self._generate_config(sections, settings),
+                    contents=structured_prompt,
+                )
+            )
+            return next(stream, None), stream
+
+        received = 0
+        received_bytes = 0
+        # Gemini attaches cumulative usage to chunks; the last one is final.
+        usage_metadata = None
+        stream = None
+        try:
+            with span("time_to_first_chunk"):
+                first, stream = self.resilience.call(open_stream)
+            for chunk in itertools.chain([first], stream):
+                checkpoint("stream")
+                if chunk and chunk.usage_metadata:
+                    usage_metadata = chunk.usage_metadata
+                text = chunk.text if chunk else None
+                if text:
+                    received += len(text)
+                    received_bytes += len(text.encode("utf-8"))
+                    yield text
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except Exception as exc:
+            checkpoint("stream")
+            logger.error("Gemini API stream failed: %s", exc)
+            raise ExternalServiceError(f"Gemini API generation failed: {exc}") from exc
+        finally:
+            # Releases the connection of a stream abandoned before its end
+            if stream is not None:
+                stream.close()
+
+        if not received:
+            logger.error("Gemini API returned an empty stream.")
+            raise ExternalServiceError("Gemini API returned an empty response.")
+
+        registry.inc("zenith_response_bytes_total", received_bytes)
+        annotate(response_bytes=received_bytes)
+        report_usage(_token_usage(usage_metadata, model))
+        logger.info("Gemini API streamed %d characters.", received)
+
+    @staticmethod
+    def _parse_response(response: "types.GenerateContentResponse", model: str) -> dict:
+        """Validate a generate response, report its token usage and decode its JSON text."""
         if not response or not response.text:
             logger.error("Gemini API returned an empty response.")
             raise ExternalServiceError("Gemini API returned an empty response.")
+        # Tokens were billed even if the text turns out not to be valid JSON.
+        report_usage(_token_usage(response.usage_metadata, model))
 
         logger.info("Gemini API returned %d characters.", len(response.text))
+        size = len(response.text.encode("utf-8"))
+        registry.inc("zenith_response_bytes_total", size)
+        annotate(response_bytes=size)
 
         try:
-            parsed = json.loads(response.text)
+            with span("decode"):
+                parsed = json.loads(response.text)
             return parsed
         except json.JSONDecodeError as exc:
             logger.error("Failed to parse Gemini response as JSON: %s", exc)
             raise DataParsingError(
                 f"Failed to parse Gemini response as JSON: {exc}"
             ) from exc
+
+    @staticmethod
+    def _generate_config(
+        sections: Tuple[str, ...], settings: Optional[GenerationSettings]
+    ) -> "types.GenerateContentConfig":
+        """Builds one attempt's config, its HTTP timeout bounded by the request deadline."""
+        types = _sdk_types()
+        deadline = current_deadline()
+        return types.GenerateContentConfig(
+            system_instruction=SYSTEM_PROMPT,
+            response_mime_type="application/json",
+            response_schema=response_schema(sections),
+            temperature=settings.temperature if settings else GEMINI_TEMPERATURE,
+            max_output_tokens=settings.max_output_tokens if settings else None,
+            http_options=(
+                types.HttpOptions(timeout=max(1, int(deadline.remaining() * 1000)))
+                if deadline is not None
+                else None
+            ),
+        )
+
+
+def _token_usage(
+    metadata: Optional["types.GenerateContentResponseUsageMetadata"], model: str
+) -> TokenUsage:
+    """Convert the SDK's usage metadata (any count may be None) to a TokenUsage.
+
+    Thinking tokens are billed as output, so they are counted with it.
+    """
+    if metadata is None:
+        return TokenUsage(model=model)
+    return TokenUsage(
+        model=model,
+        prompt_tokens=metadata.prompt_token_count or 0,
+        cached_tokens=metadata.cached_content_token_count or 0,
+        output_tokens=(metadata.candidates_token_count or 0)
+        + (metadata.thoughts_token_count or 0),
+    )
+
+
+_shared_repository: Optional[GeminiDiagnosticsRepository] = None
+_shared_repository_lock = threading.Lock()
+
+
+def get_shared_repository(
+    api_key: str, warm_up: bool = False
+) -> GeminiDiagnosticsRepository:
+    """Return the process-wide repository, creating it on first use.
+
+    Args:
+        api_key: The Gemini API key used if the repository must be created.
+        warm_up: Start a background warm-up request when the repository is created.
+
+    Returns:
+        The shared GeminiDiagnosticsRepository instance.
+    """
+    global _shared_repository
+    if _shared_repository is None:
+        with _shared_repository_lock:
+            if _shared_repository is None:
+                repository = GeminiDiagnosticsRepository(api_key=api_key)
+                if warm_up:
+                    threading.Thread(
+                        target=repository.warm_up,
+                        name="zenith-gemini-warm-up",
+                        daemon=True,
+                    ).start()
+                _shared_repository = repository
+    return _shared_repository
+
+
+def shutdown_shared_repository() -> None:
+    """Close and forget the process-wide repository. Safe to call repeatedly."""
+    global _shared_repository
+    with _shared_repository_lock:
+        repository, _shared_repository = _shared_repository, None
+    if repository is not None:
+        repository.close()
+        logger.info("Shared GeminiDiagnosticsRepository shut down.")
+
+
+atexit.register(shutdown_shared_repository)
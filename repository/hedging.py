@@ -0,0 +1,451 @@
+"""
+Zenith — Hedged Requests.
+
+Cuts the latency tail of generate calls without doubling their cost.
+
+* HedgePolicy keeps a rolling window of recent latencies per model and
+  call kind (a whole fetch, or a stream up to its first fragment). Once a
+  model has enough samples, the hedge delay is the configured percentile
+  of its window, so only the slowest few percent of calls are hedged.
+  Hedges are further capped at a share of all calls, so an upstream
+  slowdown cannot turn into a doubling of traffic.
+* HedgedBackend wraps any DiagnosisBackend. A call still unanswered after
+  the hedge delay is sent again, to the hedge model if one is set; the
+  first valid response wins and the other call is cancelled. A response
+  that fails does not win: the caller waits for the other one, and gets
+  the primary's error only if both fail. A win by a different hedge model
+  is reported to the caller's metered() block (see usage.report_answer).
+
+Asyncio calls and streams are cancelled outright (the losing task is
+cancelled, the losing stream closed). A blocking call runs on the hedge
+pool under a child of the request's deadline, one per attempt; the loser's
+is cancelled, so it stops at its next checkpoint (a retry, a streamed
+chunk). An HTTP request already sent cannot be interrupted: it runs to
+completion and its response is dropped, but the tokens it reports late
+are still charged to the caller (see usage.metered).
+
+Latencies are exported as the zenith_model_latency_seconds histogram and
+the hedge rate and wins as the "hedging" collector and the
+zenith_hedges_total counter.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from config import (
+    GEMINI_MODEL,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MAX_RATE,
+    HEDGE_MAX_WORKERS,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MODEL,
+    HEDGE_PERCENTILE,
+)
+from domain.models import GenerationSettings
+from domain.schema import RESPONSE_SECTIONS
+from metrics import annotate, registry
+from repository.base import DiagnosisBackend
+from repository.deadline import Deadline, current_deadline, deadline_scope
+from repository.usage import report_answer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+registry.describe(
+    "zenith_model_latency_seconds",
+    "Latency of successful generate calls by model (streams: to first fragment).",
+)
+registry.describe(
+    "zenith_hedges_total", "Hedged generate calls, by which call answered first."
+)
+
+# The cached percentile of a window is recomputed after this many samples.
+_REFRESH_EVERY = 16
+
+# Unused hedge allowance is banked up to this many hedges.
+_MAX_HEDGE_CREDIT = 10.0
+
+
+class _LatencyWindow:
+    """The most recent latencies of one model and call kind."""
+
+    __slots__ = ("samples", "histogram", "_percentile", "_stale")
+
+    def __init__(self, size: int, model: str, kind: str) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.histogram = registry.histogram(
+            "zenith_model_latency_seconds", model=model, call=kind
+        )
+        self._percentile: Optional[float] = None
+        self._stale = 0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self._stale += 1
+
+    def percentile(self, q: float) -> float:
+        if self._percentile is None or self._stale >= _REFRESH_EVERY:
+            ordered = sorted(self.samples)
+            self._percentile = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            self._stale = 0
+        return self._percentile
+
+
+class HedgePolicy:
+    """Per-model rolling latency windows, hedge delays and a hedge budget.
+
+    Args:
+        percentile: Share of calls expected to answer before the hedge fires.
+        min_samples: Samples a model needs before its calls are hedged.
+        min_delay_seconds: Lower bound on the hedge delay.
+        max_rate: Hedges allowed per call, averaged over time.
+        window: Latency samples kept per model and call kind.
+        hedge_model: Model the hedge is sent to ("" for the primary's model).
+    """
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay_seconds: float = HEDGE_MIN_DELAY_SECONDS,
+        max_rate: float = HEDGE_MAX_RATE,
+        window: int = HEDGE_LATENCY_WINDOW,
+        hedge_model: str = HEDGE_MODEL,
+    ) -> None:
+        self.percentile = min(1.0, max(0.0, percentile))
+        self.min_samples = max(1, min_samples)
+        self.min_delay_seconds = min_delay_seconds
+        self.max_rate = max(0.0, max_rate)
+        self.window = max(1, window)
+        self.hedge_model = hedge_model
+        self._windows: Dict[Tuple[str, str], _LatencyWindow] = {}
+        self._credit = 0.0
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._both_failed = 0
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, kind: str, seconds: float) -> None:
+        """Record the latency of one successful call."""
+        with self._lock:
+            window = self._windows.get((model, kind))
+            if window is None:
+                window = self._windows[(model, kind)] = _LatencyWindow(
+                    self.window, model, kind
+                )
+            window.observe(seconds)
+        window.histogram.observe(seconds)
+
+    def hedge_delay(self, model: str, kind: str) -> Optional[float]:
+        """Count a call and return how long it may run before it is hedged.
+
+        Returns:
+            Optional[float]: Seconds, or None while the model has too few
+            latency samples to tell a slow call from a normal one.
+        """
+        with self._lock:
+            self._calls += 1
+            self._credit = min(_MAX_HEDGE_CREDIT, self._credit + self.max_rate)
+            window = self._windows.get((model, kind))
+            if window is None or len(window.samples) < self.min_samples:
+                return None
+            return max(self.min_delay_seconds, window.percentile(self.percentile))
+
+    def admit_hedge(self) -> bool:
+        """Spend one hedge from the budget, if any is left."""
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            self._hedged += 1
+            return True
+
+    def record_outcome(self, winner: str) -> None:
+        """Record which call of a hedged pair answered: "primary", "hedge" or "none"."""
+        with self._lock:
+            if winner == "hedge":
+                self._hedge_wins += 1
+            elif winner == "none":
+                self._both_failed += 1
+        registry.inc("zenith_hedges_total", winner=winner)
+
+    def stats(self) -> dict:
+        """Return call and hedge counters, the hedge rate and the hedges' win rate."""
+        with self._lock:
+            calls, hedged, wins = self._calls, self._hedged, self._hedge_wins
+            both_failed = self._both_failed
+        return {
+            "calls": calls,
+            "hedged": hedged,
+            "hedge_rate": hedged / calls if calls else 0.0,
+            "hedge_wins": wins,
+            "hedge_win_rate": wins / hedged if hedged else 0.0,
+            "both_failed": both_failed,
+        }
+
+
+class HedgedBackend:
+    """DiagnosisBackend decorator that hedges slow calls.
+
+    Args:
+        inner: The backend that actually serves requests.
+        policy: Latency tracking and hedge budget (process-wide by default).
+        executor: Pool blocking calls run on while the caller waits
+            (process-wide by default).
+    """
+
+    def __init__(
+        self,
+        inner: DiagnosisBackend,
+        policy: Optional[HedgePolicy] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self.inner = inner
+        self.policy = policy or get_shared_hedge_policy()
+        self._executor = executor or _shared_executor()
+        # The service exports the inner backend's retry counters, if any.
+        self.resilience = getattr(inner, "resilience", None)
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        return self._call(
+            lambda use: self.inner.fetch_diagnosis(
+                structured_prompt, model=use, sections=sections, settings=settings
+            ),
+            model,
+            "fetch",
+        )
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        def start(use: str) -> "asyncio.Task[dict]":
+            return asyncio.ensure_future(
+                self._timed_async(
+                    lambda: self.inner.fetch_diagnosis_async(
+                        structured_prompt,
+                        model=use,
+                        sections=sections,
+                        settings=settings,
+                    ),
+                    use,
+                    "fetch",
+                )
+            )
+
+        delay = self.policy.hedge_delay(model, "fetch")
+        primary = start(model)
+        hedge: Optional["asyncio.Task[dict]"] = None
+        try:
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self.policy.admit_hedge():
+                return await primary
+            hedge_model = self.policy.hedge_model or model
+            hedge = start(hedge_model)
+            annotate(hedged=True)
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in (primary, hedge):
+                    if task in done and task.exception() is None:
+                        self._record_win(task is hedge, model, hedge_model)
+                        return task.result()
+            self.policy.record_outcome("none")
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        """Race streams to their first fragment, then follow the winner."""
+
+        def open_stream(use: str) -> Tuple[Optional[str], Iterator[str]]:
+            stream = iter(
+                self.inner.stream_diagnosis(
+                    structured_prompt, model=use, sections=sections, settings=settings
+                )
+            )
+            return next(stream, None), stream
+
+        first, stream = self._call(
+            open_stream, model, "stream", discard=lambda opened: opened[1].close()
+        )
+        if first is not None:
+            yield first
+        yield from stream
+
+    def warm_up(self) -> bool:
+        return self.inner.warm_up()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def _call(
+        self,
+        operation: Callable[[str], T],
+        model: str,
+        kind: str,
+        discard: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """Run operation(model), hedged with operation(hedge model) if it is slow.
+
+        Args:
+            operation: The blocking call, given the model to use.
+            model: The primary model.
+            kind: Call kind the latency is tracked under.
+            discard: Releases the result of a call that lost the race.
+        """
+        delay = self.policy.hedge_delay(model, kind)
+        if delay is None:
+            return self._timed(operation, model, kind)
+        request = current_deadline()
+        primary, primary_deadline = self._submit(operation, model, kind, request)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self.policy.admit_hedge():
+            return primary.result()
+        hedge_model = self.policy.hedge_model or model
+        hedge, hedge_deadline = self._submit(operation, hedge_model, kind, request)
+        annotate(hedged=True)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    self._record_win(future is hedge, model, hedge_model)
+                    if future is primary:
+                        _abandon(hedge, hedge_deadline, discard)
+                    else:
+                        _abandon(primary, primary_deadline, discard)
+                    return future.result()
+        self.policy.record_outcome("none")
+        return primary.result()
+
+    def _record_win(self, hedge_won: bool, model: str, hedge_model: str) -> None:
+        """Count which call answered, and report a substituted model to the caller."""
+        self.policy.record_outcome("hedge" if hedge_won else "primary")
+        if hedge_won and hedge_model != model:
+            report_answer(hedge_model)
+
+    def _submit(
+        self,
+        operation: Callable[[str], T],
+        model: str,
+        kind: str,
+        request: Optional[Deadline],
+    ) -> Tuple["Future[T]", Optional[Deadline]]:
+        """Start one attempt on the pool, under its own child of the request deadline."""
+        attempt = request.child() if request is not None else None
+
+        def run() -> T:
+            with deadline_scope(attempt):
+                return self._timed(operation, model, kind)
+
+        # One context copy per call: a Context cannot be entered twice at once.
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, run), attempt
+
+    def _timed(self, operation: Callable[[str], T], model: str, kind: str) -> T:
+        started = time.perf_counter()
+        result = operation(model)
+        self.policy.observe(model, kind, time.perf_counter() - started)
+        return result
+
+    async def _timed_async(
+        self, operation: Callable[[], Awaitable[T]], model: str, kind: str
+    ) -> T:
+        started = time.perf_counter()
+        result = await operation()
+        self.policy.observe(model, kind, time.perf_counter() - started)
+        return result
+
+
+def _abandon(
+    future: "Future[T]",
+    deadline: Optional[Deadline],
+    discard: Optional[Callable[[T], None]],
+) -> None:
+    """Cancel a losing call, or stop it and release its result once it arrives."""
+    if future.cancel():
+        return
+    if deadline is not None:
+        deadline.cancel()
+    if discard is None:
+        return
+
+    def release(done: "Future[T]") -> None:
+        if done.exception() is None:
+            discard(done.result())
+
+    future.add_done_callback(release)
+
+
+_shared_policy: Optional[HedgePolicy] = None
+_shared_pool: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_hedge_policy() -> HedgePolicy:
+    """Return the process-wide HedgePolicy, creating it on first use."""
+    global _shared_policy
+    if _shared_policy is None:
+        with _shared_lock:
+            if _shared_policy is None:
+                _shared_policy = HedgePolicy()
+    return _shared_policy
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = ThreadPoolExecutor(
+                    max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="zenith-hedge"
+                )
+    return _shared_pool
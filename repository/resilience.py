@@ -0,0 +1,312 @@
+"""
+Zenith — Upstream Resilience Policy.
+
+Retry, backoff and circuit-breaking for calls to the Gemini API.
+
+* RetryPolicy retries only transient failures (HTTP 408/429/5xx and
+  transport errors such as connection resets and timeouts) with capped
+  exponential backoff and full jitter, and never sleeps past the request
+  deadline: its own bound on all attempts, or the current request's
+  Deadline if that is sooner. No attempt starts once either has passed.
+* CircuitBreaker counts consecutive transient failures; once the threshold
+  is reached it opens and rejects calls immediately with CircuitOpenError
+  until the reset timeout elapses, then lets a single probe call through
+  (half-open) to decide whether to close again.
+
+Client errors such as 400 or 403 are neither retried nor counted against
+the breaker: they describe the request, not the health of the upstream.
+Neither is a failure once the request's own Deadline has passed: the
+transport error is the caller's timeout, and the call raises the
+deadline's error instead.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY_SECONDS,
+    RETRYABLE_STATUS_CODES,
+)
+from domain.exceptions import CircuitOpenError
+from repository.deadline import (
+    bounded_sleep,
+    bounded_sleep_async,
+    checkpoint,
+    current_deadline,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True if exc is a transient upstream failure worth retrying."""
+    if getattr(exc, "code", None) in RETRYABLE_STATUS_CODES:
+        return True
+    import httpx
+
+    return isinstance(exc, httpx.TransportError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a deadline.
+
+    Attributes:
+        max_attempts: Total attempts including the first (1 disables retries).
+        base_delay_seconds: Backoff ceiling before the first retry.
+        max_delay_seconds: Upper bound on any single backoff.
+        deadline_seconds: Wall-clock budget for all attempts of one request.
+    """
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay_seconds: float = RETRY_BASE_DELAY_SECONDS
+    max_delay_seconds: float = RETRY_MAX_DELAY_SECONDS
+    deadline_seconds: float = REQUEST_DEADLINE_SECONDS
+
+    def backoff(self, retry_number: int) -> float:
+        """Return a jittered delay for the given 1-based retry."""
+        ceiling = min(
+            self.max_delay_seconds, self.base_delay_seconds * 2 ** (retry_number - 1)
+        )
+        return random.uniform(0.0, ceiling)
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker.
+
+    Args:
+        failure_threshold: Consecutive transient failures that open the circuit.
+        reset_seconds: How long the circuit stays open before a probe is allowed.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._opens = 0
+        self._rejections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError without contacting upstream."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejections += 1
+            retry_in = max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+        raise CircuitOpenError(
+            f"Gemini API is unavailable; skipping the call for another {retry_in:.0f}s."
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit breaker closed after a successful probe.")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot of a call that ended without an outcome.
+
+        A cancelled or interrupted probe proves nothing about upstream, so it
+        counts as neither a success nor a failure; the next call probes again.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, transient: bool = True) -> None:
+        """Record a failed call; only transient failures count toward opening."""
+        with self._lock:
+            probing = self._probe_in_flight
+            self._probe_in_flight = False
+            if not transient:
+                return
+            self._failures += 1
+            if probing or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._opens += 1
+                    logger.warning(
+                        "Circuit breaker opened after %d consecutive failures.",
+                        self._failures,
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "opens": self._opens,
+                "rejections": self._rejections,
+            }
+
+    def _current_state(self) -> str:
+        """Resolve OPEN to HALF_OPEN once the reset timeout has passed. Caller holds the lock."""
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_seconds
+        ):
+            self._state = HALF_OPEN
+        return self._state
+
+
+class ResilientCaller:
+    """Runs upstream calls under a RetryPolicy and a shared CircuitBreaker."""
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._calls = 0
+        self._retries = 0
+        self._failures = 0
+        self._deadline_exhausted = 0
+        self._lock = threading.Lock()
+
+    def call(self, operation: Callable[[], T]) -> T:
+        """Invoke operation, retrying transient failures.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            DeadlineExceededError: If the request's deadline passes before an
+                attempt, or while one fails.
+            Exception: The last error from operation once retries are exhausted.
+        """
+        deadline = self._deadline()
+        self._count("_calls")
+        attempt = 1
+        while True:
+            checkpoint("network")
+            self.breaker.before_call()
+            try:
+                result = operation()
+            except Exception as exc:
+                delay = self._on_failure(exc, attempt, deadline)
+                if delay is None:
+                    raise
+                bounded_sleep(delay, "backoff")
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (a losing hedge, a closed session) or interrupted
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def call_async(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Asyncio counterpart of call; backoff sleeps do not block the event loop."""
+        deadline = self._deadline()
+        self._count("_calls")
+        attempt = 1
+        while True:
+            checkpoint("network")
+            self.breaker.before_call()
+            try:
+                result = await operation()
+            except Exception as exc:
+                delay = self._on_failure(exc, attempt, deadline)
+                if delay is None:
+                    raise
+                await bounded_sleep_async(delay, "backoff")
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (a losing hedge, a closed session) or interrupted
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        """Return retry counters together with the breaker's state and counters."""
+        with self._lock:
+            counters = {
+                "calls": self._calls,
+                "retries": self._retries,
+                "failures": self._failures,
+                "deadline_exhausted": self._deadline_exhausted,
+            }
+        counters["breaker"] = self.breaker.stats()
+        return counters
+
+    def _deadline(self) -> float:
+        """Monotonic time after which no retry is scheduled."""
+        deadline = time.monotonic() + self.policy.deadline_seconds
+        request = current_deadline()
+        if request is not None:
+            deadline = min(deadline, request.expires_at)
+        return deadline
+
+    def _on_failure(
+        self, exc: Exception, attempt: int, deadline: float
+    ) -> Optional[float]:
+        """Record a failed attempt and return the backoff before retrying, or None to give up.
+
+        Raises:
+            DeadlineExceededError: If the request's deadline has passed.
+            RequestCancelledError: If the request was cancelled.
+        """
+        request = current_deadline()
+        if request is not None and request.expired:
+            # Cut short by the caller, so it says nothing about upstream
+            self.breaker.release_probe()
+            self._count("_deadline_exhausted")
+            request.expire("network")
+        transient = is_retryable(exc)
+        self.breaker.record_failure(transient)
+        if transient and attempt < self.policy.max_attempts:
+            delay = self.policy.backoff(attempt)
+            if time.monotonic() + delay < deadline:
+                self._count("_retries")
+                logger.warning(
+                    "Transient Gemini failure (attempt %d/%d), retrying in %.2fs: %s",
+                    attempt,
+                    self.policy.max_attempts,
+                    delay,
+                    exc,
+                )
+                return delay
+            self._count("_deadline_exhausted")
+        self._count("_failures")
+        return None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
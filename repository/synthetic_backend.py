@@ -0,0 +1,267 @@
+"""
+Zenith — Synthetic Diagnosis Backend.
+
+An offline DiagnosisBackend for load testing and benchmarking everything
+except the model itself. It needs no network access and no API key.
+
+Payloads are deterministic functions of the prompt, so equal prompts
+always get equal documents. They always match the response schema
+(domain/schema.py), as structured output from Gemini does, with a
+configurable number of tweaks and length of free-text fields. Latency is
+drawn from a seeded distribution and, as generation time is dominated by
+output tokens, scaled by the share of the full document a call asks for;
+it is slept under the request's deadline, as a real call would time out.
+A configurable fraction of calls fails with ExternalServiceError, and a
+call whose output limit is below the payload's size fails with
+DataParsingError, as a truncated structured response would. Token usage
+is estimated from text length.
+
+Select it with ZENITH_BACKEND=synthetic.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from config import (
+    GEMINI_MODEL,
+    SYNTHETIC_CHUNK_CHARS,
+    SYNTHETIC_ERROR_RATE,
+    SYNTHETIC_LATENCY_DISTRIBUTION,
+    SYNTHETIC_LATENCY_MS,
+    SYNTHETIC_SEED,
+    SYNTHETIC_TEXT_CHARS,
+    SYNTHETIC_TWEAKS,
+)
+from domain.exceptions import (
+    ConfigurationError,
+    DataParsingError,
+    ExternalServiceError,
+)
+from domain.models import (
+    BOTTLENECK_TYPES,
+    SAFETY_LEVELS,
+    TWEAK_TYPES,
+    GenerationSettings,
+)
+from domain.schema import RESPONSE_SECTIONS
+from repository.deadline import bounded_sleep, bounded_sleep_async
+from repository.usage import estimate_usage, report_usage
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+# Shape of the lognormal distribution; median latency is latency_ms.
+_LOGNORMAL_SIGMA = 0.6
+_FILLER = "Synthetic diagnostic text used to size payloads for offline load tests. "
+
+
+class SyntheticDiagnosisBackend:
+    """Deterministic, offline implementation of the DiagnosisBackend protocol.
+
+    Args:
+        latency_ms: Median total response latency in milliseconds.
+        latency_distribution: One of "fixed", "uniform" (0 to 2x),
+            "exponential" or "lognormal".
+        error_rate: Probability that a call raises ExternalServiceError.
+        tweaks: Number of tweaks in every payload.
+        text_chars: Length of each free-text field, which sets payload size.
+        chunk_chars: Characters of JSON text per streamed fragment.
+        seed: Seed for the latency and error random generator.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = SYNTHETIC_LATENCY_MS,
+        latency_distribution: str = SYNTHETIC_LATENCY_DISTRIBUTION,
+        error_rate: float = SYNTHETIC_ERROR_RATE,
+        tweaks: int = SYNTHETIC_TWEAKS,
+        text_chars: int = SYNTHETIC_TEXT_CHARS,
+        chunk_chars: int = SYNTHETIC_CHUNK_CHARS,
+        seed: int = SYNTHETIC_SEED,
+    ) -> None:
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ConfigurationError(
+                f"Unknown synthetic latency distribution '{latency_distribution}'; "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}."
+            )
+        self.latency_ms = max(0.0, latency_ms)
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.tweaks = max(0, tweaks)
+        self.text_chars = max(1, text_chars)
+        self.chunk_chars = max(1, chunk_chars)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Payloads differ only in a few short fields, so one size per set
+        # of sections serves every token estimate and latency share without
+        # serialising each response.
+        self._payload_chars: Dict[Tuple[str, ...], int] = {}
+        self._full_chars = self._chars(RESPONSE_SECTIONS)
+        logger.info(
+            "SyntheticDiagnosisBackend initialised (latency=%.0fms %s, error_rate=%.2f).",
+            self.latency_ms,
+            latency_distribution,
+            error_rate,
+        )
+
+    def fetch_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        """Return the synthetic diagnosis for the prompt after a sampled delay.
+
+        Raises:
+            ExternalServiceError: For the configured fraction of calls.
+            DeadlineExceededError: If the request's deadline passes during the delay.
+            DataParsingError: If the payload does not fit settings.max_output_tokens.
+        """
+        latency, fail = self._draw(sections)
+        bounded_sleep(latency, "network")
+        payload = self._respond(structured_prompt, sections, fail, settings)
+        report_usage(estimate_usage(model, structured_prompt, self._chars(sections)))
+        return payload
+
+    async def fetch_diagnosis_async(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> dict:
+        """Asyncio counterpart of fetch_diagnosis."""
+        latency, fail = self._draw(sections)
+        await bounded_sleep_async(latency, "network")
+        payload = self._respond(structured_prompt, sections, fail, settings)
+        report_usage(estimate_usage(model, structured_prompt, self._chars(sections)))
+        return payload
+
+    def stream_diagnosis(
+        self,
+        structured_prompt: str,
+        model: str = GEMINI_MODEL,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        settings: Optional[GenerationSettings] = None,
+    ) -> Iterator[str]:
+        """Yield the synthetic JSON text in fragments, spreading the sampled
+        latency evenly across time-to-first-fragment and inter-fragment gaps.
+        """
+        latency, fail = self._draw(sections)
+        text = json.dumps(self._respond(structured_prompt, sections, fail, settings))
+        fragments = [
+            text[start : start + self.chunk_chars]
+            for start in range(0, len(text), self.chunk_chars)
+        ]
+        delay = latency / len(fragments)
+        for fragment in fragments:
+            bounded_sleep(delay, "stream")
+            yield fragment
+        report_usage(estimate_usage(model, structured_prompt, len(text)))
+
+    def warm_up(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def _chars(self, sections: Tuple[str, ...]) -> int:
+        chars = self._payload_chars.get(sections)
+        if chars is None:
+            chars = len(json.dumps(self.build_payload("", sections)))
+            self._payload_chars[sections] = chars
+        return chars
+
+    def _draw(self, sections: Tuple[str, ...]) -> tuple:
+        """Sample (latency_seconds, should_fail) for one call."""
+        with self._lock:
+            rng = self._random
+            median = self.latency_ms / 1000.0
+            if self.latency_distribution == "fixed":
+                latency = median
+            elif self.latency_distribution == "uniform":
+                latency = rng.uniform(0.0, 2 * median)
+            elif self.latency_distribution == "exponential":
+                latency = rng.expovariate(1 / median) if median else 0.0
+            else:
+                latency = (
+                    rng.lognormvariate(math.log(median), _LOGNORMAL_SIGMA)
+                    if median
+                    else 0.0
+                )
+            fail = rng.random() < self.error_rate
+        if sections != RESPONSE_SECTIONS:
+            latency *= self._chars(sections) / self._full_chars
+        return latency, fail
+
+    def _respond(
+        self,
+        structured_prompt: str,
+        sections: Tuple[str, ...],
+        fail: bool,
+        settings: Optional[GenerationSettings],
+    ) -> dict:
+        if fail:
+            logger.error("Synthetic backend injected a failure.")
+            raise ExternalServiceError("Synthetic backend injected a failure.")
+        limit = settings.max_output_tokens if settings else None
+        if (
+            limit
+            and estimate_usage("", "", self._chars(sections)).output_tokens > limit
+        ):
+            # What a structured response cut off at the output limit amounts to.
+            logger.error("Synthetic payload exceeds max_output_tokens=%d.", limit)
+            raise DataParsingError(
+                f"Synthetic response truncated at max_output_tokens={limit}."
+            )
+        return self.build_payload(structured_prompt, sections)
+
+    def build_payload(
+        self, structured_prompt: str, sections: Tuple[str, ...] = RESPONSE_SECTIONS
+    ) -> dict:
+        """Build the deterministic diagnosis document (or some of its sections) for a prompt."""
+        digest = hashlib.sha256(structured_prompt.encode("utf-8")).digest()
+        text = (_FILLER * (self.text_chars // len(_FILLER) + 1))[: self.text_chars]
+        bottleneck = BOTTLENECK_TYPES[digest[0] % len(BOTTLENECK_TYPES)]
+        document = {
+            "diagnosis": {
+                "bottleneck_type": bottleneck,
+                "severity": 1 + digest[1] % 10,
+                "secondary_bottleneck": BOTTLENECK_TYPES[
+                    digest[2] % len(BOTTLENECK_TYPES)
+                ],
+                "plain_english": text,
+                "reasoning": text,
+            },
+            "compatibility": {"score": digest[3] % 101, "note": text},
+            "tweaks": [
+                {
+                    "title": f"Synthetic {bottleneck} tweak {i}",
+                    "type": TWEAK_TYPES[(digest[4] + i) % len(TWEAK_TYPES)],
+                    "safety": SAFETY_LEVELS[(digest[5] + i) % len(SAFETY_LEVELS)],
+                    "steps": [text, text, text],
+                    "commands": [f"echo synthetic-{i}"],
+                    "revert": text,
+                    "rationale": text,
+                }
+                for i in range(1, self.tweaks + 1)
+            ],
+            "do_not_do": [
+                {"action": f"Synthetic anti-pattern {i}", "reason": text}
+                for i in range(1, 3)
+            ],
+        }
+        if sections == RESPONSE_SECTIONS:
+            return document
+        return {name: document[name] for name in sections}
@@ -0,0 +1,95 @@
+"""
+Zenith — Token Usage Reporting.
+
+Backends return plain JSON documents, so the tokens a call consumed travel
+beside the document: the backend calls report_usage(), and the caller
+collects every report made inside its metered() block. Reports made
+outside any metered() block are dropped. A call that outlives the block
+(a hedge that lost its race but was already sent) reports late; the
+block's late callback still gets those, so the tokens are charged.
+A hedged call that was answered by its hedge model reports that model
+through report_answer(), so the caller knows whose document it holds.
+
+Backends without real token counts (synthetic, cassette replay) report
+estimate_usage(), so budgets can be exercised offline.
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from ui_constants import SYSTEM_PROMPT
+from domain.models import TokenUsage
+
+# A rough average for English prose and JSON under Gemini's tokenizer.
+_CHARS_PER_TOKEN = 4
+
+
+class _Meter(list):
+    """The reports of one metered() block, and where late ones go."""
+
+    def __init__(self, late: Optional[Callable[[TokenUsage], None]]) -> None:
+        super().__init__()
+        self.late = late
+        self.closed = False
+        # The model that answered, when it is not the one the caller asked for
+        self.answered_by: Optional[str] = None
+        self.lock = threading.Lock()
+
+
+_reports: contextvars.ContextVar[Optional[_Meter]] = contextvars.ContextVar(
+    "zenith_token_usage", default=None
+)
+
+
+def report_usage(usage: TokenUsage) -> None:
+    """Record the tokens one backend call consumed."""
+    reports = _reports.get()
+    if reports is None:
+        return
+    with reports.lock:
+        if not reports.closed:
+            reports.append(usage)
+            return
+    if reports.late is not None:
+        reports.late(usage)
+
+
+def report_answer(model: str) -> None:
+    """Record that the model the caller asked for was substituted by another."""
+    reports = _reports.get()
+    if reports is not None:
+        reports.answered_by = model
+
+
+@contextmanager
+def metered(
+    late: Optional[Callable[[TokenUsage], None]] = None,
+) -> Iterator[List[TokenUsage]]:
+    """Collect the usage reported by backend calls made inside the block.
+
+    Args:
+        late: Called with each report made after the block has exited, by
+            a call it started that was still running.
+    """
+    reports = _Meter(late)
+    token = _reports.set(reports)
+    try:
+        yield reports
+    finally:
+        with reports.lock:
+            reports.closed = True
+        _reports.reset(token)
+
+
+def estimate_usage(
+    model: str, structured_prompt: str, response_chars: int
+) -> TokenUsage:
+    """Approximate the usage of a call from its prompt and response lengths."""
+    prompt_chars = len(SYSTEM_PROMPT) + len(structured_prompt)
+    return TokenUsage(
+        model=model,
+        prompt_tokens=prompt_chars // _CHARS_PER_TOKEN,
+        output_tokens=response_chars // _CHARS_PER_TOKEN,
+    )
@@ -0,0 +1,291 @@
+"""
+Zenith — Fleet Batch Diagnostics.
+
+Streams TelemetryInput records from a JSONL or CSV file, validates and
+deduplicates them, runs them through DiagnosticsService.run_diagnostics_async
+with a bounded number of in-flight requests and an optional rate limit, and
+appends one JSON line per record to the output file as each one finishes.
+
+Progress is checkpointed to a small SQLite file keyed by the telemetry
+fingerprint, which doubles as the dedupe index; invalid records are keyed
+by a fingerprint of their id and raw fields instead. Re-running the same
+command after a crash skips every record that already completed or was
+rejected. Memory use is bounded by the concurrency limit, not by the size
+of the input file.
+
+Output lines are written before the checkpoint is committed, so a crash
+between the two can repeat at most the in-flight records on resume; when a
+fingerprint appears more than once in the output, the last line wins.
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from dataclasses import MISSING, asdict, dataclass, fields
+from typing import Iterator, Optional, Tuple
+
+from domain.models import TelemetryInput
+from domain.exceptions import ValidationError, ZenithException
+from service.diagnostics_service import DiagnosticsService
+from service.telemetry_canonicalizer import canonicalize_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Fields a record supplies; the derived spec fields have defaults.
+_TELEMETRY_FIELDS = [f.name for f in fields(TelemetryInput) if f.default is MISSING]
+# Batch runs are charged to one token ledger session.
+BATCH_SESSION = "batch"
+
+
+@dataclass
+class BatchSummary:
+    """Counters describing one batch run."""
+
+    read: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    resumed: int = 0
+    tokens: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def iter_telemetry_records(path: str) -> Iterator[Tuple[str, Optional[dict]]]:
+    """Lazily read (record_id, raw_fields) pairs from a JSONL or CSV file.
+
+    The format is chosen by extension (.csv, otherwise JSONL). A record's id
+    is its "id" column when present, else its 1-based line/row number.
+    Undecodable JSONL lines are yielded with raw_fields set to None.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield str(row.get("id") or row_number), row
+        return
+
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError:
+                yield str(line_number), None
+                continue
+            if not isinstance(raw, dict):
+                yield str(line_number), None
+                continue
+            yield str(raw.get("id") or line_number), raw
+
+
+def invalid_record_fingerprint(record_id: str, raw: Optional[dict]) -> str:
+    """Fingerprint an invalid record by its id and raw fields, for the checkpoint."""
+    material = json.dumps([record_id, raw], sort_keys=True, default=str)
+    return "invalid:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def telemetry_from_record(raw: dict) -> TelemetryInput:
+    """Build a TelemetryInput from a raw record, defaulting missing fields."""
+    values = {name: str(raw.get(name) or "").strip() for name in _TELEMETRY_FIELDS}
+    values["ram"] = values["ram"] or "Not specified"
+    values["symptoms"] = values["symptoms"] or "Not specified"
+    return TelemetryInput(**values)
+
+
+class _RateLimiter:
+    """Async token bucket allowing rate_per_second acquisitions on average."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / rate_per_second
+        self._next_slot = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class _Checkpoint:
+    """SQLite record of fingerprints seen, used for resume and dedupe."""
+
+    def __init__(self, path: str) -> None:
+        self.run_id = uuid.uuid4().hex
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS batch_records ("
+            "fingerprint TEXT PRIMARY KEY, status TEXT NOT NULL, run_id TEXT NOT NULL)"
+        )
+        # Anything not finished by a previous run is eligible again.
+        self._db.execute("DELETE FROM batch_records WHERE status = 'pending'")
+        self._db.commit()
+
+    def claim(self, fingerprint: str) -> Optional[str]:
+        """Mark fingerprint pending; return None if claimed, else why it was skipped."""
+        row = self._db.execute(
+            "SELECT status, run_id FROM batch_records WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        if row is None or row[0] == "failed":
+            self._db.execute(
+                "INSERT OR REPLACE INTO batch_records VALUES (?, 'pending', ?)",
+                (fingerprint, self.run_id),
+            )
+            return None
+        status, run_id = row
+        finished = status in ("done", "invalid")
+        return "resumed" if finished and run_id != self.run_id else "duplicate"
+
+    def complete(self, fingerprint: str, status: str) -> None:
+        """Record a claimed fingerprint as "done", "failed" or "invalid"."""
+        self._db.execute(
+            "UPDATE batch_records SET status = ?, run_id = ? WHERE fingerprint = ?",
+            (status, self.run_id, fingerprint),
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    service: DiagnosticsService,
+    concurrency: int = 8,
+    rate_per_second: Optional[float] = None,
+    checkpoint_path: Optional[str] = None,
+) -> BatchSummary:
+    """Diagnose every record of input_path, appending results to output_path.
+
+    Args:
+        input_path: JSONL or CSV file of telemetry records.
+        output_path: JSONL file that results are appended to as they finish.
+        service: The DiagnosticsService used for each diagnosis.
+        concurrency: Maximum number of diagnoses in flight at once.
+        rate_per_second: Optional cap on diagnoses started per second.
+        checkpoint_path: SQLite checkpoint file; defaults to output_path + ".checkpoint".
+
+    Returns:
+        BatchSummary: Counters for the run.
+    """
+    started = time.perf_counter()
+    summary = BatchSummary()
+    checkpoint = _Checkpoint(checkpoint_path or f"{output_path}.checkpoint")
+    limiter = _RateLimiter(rate_per_second) if rate_per_second else None
+    queue: "asyncio.Queue" = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+
+    with open(output_path, "a", encoding="utf-8") as output:
+
+        def emit(record: dict) -> None:
+            output.write(json.dumps(record, separators=(",", ":")) + "\n")
+            output.flush()
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                record_id, fingerprint, telemetry = item
+                if limiter is not None:
+                    await limiter.acquire()
+                try:
+                    result = await service.run_diagnostics_async(
+                        telemetry, session_id=BATCH_SESSION
+                    )
+                except Exception as exc:
+                    if isinstance(exc, ZenithException):
+                        logger.warning(f"Batch record {record_id} failed: {exc}")
+                    else:
+                        # A bug or malformed record fails its row, not the batch
+                        logger.exception(f"Batch record {record_id} failed: {exc}")
+                    emit(
+                        {
+                            "id": record_id,
+                            "fingerprint": fingerprint,
+                            "status": "error",
+                            "error": {"type": type(exc).__name__, "message": str(exc)},
+                        }
+                    )
+                    checkpoint.complete(fingerprint, "failed")
+                    summary.failed += 1
+                    continue
+                emit(
+                    {
+                        "id": record_id,
+                        "fingerprint": fingerprint,
+                        "status": "ok",
+                        "result": asdict(result),
+                    }
+                )
+                checkpoint.complete(fingerprint, "done")
+                summary.succeeded += 1
+                if result.usage:
+                    summary.tokens += result.usage.total_tokens
+
+        def skip(fingerprint: str) -> bool:
+            """Claim fingerprint, or count why it was already handled."""
+            skipped = checkpoint.claim(fingerprint)
+            if skipped == "resumed":
+                summary.resumed += 1
+            elif skipped == "duplicate":
+                summary.duplicates += 1
+            return skipped is not None
+
+        async def produce() -> None:
+            for record_id, raw in iter_telemetry_records(input_path):
+                summary.read += 1
+                try:
+                    if raw is None:
+                        raise ValidationError("Record is not a JSON object.")
+                    telemetry = telemetry_from_record(raw)
+                    service._validate_telemetry(telemetry)
+                except ValidationError as exc:
+                    fingerprint = invalid_record_fingerprint(record_id, raw)
+                    if skip(fingerprint):
+                        continue
+                    emit(
+                        {
+                            "id": record_id,
+                            "fingerprint": fingerprint,
+                            "status": "invalid",
+                            "error": str(exc),
+                        }
+                    )
+                    checkpoint.complete(fingerprint, "invalid")
+                    summary.invalid += 1
+                    continue
+
+                fingerprint = canonicalize_telemetry(telemetry).fingerprint
+                if skip(fingerprint):
+                    continue
+                await queue.put((record_id, fingerprint, telemetry))
+
+            for _ in range(workers):
+                await queue.put(None)
+
+        workers = max(1, concurrency)
+        # If a worker dies (the output file cannot be written), gather raises
+        # and the producer is cancelled rather than blocking on a full queue.
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            checkpoint.close()
+
+    summary.elapsed_seconds = time.perf_counter() - started
+    logger.info(f"Batch run complete: {summary}")
+    return summary
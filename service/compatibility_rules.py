@@ -0,0 +1,93 @@
+"""
+Zenith — Hard Incompatibility Rules.
+
+Static table of application/OS pairs that cannot work at all, whatever the
+hardware: the verdict the model would reach in step 0 of the system prompt.
+Applications and operating systems are canonical display strings as
+produced by the telemetry canonicaliser (see telemetry_aliases), so every
+alias of a title matches its rule. These are plain data with no runtime
+dependencies.
+
+Each rule has a stable "id" (used as the hit-rate metric label), the
+"applications" and "os" it covers, the "blocker" (one line, shown as the
+compatibility note), an "explanation" for the user, and the "do_not_do"
+warnings as (action, reason) pairs.
+"""
+
+_ANTI_CHEAT_BYPASS = (
+    "Try to get past the anti-cheat with Wine, Proton tweaks, a VM or spoofing tools",
+    "The anti-cheat detects these environments; at best the game refuses to "
+    "start, at worst the account is permanently banned.",
+)
+
+_DUAL_BOOT = (
+    "Keep tuning this system's hardware settings for the game",
+    "The block is in software, so no driver, overclock or setting change can "
+    "make it run; a Windows installation or a cloud gaming service is the "
+    "only supported route.",
+)
+
+HARD_INCOMPATIBILITY_RULES = (
+    {
+        "id": "vanguard_valorant",
+        "applications": ("Valorant",),
+        "os": ("Linux", "macOS"),
+        "blocker": "Riot Vanguard kernel anti-cheat requires Windows",
+        "explanation": (
+            "Valorant only runs on Windows. Its Riot Vanguard anti-cheat "
+            "loads as a Windows kernel driver, and there is no Linux or "
+            "macOS client, so the game cannot be played on this system."
+        ),
+        "do_not_do": (_ANTI_CHEAT_BYPASS, _DUAL_BOOT),
+    },
+    {
+        "id": "vanguard_league_linux",
+        "applications": ("League of Legends",),
+        "os": ("Linux",),
+        "blocker": "Riot Vanguard kernel anti-cheat blocks Wine and Proton",
+        "explanation": (
+            "League of Legends now requires Riot Vanguard, a Windows kernel "
+            "driver that refuses to run under Wine or Proton, so the game "
+            "cannot be played on Linux."
+        ),
+        "do_not_do": (_ANTI_CHEAT_BYPASS, _DUAL_BOOT),
+    },
+    {
+        "id": "kernel_anticheat_linux",
+        "applications": (
+            "Fortnite",
+            "Call of Duty: Warzone",
+            "Apex Legends",
+            "Destiny 2",
+            "Rainbow Six Siege",
+            "PUBG: Battlegrounds",
+        ),
+        "os": ("Linux",),
+        "blocker": "the publisher's anti-cheat blocks Linux, Wine and Proton",
+        "explanation": (
+            "The publisher has not enabled its anti-cheat for Linux, so the "
+            "game refuses to start, or cannot join online matches, under "
+            "Wine or Proton. It cannot be played on this system."
+        ),
+        "do_not_do": (_ANTI_CHEAT_BYPASS, _DUAL_BOOT),
+    },
+    {
+        "id": "no_macos_client",
+        "applications": (
+            "Fortnite",
+            "Call of Duty: Warzone",
+            "Apex Legends",
+            "Destiny 2",
+            "Rainbow Six Siege",
+            "PUBG: Battlegrounds",
+        ),
+        "os": ("macOS",),
+        "blocker": "no supported macOS client exists",
+        "explanation": (
+            "The game has no current macOS version, and its anti-cheat does "
+            "not run under translation layers such as CrossOver, so it "
+            "cannot be played natively on this system."
+        ),
+        "do_not_do": (_ANTI_CHEAT_BYPASS, _DUAL_BOOT),
+    },
+)
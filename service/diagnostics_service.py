@@ -1,58 +1,446 @@
 """
 Zenith — Diagnostics Service Layer.
 
-Coordinates telemetry validation, prompt construction, Gemini API
-invocation via the Repository layer, and domain model hydration.
+Coordinates telemetry validation and canonicalisation, prompt construction,
+result caching, coalescing of identical in-flight requests, token budgets
+and accounting, Gemini API invocation via the Repository layer, and domain
+model hydration.
 All business logic for the diagnostic flow lives here.
+
+Besides one-call diagnoses (run, async and streaming), a diagnosis can run
+in two phases: triage_diagnostics asks only for the diagnosis and
+compatibility sections, and detail_diagnostics then generates the tweaks
+and do-not-do warnings with the triage as context. Or it can run in
+parallel: run_parallel_diagnostics generates the verdict, the tweaks and
+the warnings in concurrent calls and merges them. Either way the completed
+document is cached as the full diagnosis.
+
+Every entry point first consults the local compatibility rules: a known
+hard blocker (an anti-cheat title on Linux, say) is answered on the spot,
+without a cache lookup, budget check or model call. After an exact cache
+miss, a past diagnosis of the same hardware with near-identical symptoms is
+reused from the similarity index, labelled with its similarity. The rest
+are scored for complexity and routed to a model tier (see model_router);
+the tier's model and generation settings are part of the cache key.
 """
 
 import os
+import json
+import functools
 import logging
-from domain.models import TelemetryInput, DiagnosticResponse
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import (
+    CASSETTE_MODE,
+    CASSETTE_PATH,
+    CLIENT_WARM_UP,
+    DIAGNOSIS_BACKEND,
+    HEDGE_REQUESTS,
+    REPLAY_LATENCY_SCALE,
+)
+from ui_constants import (
+    DETAILS_INSTRUCTION,
+    DO_NOT_DO_INSTRUCTION,
+    SYSTEM_PROMPT,
+    TRIAGE_INSTRUCTION,
+    TWEAKS_INSTRUCTION,
+)
+from domain.schema import (
+    DETAIL_SECTIONS,
+    RESPONSE_SECTIONS,
+    SECTION_GROUPS,
+    TRIAGE_SECTIONS,
+    response_schema_hash,
+)
+from metrics import annotate, record_stage, registry, request_trace, span
+from domain.models import (
+    SECTION_MODELS,
+    TelemetryInput,
+    DiagnosticResponse,
+    DiagnosticSection,
+    GenerationSettings,
+    TokenUsage,
+)
 from domain.exceptions import (
+    ZenithException,
     ConfigurationError,
     ValidationError,
     ExternalServiceError,
     DataParsingError,
 )
-from repository.gemini_client import GeminiDiagnosticsRepository
+from repository.base import DiagnosisBackend
+from repository.deadline import Deadline, deadline_scope
+from repository.cassette import CassetteStore, RecordingBackend, ReplayBackend
+from repository.gemini_client import get_shared_repository
+from repository.hedging import HedgedBackend
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from repository.usage import metered
+from service.telemetry_canonicalizer import canonicalize_telemetry
+from service.model_router import ComplexityRouter, ModelTier, get_shared_router
+from service.rule_engine import CompatibilityRuleEngine, get_shared_rules
+from service.similarity_index import SimilarityIndex, get_shared_similarity_index
+from service.stream_parser import IncrementalSectionParser
+from service.single_flight import Flight, SingleFlight, get_shared_single_flight
+from service.token_ledger import TokenLedger, get_shared_ledger
+from repository.diagnosis_cache import (
+    DiagnosisCache,
+    build_cache_key,
+    build_config_key,
+    get_shared_cache,
+)
 
 logger = logging.getLogger(__name__)
 
+# Session charged for requests whose caller does not identify one.
+ANONYMOUS_SESSION = "anonymous"
+
+# A triage document hydrates with its detail sections empty.
+_NO_DETAILS = {"tweaks": [], "do_not_do": []}
+
+# Prompt scope for each partial set of sections generated on its own.
+_SCOPE_INSTRUCTIONS = {
+    TRIAGE_SECTIONS: TRIAGE_INSTRUCTION,
+    ("tweaks",): TWEAKS_INSTRUCTION,
+    ("do_not_do",): DO_NOT_DO_INSTRUCTION,
+}
+
+
+def _total_usage(usages: Iterable[TokenUsage]) -> Optional[TokenUsage]:
+    """Sums the usage of several calls, labelled with every model they used."""
+    usages = list(usages)
+    if not usages:
+        return None
+    total = sum(usages[1:], usages[0])
+    models = dict.fromkeys(usage.model for usage in usages)
+    return replace(total, model="+".join(models))
+
 
 class DiagnosticsService:
     """Service layer coordinating telemetry analysis."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[DiagnosisCache] = None,
+        repository: Optional[DiagnosisBackend] = None,
+        warm_up: bool = CLIENT_WARM_UP,
+        flights: Optional[SingleFlight] = None,
+        backend: str = DIAGNOSIS_BACKEND,
+        ledger: Optional[TokenLedger] = None,
+        rules: Optional[CompatibilityRuleEngine] = None,
+        similar: Optional[SimilarityIndex] = None,
+        router: Optional[ComplexityRouter] = None,
+    ):
         # We fetch the API key from the environment securely in the service layer
         self.api_key = os.environ.get("GOOGLE_API_KEY", "").strip()
+        self.repository = repository or self._build_backend(backend, warm_up)
+        # The cache is process-wide by default so repeat diagnoses survive
+        # the per-click service construction in the controller.
+        self.cache = cache if cache is not None else get_shared_cache()
+        # Concurrent sessions diagnosing the same telemetry share one call.
+        self.flights = flights or get_shared_single_flight()
+        # Token accounting and budgets are process-wide, like the cache.
+        self.ledger = ledger or get_shared_ledger()
+        # Known hard blockers are answered locally, before cache and budget.
+        self.rules = rules if rules is not None else get_shared_rules()
+        # Past diagnoses, reused for near-identical telemetry on a cache miss.
+        self.similar = similar if similar is not None else get_shared_similarity_index()
+        # Picks the model tier and generation settings for each diagnosis.
+        self.router = router if router is not None else get_shared_router()
+        registry.register_collector("cache", self.cache.stats)
+        registry.register_collector("single_flight", self.flights.stats)
+        registry.register_collector("tokens", self.ledger.stats)
+        registry.register_collector("rules", self.rules.stats)
+        registry.register_collector("similarity", self.similar.stats)
+        registry.register_collector("routing", self.router.stats)
+        resilience = getattr(self.repository, "resilience", None)
+        if resilience is not None:
+            registry.register_collector("resilience", resilience.stats)
+        hedging = getattr(self.repository, "policy", None)
+        if hedging is not None:
+            registry.register_collector("hedging", hedging.stats)
+
+    def _build_backend(self, backend: str, warm_up: bool) -> DiagnosisBackend:
+        """Selects the configured diagnosis backend, wrapped for hedging and cassette record/replay."""
+        if CASSETTE_MODE not in ("", "record", "replay"):
+            logger.critical(f"Unknown cassette mode '{CASSETTE_MODE}'.")
+            raise ConfigurationError(
+                f"Unknown cassette mode '{CASSETTE_MODE}'; expected 'record' or 'replay'."
+            )
+        if CASSETTE_MODE and not CASSETTE_PATH:
+            logger.critical("ZENITH_CASSETTE_MODE is set but ZENITH_CASSETTE is not.")
+            raise ConfigurationError(
+                "ZENITH_CASSETTE must name a cassette file when ZENITH_CASSETTE_MODE is set."
+            )
+        if CASSETTE_MODE == "replay":
+            logger.warning(f"Replaying diagnosis traffic from {CASSETTE_PATH}.")
+            return ReplayBackend(
+                CassetteStore(CASSETTE_PATH), latency_scale=REPLAY_LATENCY_SCALE
+            )
+        inner = self._build_live_backend(backend, warm_up)
+        if HEDGE_REQUESTS:
+            inner = HedgedBackend(inner)
+        if CASSETTE_MODE == "record":
+            return RecordingBackend(inner, CassetteStore(CASSETTE_PATH))
+        return inner
+
+    def _build_live_backend(self, backend: str, warm_up: bool) -> DiagnosisBackend:
+        """Selects the backend that actually produces diagnoses."""
+        if backend == "synthetic":
+            logger.warning("Using the synthetic diagnosis backend (offline mode).")
+            return SyntheticDiagnosisBackend()
+        if backend != "gemini":
+            logger.critical(f"Unknown diagnosis backend '{backend}'.")
+            raise ConfigurationError(
+                f"Unknown diagnosis backend '{backend}'; expected 'gemini' or 'synthetic'."
+            )
         if not self.api_key:
             logger.critical(
                 "Failed to initialize DiagnosticsService: GOOGLE_API_KEY environment variable is not set."
             )
             raise ConfigurationError("GOOGLE_API_KEY environment variable is not set.")
-
-        self.repository = GeminiDiagnosticsRepository(api_key=self.api_key)
+        # One pooled client per process; constructing a service is cheap.
+        return get_shared_repository(self.api_key, warm_up=warm_up)
 
     def _validate_telemetry(self, input_data: TelemetryInput) -> None:
         """Ensures all required telemetry fields are present."""
-        if (
-            not input_data.cpu.strip()
-            or not input_data.gpu.strip()
-            or not input_data.application.strip()
-            or not input_data.os_name
-            or not input_data.storage
-        ):
-            logger.warning(f"Telemetry validation failed. Input: {input_data}")
-            raise ValidationError(
-                "Missing arguments. Please fill in all required telemetry fields."
+        with span("validate"):
+            if not input_data.has_required_fields:
+                logger.warning(f"Telemetry validation failed. Input: {input_data}")
+                raise ValidationError(
+                    "Missing arguments. Please fill in all required telemetry fields."
+                )
+
+    def _canonicalize(self, telemetry: TelemetryInput) -> Tuple[TelemetryInput, str]:
+        """Returns the canonical telemetry and its fingerprint."""
+        with span("canonicalize"):
+            canonical = canonicalize_telemetry(telemetry)
+        return canonical.telemetry, canonical.fingerprint
+
+    def _rule_verdict(self, telemetry: TelemetryInput) -> Optional[DiagnosticResponse]:
+        """Returns the local verdict for a known hard blocker, if a rule matches."""
+        with span("rules"):
+            result = self.rules.match(telemetry)
+        if result is not None:
+            annotate(rule="hit")
+            logger.info(
+                f"Local rule matched ({telemetry.application} on "
+                f"{telemetry.os_name}); skipping the model call."
+            )
+        return result
+
+    def _route(self, telemetry: TelemetryInput) -> ModelTier:
+        """Returns the model tier for canonical telemetry."""
+        with span("route"):
+            tier = self.router.route(telemetry)
+        if self.router.enabled:
+            annotate(tier=tier.name)
+        return tier
+
+    @contextmanager
+    def _measured(self, tier: ModelTier) -> Iterator[None]:
+        """Records a model call's latency for its tier, and whether it failed to parse.
+
+        Upstream failures are not the tier's output, so they are not recorded.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except ExternalServiceError:
+            raise
+        except Exception:
+            self.router.record(tier, time.perf_counter() - started, parse_failed=True)
+            raise
+        self.router.record(tier, time.perf_counter() - started, parse_failed=False)
+
+    @staticmethod
+    def _cache_key(
+        fingerprint: str,
+        model: str,
+        settings: GenerationSettings,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+    ) -> str:
+        return build_cache_key(
+            fingerprint,
+            model,
+            settings.temperature,
+            SYSTEM_PROMPT,
+            response_schema_hash(sections),
+            max_output_tokens=settings.max_output_tokens,
+        )
+
+    @staticmethod
+    def _config_key(model: str, settings: GenerationSettings) -> str:
+        """The similarity index's profile of full documents generated this way."""
+        return build_config_key(
+            model,
+            settings.temperature,
+            SYSTEM_PROMPT,
+            response_schema_hash(RESPONSE_SECTIONS),
+            max_output_tokens=settings.max_output_tokens,
+        )
+
+    @staticmethod
+    def _build_prompt(
+        telemetry: TelemetryInput,
+        sections: Tuple[str, ...],
+        triage_document: Optional[dict],
+    ) -> str:
+        """Formats the prompt, scoped to the sections a partial call asks for."""
+        prompt = telemetry.format_prompt()
+        if triage_document is not None:
+            return prompt + DETAILS_INSTRUCTION.format(
+                triage=json.dumps(triage_document, indent=2)
             )
+        return prompt + _SCOPE_INSTRUCTIONS.get(sections, "")
+
+    @staticmethod
+    def _triage_document(triage: DiagnosticResponse) -> dict:
+        """Returns the triage sections of a response as a schema document."""
+        compatibility = triage.compatibility
+        return {
+            "diagnosis": asdict(triage.diagnosis),
+            "compatibility": asdict(compatibility) if compatibility else None,
+        }
 
-    def run_diagnostics(self, telemetry: TelemetryInput) -> DiagnosticResponse:
+    @staticmethod
+    def _hydrate(raw_dict: dict) -> DiagnosticResponse:
+        """Builds the domain models, via the fast path when the payload matches the schema."""
+        try:
+            return DiagnosticResponse.from_schema_dict(raw_dict)
+        except (KeyError, TypeError):
+            logger.warning("Payload does not match the response schema; repairing it.")
+            return DiagnosticResponse.from_dict(raw_dict)
+
+    def _cache_lookup(self, cache_key: str) -> Optional[dict]:
+        with span("cache_lookup"):
+            raw_dict = self.cache.get(cache_key)
+        annotate(cache="hit" if raw_dict is not None else "miss")
+        return raw_dict
+
+    def _lookup(
+        self,
+        fingerprint: str,
+        session_id: str,
+        tier: ModelTier,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        telemetry: Optional[TelemetryInput] = None,
+    ) -> Tuple[str, str, Optional[dict], Optional[float]]:
+        """Returns (model, cache key, cached payload or None, similarity) for a request.
+
+        The request's tier sets the model and generation settings. Cache
+        hits are free, so the session's token budget is only applied on a
+        miss; a downgraded request then looks up the fallback model's cache
+        entry instead. Given the telemetry, an exact miss is looked up
+        in the similarity index next, also for free: a near-duplicate's
+        full document is returned with its similarity, which is None for
+        exact hits and misses.
+        """
+        cache_key = self._cache_key(fingerprint, tier.model, tier.settings, sections)
+        raw_dict = self._cache_lookup(cache_key)
+        if raw_dict is not None:
+            return tier.model, cache_key, raw_dict, None
+        if telemetry is not None:
+            with span("similarity"):
+                similar = self.similar.lookup(
+                    telemetry, self._config_key(tier.model, tier.settings)
+                )
+            if similar is not None:
+                annotate(cache="similar")
+                return tier.model, cache_key, similar[0], similar[1]
+        model = self.ledger.admit(session_id, tier.model)
+        if model == tier.model:
+            return model, cache_key, None, None
+        annotate(model=model)
+        cache_key = self._cache_key(fingerprint, model, tier.settings, sections)
+        return model, cache_key, self._cache_lookup(cache_key), None
+
+    def _hit(
+        self, cache_key: str, raw_dict: dict, similarity: Optional[float]
+    ) -> DiagnosticResponse:
+        """Hydrates a cached payload, labelled as reused when it is a near-duplicate's."""
+        if similarity is None:
+            logger.info(f"Diagnosis cache hit (key={cache_key[:12]}).")
+        else:
+            logger.info(
+                f"Reused a near-duplicate diagnosis (symptom similarity {similarity:.2f})."
+            )
+        with span("hydrate"):
+            result = self._hydrate(raw_dict)
+        result.reused_similarity = similarity
+        return result
+
+    def _metered(self, session_id: str):
+        """Meter backend calls, charging usage reported after the block too.
+
+        A hedge that lost its race may still be running when its caller has
+        been charged; its tokens go straight to the same session.
+        """
+        return metered(late=functools.partial(self.ledger.record, session_id))
+
+    def _charge(
+        self, session_id: str, reports: List[TokenUsage]
+    ) -> Optional[TokenUsage]:
+        """Records the usage the backend reported for one call in the ledger.
+
+        A hedged call can report usage on two models; each model is charged
+        its own share. Returns the total, labelled with every model used.
+        """
+        by_model: Dict[str, TokenUsage] = {}
+        for report in reports:
+            known = by_model.get(report.model)
+            by_model[report.model] = report if known is None else known + report
+        for usage in by_model.values():
+            self.ledger.record(session_id, usage)
+            logger.info(
+                f"Diagnosis used {usage.prompt_tokens} prompt ({usage.cached_tokens} cached) "
+                f"and {usage.output_tokens} output tokens on {usage.model}."
+            )
+        total = _total_usage(by_model.values())
+        if total is not None:
+            annotate(tokens=total.total_tokens)
+        return total
+
+    def _store(
+        self,
+        cache_key: str,
+        raw_dict: dict,
+        telemetry: TelemetryInput,
+        model: str,
+        tier: ModelTier,
+        answered_by: Optional[str],
+        indexed: bool = True,
+    ) -> None:
+        """Caches a fetched document and, if it is a full one, indexes it.
+
+        A document a hedge model answered is neither: model's cache key and
+        similarity profile do not describe it.
+        """
+        if answered_by is not None:
+            logger.info(f"Not caching a diagnosis answered by {answered_by}.")
+            return
+        with span("cache_store"):
+            self.cache.set(cache_key, raw_dict)
+            if indexed:
+                self.similar.add(
+                    telemetry, self._config_key(model, tier.settings), raw_dict
+                )
+
+    def run_diagnostics(
+        self,
+        telemetry: TelemetryInput,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> DiagnosticResponse:
         """Executes the core diagnostic sequence for a set of telemetry data.
 
         Args:
             telemetry (TelemetryInput): The system specifications and symptoms.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
 
         Returns:
             DiagnosticResponse: The safely parsed and typed diagnostic results.
@@ -60,21 +448,553 @@ class DiagnosticsService:
         Raises:
             ValidationError: If the telemetry input is incomplete.
             ConfigurationError: If the API key is missing.
+            BudgetExceededError: If the session or daily token budget is spent.
             ExternalServiceError: If the LLM interaction fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
             DataParsingError: If the returned JSON cannot be deserialized into known models.
         """
-        self._validate_telemetry(telemetry)
+        deadline = deadline or Deadline()
+        with request_trace("run"), deadline_scope(deadline):
+            self._validate_telemetry(telemetry)
+            telemetry, fingerprint = self._canonicalize(telemetry)
+            ruled = self._rule_verdict(telemetry)
+            if ruled is not None:
+                return ruled
+            tier = self._route(telemetry)
+            model, cache_key, raw_dict, similarity = self._lookup(
+                fingerprint, session_id, tier, telemetry=telemetry
+            )
+            try:
+                if raw_dict is not None:
+                    return self._hit(cache_key, raw_dict, similarity)
+
+                flight = self.flights.join(
+                    cache_key,
+                    lambda publish: self._fetch(
+                        telemetry, cache_key, model, tier, session_id
+                    ),
+                )
+                return flight.wait(deadline)
+            except ExternalServiceError as exc:
+                logger.error(f"External service failure during diagnosis: {exc}")
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from payload: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from payload: {exc}"
+                ) from exc
+
+    async def run_diagnostics_async(
+        self,
+        telemetry: TelemetryInput,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> DiagnosticResponse:
+        """Asyncio counterpart of run_diagnostics.
+
+        Applies the same validation, canonicalisation, caching, error mapping
+        and hydration, but awaits the repository's async client so a single
+        event loop can drive many diagnoses concurrently.
+
+        Args:
+            telemetry (TelemetryInput): The system specifications and symptoms.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
+
+        Returns:
+            DiagnosticResponse: The safely parsed and typed diagnostic results.
+
+        Raises:
+            ValidationError: If the telemetry input is incomplete.
+            BudgetExceededError: If the session or daily token budget is spent.
+            ExternalServiceError: If the LLM interaction fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
+            DataParsingError: If the returned JSON cannot be deserialized into known models.
+        """
+        deadline = deadline or Deadline()
+        with request_trace("async"), deadline_scope(deadline):
+            self._validate_telemetry(telemetry)
+            telemetry, fingerprint = self._canonicalize(telemetry)
+            ruled = self._rule_verdict(telemetry)
+            if ruled is not None:
+                return ruled
+            tier = self._route(telemetry)
+            model, cache_key, raw_dict, similarity = self._lookup(
+                fingerprint, session_id, tier, telemetry=telemetry
+            )
+            try:
+                if raw_dict is not None:
+                    return self._hit(cache_key, raw_dict, similarity)
+
+                return await self.flights.run_async(
+                    cache_key,
+                    lambda: self._fetch_async(
+                        telemetry, cache_key, model, tier, session_id
+                    ),
+                )
+            except ExternalServiceError as exc:
+                logger.error(f"External service failure during diagnosis: {exc}")
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from payload: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from payload: {exc}"
+                ) from exc
+
+    def stream_diagnostics(
+        self,
+        telemetry: TelemetryInput,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[DiagnosticSection]:
+        """Executes the diagnostic sequence, yielding each section as soon as it is complete.
+
+        Sections arrive in document order: the diagnosis, the compatibility
+        assessment, then every tweak and every do-not-do warning. Cache hits
+        are replayed through the same interface, and so is a concurrent
+        identical request: joining it replays the sections it has already
+        produced, then follows the rest live.
+
+        Args:
+            telemetry (TelemetryInput): The system specifications and symptoms.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
+
+        Yields:
+            DiagnosticSection: Each completed and hydrated response section.
+
+        Raises:
+            ValidationError: If the telemetry input is incomplete.
+            BudgetExceededError: If the session or daily token budget is spent.
+            ExternalServiceError: If the LLM interaction fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
+            DataParsingError: If the streamed JSON cannot be deserialized into known models.
+        """
+        deadline = deadline or Deadline()
+        with request_trace("stream"), deadline_scope(deadline):
+            self._validate_telemetry(telemetry)
+            telemetry, fingerprint = self._canonicalize(telemetry)
+            ruled = self._rule_verdict(telemetry)
+            if ruled is not None:
+                yield from ruled.iter_sections()
+                return
+            tier = self._route(telemetry)
+            model, cache_key, raw_dict, similarity = self._lookup(
+                fingerprint, session_id, tier, telemetry=telemetry
+            )
+            try:
+                if raw_dict is not None:
+                    yield from self._hit(
+                        cache_key, raw_dict, similarity
+                    ).iter_sections()
+                    return
+
+                flight = self.flights.join(
+                    cache_key,
+                    lambda publish: self._stream(
+                        telemetry, cache_key, model, tier, session_id, publish
+                    ),
+                )
+                streamed = False
+                for section in flight.follow(deadline):
+                    streamed = True
+                    yield section
+                # Joined a blocking run_diagnostics call: replay its result
+                if not streamed:
+                    yield from flight.wait(deadline).iter_sections()
+            except (ExternalServiceError, DataParsingError) as exc:
+                logger.error(f"Streaming diagnosis failed: {exc}")
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from stream: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from stream: {exc}"
+                ) from exc
+
+    def triage_diagnostics(
+        self,
+        telemetry: TelemetryInput,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> DiagnosticResponse:
+        """Executes phase one of a two-phase diagnosis: the verdict only.
+
+        Asks the model for just the diagnosis and compatibility sections,
+        a small fraction of the full document's output tokens, so the verdict
+        can be shown long before a full diagnosis would finish. The tweaks
+        and do_not_do lists are left empty for detail_diagnostics. A cached
+        full diagnosis is returned whole instead.
+
+        Args:
+            telemetry (TelemetryInput): The system specifications and symptoms.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
+
+        Returns:
+            DiagnosticResponse: The triage, or a complete diagnosis from the cache.
+
+        Raises:
+            ValidationError: If the telemetry input is incomplete.
+            BudgetExceededError: If the session or daily token budget is spent.
+            ExternalServiceError: If the LLM interaction fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
+            DataParsingError: If the returned JSON cannot be deserialized into known models.
+        """
+        deadline = deadline or Deadline()
+        with request_trace("triage"), deadline_scope(deadline):
+            self._validate_telemetry(telemetry)
+            telemetry, fingerprint = self._canonicalize(telemetry)
+            ruled = self._rule_verdict(telemetry)
+            if ruled is not None:
+                return ruled
+            tier = self._route(telemetry)
+            cache_key = self._cache_key(fingerprint, tier.model, tier.settings)
+            raw_dict = self._cache_lookup(cache_key)
+            similarity = None
+            if raw_dict is None:
+                model, cache_key, raw_dict, similarity = self._lookup(
+                    fingerprint, session_id, tier, TRIAGE_SECTIONS, telemetry
+                )
+            try:
+                if raw_dict is not None:
+                    return self._hit(cache_key, {**_NO_DETAILS, **raw_dict}, similarity)
+
+                flight = self.flights.join(
+                    cache_key,
+                    lambda publish: self._fetch(
+                        telemetry, cache_key, model, tier, session_id, TRIAGE_SECTIONS
+                    ),
+                )
+                return flight.wait(deadline)
+            except ExternalServiceError as exc:
+                logger.error(f"External service failure during triage: {exc}")
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from payload: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from payload: {exc}"
+                ) from exc
+
+    def detail_diagnostics(
+        self,
+        telemetry: TelemetryInput,
+        triage: DiagnosticResponse,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> DiagnosticResponse:
+        """Executes phase two of a two-phase diagnosis: tweaks and warnings.
+
+        The triage goes into the prompt as established context, so the
+        model builds its recommendations on that verdict instead of
+        deriving it again, and generates only the remaining sections. Joins
+        a prefetch_details call still in flight for the same telemetry.
+
+        Args:
+            telemetry (TelemetryInput): The system specifications and symptoms.
+            triage (DiagnosticResponse): The result of triage_diagnostics.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
+
+        Returns:
+            DiagnosticResponse: The complete diagnosis, with the triage's verdict.
+
+        Raises:
+            ValidationError: If the telemetry input is incomplete.
+            BudgetExceededError: If the session or daily token budget is spent.
+            ExternalServiceError: If the LLM interaction fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
+            DataParsingError: If the returned JSON cannot be deserialized into known models.
+        """
+        if triage.is_complete:
+            return triage
+        deadline = deadline or Deadline()
+        with request_trace("details"), deadline_scope(deadline):
+            try:
+                return self._start_details(telemetry, triage, session_id).wait(deadline)
+            except ExternalServiceError as exc:
+                logger.error(f"External service failure during details: {exc}")
+                raise
+            except ZenithException:
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from payload: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from payload: {exc}"
+                ) from exc
+
+    def prefetch_details(
+        self,
+        telemetry: TelemetryInput,
+        triage: DiagnosticResponse,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """Starts detail_diagnostics in the background and returns at once.
+
+        A later detail_diagnostics call joins the call in flight or reads
+        its cached result. Failures are logged rather than raised; that
+        later call tries again and reports them. The background call is
+        bounded by the deadline's expiry but not stopped by cancelling it.
+        """
+        if triage.is_complete:
+            return
         try:
+            with deadline_scope(deadline or Deadline()):
+                self._start_details(telemetry, triage, session_id)
+        except ZenithException as exc:
+            logger.warning(f"Could not prefetch diagnosis details: {exc}")
+
+    def _start_details(
+        self,
+        telemetry: TelemetryInput,
+        triage: DiagnosticResponse,
+        session_id: str,
+    ) -> Flight[DiagnosticResponse]:
+        """Returns the flight completing a triage (already finished on a cache hit)."""
+        self._validate_telemetry(telemetry)
+        telemetry, fingerprint = self._canonicalize(telemetry)
+        tier = self._route(telemetry)
+        model, cache_key, raw_dict, _ = self._lookup(fingerprint, session_id, tier)
+        if raw_dict is not None:
+            flight: Flight[DiagnosticResponse] = Flight()
+            flight.finish(self._hit(cache_key, raw_dict, None))
+            return flight
+        triage_document = self._triage_document(triage)
+        return self.flights.join(
+            cache_key,
+            lambda publish: self._fetch(
+                telemetry,
+                cache_key,
+                model,
+                tier,
+                session_id,
+                DETAIL_SECTIONS,
+                triage_document,
+            ),
+        )
+
+    def run_parallel_diagnostics(
+        self,
+        telemetry: TelemetryInput,
+        session_id: str = ANONYMOUS_SESSION,
+        deadline: Optional[Deadline] = None,
+    ) -> DiagnosticResponse:
+        """Executes the diagnostic sequence as concurrent section requests.
+
+        The verdict (diagnosis and compatibility), the tweaks and the
+        do-not-do warnings are generated by separate calls on the same
+        telemetry prompt, so the wait is that of the longest section rather
+        than of the whole document. The parts are merged and validated as
+        one document, as a single-call response is. Each part is coalesced
+        with identical in-flight requests on its own; tweaks are chosen for
+        the bottleneck each call determines, not the merged verdict.
+
+        Args:
+            telemetry (TelemetryInput): The system specifications and symptoms.
+            session_id (str): The session charged for the tokens this request uses.
+            deadline (Deadline): Bounds the whole request and cancels it early
+                (a default REQUEST_DEADLINE_SECONDS deadline if None).
+
+        Returns:
+            DiagnosticResponse: The safely parsed and typed diagnostic results.
+
+        Raises:
+            ValidationError: If the telemetry input is incomplete.
+            BudgetExceededError: If the session or daily token budget is spent.
+            ExternalServiceError: If any of the section requests fails.
+            DeadlineExceededError: If the deadline passes or is cancelled first.
+            DataParsingError: If the merged JSON cannot be deserialized into known models.
+        """
+        deadline = deadline or Deadline()
+        with request_trace("parallel"), deadline_scope(deadline):
+            self._validate_telemetry(telemetry)
+            telemetry, fingerprint = self._canonicalize(telemetry)
+            ruled = self._rule_verdict(telemetry)
+            if ruled is not None:
+                return ruled
+            tier = self._route(telemetry)
+            model, cache_key, raw_dict, similarity = self._lookup(
+                fingerprint, session_id, tier, telemetry=telemetry
+            )
+            try:
+                if raw_dict is not None:
+                    return self._hit(cache_key, raw_dict, similarity)
+
+                # The caller's thread waits on every part, so no pool worker
+                # ever blocks on another.
+                flights = [
+                    self.flights.join(
+                        f"{cache_key}:{'+'.join(group)}",
+                        lambda publish, group=group: self._fetch_part(
+                            telemetry, model, tier, session_id, group
+                        ),
+                    )
+                    for group in SECTION_GROUPS
+                ]
+                raw_dict = {}
+                usages: List[TokenUsage] = []
+                answered_by: Optional[str] = None
+                waiting = iter(flights)
+                try:
+                    for flight in waiting:
+                        part, part_usage, part_answered_by = flight.wait(deadline)
+                        raw_dict.update(part)
+                        if part_usage is not None:
+                            usages.append(part_usage)
+                        answered_by = answered_by or part_answered_by
+                finally:
+                    # A part failed or the deadline passed: leave the parts not
+                    # yet waited on, so calls nobody needs are cancelled
+                    for flight in waiting:
+                        flight.abandon()
+                with span("hydrate"):
+                    result = self._hydrate(raw_dict)
+                result.usage = _total_usage(usages)
+                self._store(cache_key, raw_dict, telemetry, model, tier, answered_by)
+                return result
+            except ExternalServiceError as exc:
+                logger.error(f"External service failure during diagnosis: {exc}")
+                raise
+            except Exception as exc:
+                logger.error(f"Failed to hydrate domain models from payload: {exc}")
+                raise DataParsingError(
+                    f"Failed to hydrate domain models from payload: {exc}"
+                ) from exc
+
+    def _fetch_part(
+        self,
+        telemetry: TelemetryInput,
+        model: str,
+        tier: ModelTier,
+        session_id: str,
+        sections: Tuple[str, ...],
+    ) -> Tuple[dict, Optional[TokenUsage], Optional[str]]:
+        """Fetches some sections, unvalidated and uncached (runs once per flight).
+
+        Returns the part, its usage and the hedge model that answered it, if any.
+        """
+        with self._metered(session_id) as reports:
+            with span("prompt"):
+                prompt = self._build_prompt(telemetry, sections, None)
+            with span("backend"), self._measured(tier):
+                raw_dict = self.repository.fetch_diagnosis(
+                    prompt, model=model, sections=sections, settings=tier.settings
+                )
+        return raw_dict, self._charge(session_id, reports), reports.answered_by
+
+    def _fetch(
+        self,
+        telemetry: TelemetryInput,
+        cache_key: str,
+        model: str,
+        tier: ModelTier,
+        session_id: str,
+        sections: Tuple[str, ...] = RESPONSE_SECTIONS,
+        triage_document: Optional[dict] = None,
+    ) -> DiagnosticResponse:
+        """Fetches, hydrates and caches one diagnosis (runs once per flight).
+
+        With a triage document, only the remaining sections are fetched and
+        the two are merged into the full document before caching.
+        """
+        raw_dict = self.cache.get(cache_key)
+        with self._metered(session_id) as reports:
+            if raw_dict is None:
+                with span("prompt"):
+                    prompt = self._build_prompt(telemetry, sections, triage_document)
+                with span("backend"), self._measured(tier):
+                    raw_dict = self.repository.fetch_diagnosis(
+                        prompt, model=model, sections=sections, settings=tier.settings
+                    )
+                if triage_document is not None:
+                    raw_dict = {**triage_document, **raw_dict}
+        usage = self._charge(session_id, reports)
+        # Hydrate the domain models
+        with span("hydrate"):
+            if sections == TRIAGE_SECTIONS:
+                result = self._hydrate({**_NO_DETAILS, **raw_dict})
+            else:
+                result = self._hydrate(raw_dict)
+        result.usage = usage
+        self._store(
+            cache_key,
+            raw_dict,
+            telemetry,
+            model,
+            tier,
+            reports.answered_by,
+            indexed=sections != TRIAGE_SECTIONS,
+        )
+        return result
+
+    async def _fetch_async(
+        self,
+        telemetry: TelemetryInput,
+        cache_key: str,
+        model: str,
+        tier: ModelTier,
+        session_id: str,
+    ) -> DiagnosticResponse:
+        """Asyncio counterpart of _fetch."""
+        raw_dict = self.cache.get(cache_key)
+        with self._metered(session_id) as reports:
+            if raw_dict is None:
+                with span("prompt"):
+                    prompt = telemetry.format_prompt()
+                with span("backend"), self._measured(tier):
+                    raw_dict = await self.repository.fetch_diagnosis_async(
+                        prompt, model=model, settings=tier.settings
+                    )
+        usage = self._charge(session_id, reports)
+        # Hydrate the domain models
+        with span("hydrate"):
+            result = self._hydrate(raw_dict)
+        result.usage = usage
+        self._store(cache_key, raw_dict, telemetry, model, tier, reports.answered_by)
+        return result
+
+    def _stream(
+        self,
+        telemetry: TelemetryInput,
+        cache_key: str,
+        model: str,
+        tier: ModelTier,
+        session_id: str,
+        publish: Callable[[DiagnosticSection], None],
+    ) -> DiagnosticResponse:
+        """Streams one diagnosis, publishing each section (runs once per flight)."""
+        parser = IncrementalSectionParser()
+        with span("prompt"):
             prompt = telemetry.format_prompt()
-            raw_dict = self.repository.fetch_diagnosis(prompt)
+        parsing = 0.0
+        # A truncated or malformed stream counts against the tier
+        with self._measured(tier):
+            with span("backend"), self._metered(session_id) as reports:
+                for chunk in self.repository.stream_diagnosis(
+                    prompt, model=model, settings=tier.settings
+                ):
+                    started = time.perf_counter()
+                    sections = [
+                        DiagnosticSection(
+                            kind, SECTION_MODELS[kind].from_dict(raw_section)
+                        )
+                        for kind, raw_section in parser.feed(chunk)
+                    ]
+                    parsing += time.perf_counter() - started
+                    for section in sections:
+                        publish(section)
+            # Incremental parsing and hydration, interleaved with the stream
+            record_stage("stream_parse", parsing)
+            usage = self._charge(session_id, reports)
 
-            # Hydrate the domain models
-            return DiagnosticResponse.from_dict(raw_dict)
-        except ExternalServiceError as exc:
-            logger.error(f"External service failure during diagnosis: {exc}")
-            raise
-        except Exception as exc:
-            logger.error(f"Failed to hydrate domain models from payload: {exc}")
-            raise DataParsingError(
-                f"Failed to hydrate domain models from payload: {exc}"
-            ) from exc
+            # Validate the whole document before it becomes a cache entry
+            with span("hydrate"):
+                raw_dict = parser.finish()
+                result = self._hydrate(raw_dict)
+        result.usage = usage
+        self._store(cache_key, raw_dict, telemetry, model, tier, reports.answered_by)
+        return result
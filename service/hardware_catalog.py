@@ -0,0 +1,190 @@
+"""
+Zenith — Hardware Catalog.
+
+Recognises CPU and GPU models in canonical telemetry and looks up their
+specifications, and serves type-ahead suggestions for partly typed names.
+
+Each model is indexed under every token suffix of its name ("nvidia
+geforce rtx 3060", "geforce rtx 3060", "rtx 3060", "3060"), so a query can
+start at the vendor, the family or the model number. The keys are kept in
+one sorted array instead of a trie: the matches of a prefix are a single
+contiguous run, found by binary search, and the index costs one list slot
+per key rather than one node per character. Lookups stay in the
+microseconds however many models are indexed.
+
+The RAM field is parsed separately, by pattern, into a MemorySpec.
+"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from domain.models import HardwareSpec, MemorySpec
+from service.hardware_specs import CPU_SPECS, GPU_SPECS
+
+_CAPACITY_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(GB|TB)\b", re.IGNORECASE)
+_GENERATION_RE = re.compile(r"\b(LPDDR\d|DDR\d)", re.IGNORECASE)
+_SPEED_RE = re.compile(r"\b(\d{4,5})\s*(?:MHz|MT/s)?\b", re.IGNORECASE)
+# A RAM field made of nothing but capacity, generation and speed.
+_PLAIN_MEMORY_RE = re.compile(
+    r"\d+(?:\.\d+)?\s*(?:GB|TB)(?:\s+(?:LP)?DDR\d)?(?:[\s-]+\d{4,5}\s*(?:MHz|MT/s)?)?",
+    re.IGNORECASE,
+)
+
+
+def _key(text: str) -> str:
+    """Index form of a name: lower-case, with hyphens as spaces."""
+    return text.lower().replace("-", " ")
+
+
+class HardwareCatalog:
+    """Prefix index over the catalog models of one kind.
+
+    Args:
+        specs: The models to index; names must be canonical display strings.
+    """
+
+    def __init__(self, specs: Iterable[HardwareSpec]) -> None:
+        self._specs: List[HardwareSpec] = list(specs)
+        pairs = []
+        for idx, spec in enumerate(self._specs):
+            tokens = _key(spec.name).split(" ")
+            pairs.extend(
+                (" ".join(tokens[start:]), idx) for start in range(len(tokens))
+            )
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids = array("I", (idx for _, idx in pairs))
+        # Keys naming exactly one model, by model number: "3060" resolves,
+        # while "ti" and "geforce rtx" (shared) or "xtx" (no number) do not.
+        self._exact: Dict[str, int] = {}
+        shared = set()
+        for key, idx in pairs:
+            if self._exact.setdefault(key, idx) != idx:
+                shared.add(key)
+        for key in shared:
+            del self._exact[key]
+        for key in [key for key in self._exact if not any(c.isdigit() for c in key)]:
+            del self._exact[key]
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def resolve(self, name: str) -> Optional[HardwareSpec]:
+        """Return the model a canonical name or bare model number identifies."""
+        idx = self._exact.get(_key(name))
+        return None if idx is None else self._specs[idx]
+
+    def suggest(self, query: str, limit: int = 5) -> List[HardwareSpec]:
+        """Return up to limit models with a name token sequence starting with query.
+
+        Args:
+            query: The normalised, partly typed name (see hardware_query).
+            limit: Maximum number of suggestions.
+        """
+        prefix = _key(query)
+        if not prefix:
+            return []
+        keys = self._keys
+        found: List[HardwareSpec] = []
+        seen = set()
+        for pos in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[pos].startswith(prefix):
+                break
+            idx = self._ids[pos]
+            if idx not in seen:
+                seen.add(idx)
+                found.append(self._specs[idx])
+                if len(found) == limit:
+                    break
+        return found
+
+
+def _bundled_specs(kind: str) -> List[HardwareSpec]:
+    if kind == "cpu":
+        return [
+            HardwareSpec(
+                name=name,
+                kind="cpu",
+                cores=cores,
+                threads=threads,
+                base_clock_ghz=base,
+                boost_clock_ghz=boost,
+                release_year=year,
+                tier=tier,
+            )
+            for name, cores, threads, base, boost, year, tier in CPU_SPECS
+        ]
+    return [
+        HardwareSpec(
+            name=name,
+            kind="gpu",
+            cores=cores,
+            boost_clock_ghz=boost,
+            vram_gb=vram,
+            release_year=year,
+            tier=tier,
+        )
+        for name, cores, boost, vram, year, tier in GPU_SPECS
+    ]
+
+
+@lru_cache(maxsize=1024)
+def parse_memory(ram: str) -> Optional[MemorySpec]:
+    """Parse a canonical RAM description ("16GB DDR4 3200MHz") into a MemorySpec.
+
+    Returns:
+        Optional[MemorySpec]: None when no capacity is given.
+    """
+    capacity = _CAPACITY_RE.search(ram)
+    if capacity is None:
+        return None
+    capacity_gb = float(capacity.group(1))
+    if capacity.group(2).upper() == "TB":
+        capacity_gb *= 1024
+    generation = _GENERATION_RE.search(ram)
+    speed = _SPEED_RE.search(ram)
+    return MemorySpec(
+        capacity_gb=capacity_gb,
+        generation=generation.group(1).upper() if generation else None,
+        speed_mhz=int(speed.group(1)) if speed else None,
+    )
+
+
+def memory_label(ram: str) -> Optional[str]:
+    """Return the canonical label of a RAM field that parses completely.
+
+    "16GB DDR4-3200" and "16GB DDR4 3200MT/s" both become "16GB DDR4
+    3200MHz"; a field with anything else in it ("2x8GB", a brand) is left
+    alone and None is returned.
+    """
+    if not _PLAIN_MEMORY_RE.fullmatch(ram):
+        return None
+    spec = parse_memory(ram)
+    if spec.capacity_gb >= 1024 and spec.capacity_gb % 1024 == 0:
+        parts = [f"{spec.capacity_gb / 1024:g}TB"]
+    else:
+        parts = [f"{spec.capacity_gb:g}GB"]
+    if spec.generation:
+        parts.append(spec.generation)
+    if spec.speed_mhz:
+        parts.append(f"{spec.speed_mhz}MHz")
+    return " ".join(parts)
+
+
+_shared_catalogs: Dict[str, HardwareCatalog] = {}
+_shared_catalogs_lock = threading.Lock()
+
+
+def get_catalog(kind: str) -> HardwareCatalog:
+    """Return the process-wide catalog of bundled "cpu" or "gpu" models."""
+    catalog = _shared_catalogs.get(kind)
+    if catalog is None:
+        with _shared_catalogs_lock:
+            catalog = _shared_catalogs.get(kind)
+            if catalog is None:
+                catalog = _shared_catalogs[kind] = HardwareCatalog(_bundled_specs(kind))
+    return catalog
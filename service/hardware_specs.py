@@ -0,0 +1,89 @@
+"""
+Zenith — Hardware Spec Tables.
+
+Bundled catalog of popular CPU and GPU models for the hardware catalog.
+Names are the canonical display strings the telemetry canonicaliser
+produces, so a canonicalised field can be looked up directly. These are
+plain data with no runtime dependencies.
+
+Tiers are "entry", "mainstream", "performance" or "enthusiast", relative
+to the model's own generation. Clocks are in GHz; a base clock of None
+means the vendor does not publish one.
+"""
+
+# (name, cores, threads, base clock, boost clock, release year, tier)
+CPU_SPECS = (
+    ("AMD Ryzen 5 3600", 6, 12, 3.6, 4.2, 2019, "mainstream"),
+    ("AMD Ryzen 7 3700X", 8, 16, 3.6, 4.4, 2019, "performance"),
+    ("AMD Ryzen 9 3900X", 12, 24, 3.8, 4.6, 2019, "enthusiast"),
+    ("AMD Ryzen 5 5600", 6, 12, 3.5, 4.4, 2022, "mainstream"),
+    ("AMD Ryzen 5 5600X", 6, 12, 3.7, 4.6, 2020, "mainstream"),
+    ("AMD Ryzen 7 5700X", 8, 16, 3.4, 4.6, 2022, "performance"),
+    ("AMD Ryzen 7 5800X", 8, 16, 3.8, 4.7, 2020, "performance"),
+    ("AMD Ryzen 7 5800X3D", 8, 16, 3.4, 4.5, 2022, "enthusiast"),
+    ("AMD Ryzen 9 5900X", 12, 24, 3.7, 4.8, 2020, "enthusiast"),
+    ("AMD Ryzen 9 5950X", 16, 32, 3.4, 4.9, 2020, "enthusiast"),
+    ("AMD Ryzen 5 7600", 6, 12, 3.8, 5.1, 2023, "mainstream"),
+    ("AMD Ryzen 5 7600X", 6, 12, 4.7, 5.3, 2022, "mainstream"),
+    ("AMD Ryzen 7 7700X", 8, 16, 4.5, 5.4, 2022, "performance"),
+    ("AMD Ryzen 7 7800X3D", 8, 16, 4.2, 5.0, 2023, "enthusiast"),
+    ("AMD Ryzen 9 7900X", 12, 24, 4.7, 5.6, 2022, "enthusiast"),
+    ("AMD Ryzen 9 7950X", 16, 32, 4.5, 5.7, 2022, "enthusiast"),
+    ("AMD Ryzen 5 9600X", 6, 12, 3.9, 5.4, 2024, "mainstream"),
+    ("AMD Ryzen 7 9700X", 8, 16, 3.8, 5.5, 2024, "performance"),
+    ("AMD Ryzen 7 9800X3D", 8, 16, 4.7, 5.2, 2024, "enthusiast"),
+    ("Intel Core i5-9600K", 6, 6, 3.7, 4.6, 2018, "mainstream"),
+    ("Intel Core i7-9700K", 8, 8, 3.6, 4.9, 2018, "performance"),
+    ("Intel Core i9-9900K", 8, 16, 3.6, 5.0, 2018, "enthusiast"),
+    ("Intel Core i5-10400F", 6, 12, 2.9, 4.3, 2020, "mainstream"),
+    ("Intel Core i7-10700K", 8, 16, 3.8, 5.1, 2020, "performance"),
+    ("Intel Core i5-12400F", 6, 12, 2.5, 4.4, 2022, "mainstream"),
+    ("Intel Core i5-12600K", 10, 16, 3.7, 4.9, 2021, "performance"),
+    ("Intel Core i7-12700K", 12, 20, 3.6, 5.0, 2021, "performance"),
+    ("Intel Core i9-12900K", 16, 24, 3.2, 5.2, 2021, "enthusiast"),
+    ("Intel Core i5-13400F", 10, 16, 2.5, 4.6, 2023, "mainstream"),
+    ("Intel Core i5-13600K", 14, 20, 3.5, 5.1, 2022, "performance"),
+    ("Intel Core i7-13700K", 16, 24, 3.4, 5.4, 2022, "enthusiast"),
+    ("Intel Core i9-13900K", 24, 32, 3.0, 5.8, 2022, "enthusiast"),
+    ("Intel Core i5-14600K", 14, 20, 3.5, 5.3, 2023, "performance"),
+    ("Intel Core i7-14700K", 20, 28, 3.4, 5.6, 2023, "enthusiast"),
+    ("Intel Core i9-14900K", 24, 32, 3.2, 6.0, 2023, "enthusiast"),
+    ("Apple M1", 8, 8, None, 3.2, 2020, "mainstream"),
+    ("Apple M2", 8, 8, None, 3.5, 2022, "mainstream"),
+    ("Apple M3", 8, 8, None, 4.05, 2023, "mainstream"),
+)
+
+# (name, shader units, boost clock, VRAM in GB, release year, tier)
+GPU_SPECS = (
+    ("NVIDIA GeForce GTX 1060", 1280, 1.708, 6, 2016, "mainstream"),
+    ("NVIDIA GeForce GTX 1070", 1920, 1.683, 8, 2016, "performance"),
+    ("NVIDIA GeForce GTX 1080 Ti", 3584, 1.582, 11, 2017, "enthusiast"),
+    ("NVIDIA GeForce GTX 1650", 896, 1.665, 4, 2019, "entry"),
+    ("NVIDIA GeForce GTX 1660 SUPER", 1408, 1.785, 6, 2019, "entry"),
+    ("NVIDIA GeForce RTX 2060", 1920, 1.68, 6, 2019, "mainstream"),
+    ("NVIDIA GeForce RTX 2070 SUPER", 2560, 1.77, 8, 2019, "performance"),
+    ("NVIDIA GeForce RTX 2080 Ti", 4352, 1.545, 11, 2018, "enthusiast"),
+    ("NVIDIA GeForce RTX 3050", 2560, 1.777, 8, 2022, "entry"),
+    ("NVIDIA GeForce RTX 3060", 3584, 1.777, 12, 2021, "mainstream"),
+    ("NVIDIA GeForce RTX 3060 Ti", 4864, 1.665, 8, 2020, "mainstream"),
+    ("NVIDIA GeForce RTX 3070", 5888, 1.725, 8, 2020, "performance"),
+    ("NVIDIA GeForce RTX 3080", 8704, 1.71, 10, 2020, "enthusiast"),
+    ("NVIDIA GeForce RTX 3090", 10496, 1.695, 24, 2020, "enthusiast"),
+    ("NVIDIA GeForce RTX 4060", 3072, 2.46, 8, 2023, "mainstream"),
+    ("NVIDIA GeForce RTX 4060 Ti", 4352, 2.535, 8, 2023, "mainstream"),
+    ("NVIDIA GeForce RTX 4070", 5888, 2.475, 12, 2023, "performance"),
+    ("NVIDIA GeForce RTX 4070 SUPER", 7168, 2.475, 12, 2024, "performance"),
+    ("NVIDIA GeForce RTX 4070 Ti", 7680, 2.61, 12, 2023, "performance"),
+    ("NVIDIA GeForce RTX 4080", 9728, 2.505, 16, 2022, "enthusiast"),
+    ("NVIDIA GeForce RTX 4090", 16384, 2.52, 24, 2022, "enthusiast"),
+    ("AMD Radeon RX 580", 2304, 1.34, 8, 2017, "mainstream"),
+    ("AMD Radeon RX 5700 XT", 2560, 1.905, 8, 2019, "performance"),
+    ("AMD Radeon RX 6600", 1792, 2.491, 8, 2021, "mainstream"),
+    ("AMD Radeon RX 6700 XT", 2560, 2.581, 12, 2021, "performance"),
+    ("AMD Radeon RX 6800 XT", 4608, 2.25, 16, 2020, "enthusiast"),
+    ("AMD Radeon RX 7600", 2048, 2.655, 8, 2023, "mainstream"),
+    ("AMD Radeon RX 7800 XT", 3840, 2.43, 16, 2023, "performance"),
+    ("AMD Radeon RX 7900 XTX", 6144, 2.5, 24, 2022, "enthusiast"),
+    ("Intel Arc A750", 3584, 2.05, 8, 2022, "mainstream"),
+    ("Intel Arc A770", 4096, 2.1, 16, 2022, "mainstream"),
+)
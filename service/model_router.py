@@ -0,0 +1,192 @@
+"""
+Zenith — Complexity-Based Model Routing.
+
+Not every diagnosis needs the same model. Each request is scored from 0
+(routine) to 1 (demanding) on its canonical telemetry:
+
+* the symptom description: how many distinct content terms it has (see
+  symptom_terms), saturating at a long paragraph; "Not specified" adds
+  nothing;
+* uncommon hardware: a CPU or GPU the hardware catalog does not resolve;
+* rule-engine confidence: an application the compatibility rule table does
+  not name, whose platform constraints the model has to work out itself.
+
+Tiers are tried in order and the first whose maximum score covers the
+request wins, so cheap models take the routine traffic. Every call's
+latency and whether its payload failed to parse are recorded per tier,
+exported as the "routing" collector and the zenith_tier_* metrics, together
+with the score distribution, so thresholds can be tuned from data.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import GEMINI_MODEL, GEMINI_TEMPERATURE, MODEL_ROUTING, MODEL_TIERS
+from metrics import registry
+from domain.exceptions import ConfigurationError
+from domain.models import GenerationSettings, TelemetryInput
+from service.rule_engine import CompatibilityRuleEngine, get_shared_rules
+from service.telemetry_canonicalizer import symptom_terms
+
+# Score weights; they sum to 1.0, the most demanding request.
+_SYMPTOM_WEIGHT = 0.6
+_SYMPTOM_TERMS_AT_MAX = 24
+_UNKNOWN_CPU_WEIGHT = 0.15
+_UNKNOWN_GPU_WEIGHT = 0.15
+_UNCOVERED_APPLICATION_WEIGHT = 0.1
+
+_SCORE_BUCKETS = (0.1, 0.2, 0.25, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+registry.describe(
+    "zenith_routing_score", "Complexity score of routed diagnoses (0 to 1)."
+)
+registry.describe("zenith_tier_latency_seconds", "Model call latency per routing tier.")
+registry.describe(
+    "zenith_tier_parse_failures_total",
+    "Model calls per routing tier whose payload could not be parsed.",
+)
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A model and its generation settings, for requests scoring up to max_score."""
+
+    name: str
+    model: str
+    settings: GenerationSettings
+    max_score: float
+
+
+# The tier every request uses when routing is off.
+STANDARD_TIER = ModelTier(
+    "standard", GEMINI_MODEL, GenerationSettings(GEMINI_TEMPERATURE), 1.0
+)
+
+
+def tiers_from_config(
+    records: Iterable[tuple] = MODEL_TIERS,
+) -> Tuple[ModelTier, ...]:
+    """Build tiers from (name, model, temperature, max tokens, max score) records.
+
+    Raises:
+        ConfigurationError: If there are no tiers, their maximum scores do
+            not increase, or the last one does not cover a score of 1.0.
+    """
+    tiers = tuple(
+        ModelTier(name, model, GenerationSettings(temperature, max_tokens), max_score)
+        for name, model, temperature, max_tokens, max_score in records
+    )
+    if not tiers or tiers[-1].max_score < 1.0:
+        raise ConfigurationError("The last model tier must cover a score of 1.0.")
+    if any(a.max_score >= b.max_score for a, b in zip(tiers, tiers[1:])):
+        raise ConfigurationError("Model tier maximum scores must increase.")
+    return tiers
+
+
+class ComplexityRouter:
+    """Routes telemetry to a model tier by complexity and keeps per-tier stats.
+
+    Args:
+        tiers: Tiers in increasing order of max_score.
+        rules: Rule engine whose coverage counts towards the score.
+        enabled: With routing off, every request goes to STANDARD_TIER.
+    """
+
+    def __init__(
+        self,
+        tiers: Iterable[ModelTier] = (),
+        rules: Optional[CompatibilityRuleEngine] = None,
+        enabled: bool = MODEL_ROUTING,
+    ) -> None:
+        self.tiers = tuple(tiers) or tiers_from_config()
+        self.enabled = enabled
+        self._rules = rules if rules is not None else get_shared_rules()
+        self._score_histogram = registry.histogram(
+            "zenith_routing_score", _SCORE_BUCKETS
+        )
+        self._latency = {
+            tier.name: registry.histogram("zenith_tier_latency_seconds", tier=tier.name)
+            for tier in self.tiers + (STANDARD_TIER,)
+        }
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def score(self, telemetry: TelemetryInput) -> float:
+        """Return the complexity of canonical telemetry, from 0.0 to 1.0."""
+        terms = len(symptom_terms(telemetry.symptoms))
+        score = _SYMPTOM_WEIGHT * min(1.0, terms / _SYMPTOM_TERMS_AT_MAX)
+        if telemetry.cpu_spec is None:
+            score += _UNKNOWN_CPU_WEIGHT
+        if telemetry.gpu_spec is None:
+            score += _UNKNOWN_GPU_WEIGHT
+        if not self._rules.covers(telemetry):
+            score += _UNCOVERED_APPLICATION_WEIGHT
+        return min(1.0, score)
+
+    def route(self, telemetry: TelemetryInput) -> ModelTier:
+        """Return the tier for canonical telemetry, counting routed requests per tier."""
+        if not self.enabled:
+            return STANDARD_TIER
+        score = self.score(telemetry)
+        self._score_histogram.observe(score)
+        tier = next(t for t in self.tiers if score <= t.max_score)
+        with self._lock:
+            self._tier_stats(tier)["routed"] += 1
+        return tier
+
+    def record(self, tier: ModelTier, seconds: float, parse_failed: bool) -> None:
+        """Record one model call made for a tier: its latency and parse outcome."""
+        self._latency[tier.name].observe(seconds)
+        with self._lock:
+            stats = self._tier_stats(tier)
+            stats["calls"] += 1
+            stats["latency_seconds"] += seconds
+            if parse_failed:
+                stats["parse_failures"] += 1
+        if parse_failed:
+            registry.inc("zenith_tier_parse_failures_total", tier=tier.name)
+
+    def stats(self) -> dict:
+        """Return per-tier routed requests, calls, parse failure rate and mean latency."""
+        with self._lock:
+            snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        result = {"enabled": int(self.enabled)}
+        for name, stats in snapshot.items():
+            calls = stats["calls"]
+            result[name] = {
+                "routed": stats["routed"],
+                "calls": calls,
+                "parse_failures": stats["parse_failures"],
+                "parse_failure_rate": stats["parse_failures"] / calls if calls else 0.0,
+                "mean_latency_seconds": (
+                    stats["latency_seconds"] / calls if calls else 0.0
+                ),
+            }
+        return result
+
+    def _tier_stats(self, tier: ModelTier) -> Dict[str, float]:
+        """The counters for a tier, created on first use (caller holds the lock)."""
+        stats = self._stats.get(tier.name)
+        if stats is None:
+            stats = self._stats[tier.name] = {
+                "routed": 0,
+                "calls": 0,
+                "parse_failures": 0,
+                "latency_seconds": 0.0,
+            }
+        return stats
+
+
+_shared_router: Optional[ComplexityRouter] = None
+_shared_router_lock = threading.Lock()
+
+
+def get_shared_router() -> ComplexityRouter:
+    """Return the process-wide ComplexityRouter, creating it on first use."""
+    global _shared_router
+    if _shared_router is None:
+        with _shared_router_lock:
+            if _shared_router is None:
+                _shared_router = ComplexityRouter()
+    return _shared_router
@@ -0,0 +1,136 @@
+"""
+Zenith — Local Compatibility Rule Engine.
+
+Answers diagnoses whose outcome is already known without calling the model.
+The hard incompatibility table is indexed by (application, OS) once, so a
+check is a single dict lookup on the canonical telemetry; a match is turned
+into the same DiagnosticResponse the model gives for a hard blocker: a
+Software bottleneck at severity 10, compatibility 0 and no tweaks.
+
+Checks and hits are counted per rule, exported as the "rules" collector and
+the zenith_rule_hits_total counter, so the table's hit rate shows which
+rules earn their keep.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from config import LOCAL_RULES
+from metrics import registry
+from domain.models import (
+    Compatibility,
+    Diagnosis,
+    DiagnosticResponse,
+    DoNotDo,
+    TelemetryInput,
+)
+from service.compatibility_rules import HARD_INCOMPATIBILITY_RULES
+
+registry.describe(
+    "zenith_rule_hits_total", "Diagnoses answered by a local compatibility rule."
+)
+
+
+class CompatibilityRuleEngine:
+    """Indexed hard incompatibility rules with per-rule hit counters.
+
+    Args:
+        rules: Rule records in the format of HARD_INCOMPATIBILITY_RULES.
+    """
+
+    def __init__(self, rules: Iterable[dict] = HARD_INCOMPATIBILITY_RULES) -> None:
+        self._index: Dict[Tuple[str, str], dict] = {}
+        self._hits: Dict[str, int] = {}
+        self._applications: Set[str] = set()
+        for rule in rules:
+            self._hits[rule["id"]] = 0
+            for application in rule["applications"]:
+                self._applications.add(application.casefold())
+                for os_name in rule["os"]:
+                    self._index[(application.casefold(), os_name.casefold())] = rule
+        self._checks = 0
+        self._lock = threading.Lock()
+
+    def match(self, telemetry: TelemetryInput) -> Optional[DiagnosticResponse]:
+        """Return the rule verdict for canonical telemetry, or None if no rule applies."""
+        rule = self._index.get(
+            (telemetry.application.casefold(), telemetry.os_name.casefold())
+        )
+        with self._lock:
+            self._checks += 1
+            if rule is not None:
+                self._hits[rule["id"]] += 1
+        if rule is None:
+            return None
+        registry.inc("zenith_rule_hits_total", rule=rule["id"])
+        return self._verdict(rule, telemetry)
+
+    def covers(self, telemetry: TelemetryInput) -> bool:
+        """Return whether any rule names the application, on any OS.
+
+        A covered application has known platform constraints, so the model
+        has less to work out for it even when no rule matches this OS.
+        """
+        return telemetry.application.casefold() in self._applications
+
+    def hits(self) -> Dict[str, int]:
+        """Return the number of diagnoses each rule has answered."""
+        with self._lock:
+            return dict(self._hits)
+
+    def stats(self) -> dict:
+        """Return the rule count, checks, hits and the share of checks matched."""
+        with self._lock:
+            checks = self._checks
+            hits = sum(self._hits.values())
+            rules = len(self._hits)
+        return {
+            "rules": rules,
+            "checks": checks,
+            "hits": hits,
+            "hit_rate": hits / checks if checks else 0.0,
+        }
+
+    @staticmethod
+    def _verdict(rule: dict, telemetry: TelemetryInput) -> DiagnosticResponse:
+        """Build the hard-blocker response for one rule."""
+        return DiagnosticResponse(
+            diagnosis=Diagnosis(
+                bottleneck_type="Software",
+                severity=10,
+                plain_english=rule["explanation"],
+                reasoning=(
+                    f"Hard OS incompatibility: {telemetry.application} on "
+                    f"{telemetry.os_name} is blocked because {rule['blocker']}. "
+                    f"No hardware change can resolve it, so no tweaks apply."
+                ),
+            ),
+            compatibility=Compatibility(
+                score=0,
+                note=f"Not supported on {telemetry.os_name}: {rule['blocker']}.",
+            ),
+            tweaks=[],
+            do_not_do=[
+                DoNotDo(action=action, reason=reason)
+                for action, reason in rule["do_not_do"]
+            ],
+        )
+
+
+_shared_rules: Optional[CompatibilityRuleEngine] = None
+_shared_rules_lock = threading.Lock()
+
+
+def get_shared_rules() -> CompatibilityRuleEngine:
+    """Return the process-wide CompatibilityRuleEngine, creating it on first use.
+
+    With LOCAL_RULES off it has no rules, so every check misses.
+    """
+    global _shared_rules
+    if _shared_rules is None:
+        with _shared_rules_lock:
+            if _shared_rules is None:
+                _shared_rules = CompatibilityRuleEngine(
+                    HARD_INCOMPATIBILITY_RULES if LOCAL_RULES else ()
+                )
+    return _shared_rules
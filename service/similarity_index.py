@@ -0,0 +1,273 @@
+"""
+Zenith — Near-Duplicate Diagnosis Index.
+
+Remembers past diagnoses so that a request differing from one of them only
+in the wording of its symptoms ("stutters in big fights" vs "stuttering
+during large fights") can reuse it instead of calling the model again.
+
+Entries are grouped by their exact canonical hardware profile, application
+and generation config (a digest of the model, its settings, the system
+prompt and the response schema, as in the result cache's keys); only the
+symptom terms (see symptom_terms) are matched fuzzily.
+Each term set gets a MinHash signature, split into bands for locality-
+sensitive hashing: a lookup hashes its own bands, collects the entries that
+share at least one, and scores just those candidates by exact Jaccard
+similarity. Lookup cost depends on the number of candidates, not on the
+size of the index. An identical term set is an exact repeat, left to the
+result cache, and is never reused from here.
+
+The index holds the documents themselves (the result cache's memory tier
+may have evicted them long before), but entries expire with the cache's
+TTL and the index is bounded both by max_entries and by the approximate
+size of what it holds, the oldest entry dropped first.
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config import (
+    CACHE_TTL_SECONDS,
+    SIMILARITY_MAX_BYTES,
+    SIMILARITY_MAX_ENTRIES,
+    SIMILARITY_REUSE,
+    SIMILARITY_THRESHOLD,
+)
+from domain.models import TelemetryInput
+from service.telemetry_canonicalizer import symptom_terms
+
+# MinHash signature length and its split into LSH bands. Four rows per band
+# make term sets with Jaccard similarity 0.75 share a band with probability
+# 1 - (1 - 0.75**4) ** 8 = 0.95, and 0.8 with 0.98.
+_NUM_PERM = 32
+_ROWS_PER_BAND = 4
+
+# Band buckets longer than this are skipped on lookup: a band value that
+# common (popular terms on a popular profile) no longer narrows anything
+# down, and the entry's other bands still find its near-duplicates.
+_MAX_BUCKET_SCAN = 64
+
+# Bytes an entry costs beyond its serialised document: its profile, term
+# set, band keys and bucket slots (measured with benchmarks/bench_similarity).
+_ENTRY_OVERHEAD_BYTES = 2048
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = tuple(
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_NUM_PERM)
+)
+
+
+@dataclass(eq=False)
+class _Entry:
+    profile: Tuple[str, ...]
+    terms: FrozenSet[str]
+    document: dict
+    bands: Tuple[int, ...]
+    size: int
+    expires_at: float
+
+
+# An entry's identity: its profile and symptom terms.
+_Key = Tuple[Tuple[str, ...], FrozenSet[str]]
+
+
+def _profile(telemetry: TelemetryInput, config: str) -> Tuple[str, ...]:
+    """Everything that must match exactly for a diagnosis to be reused."""
+    return (
+        config,
+        telemetry.cpu,
+        telemetry.gpu,
+        telemetry.ram,
+        telemetry.storage,
+        telemetry.os_name,
+        telemetry.application,
+    )
+
+
+def _bands(profile: Tuple[str, ...], terms: FrozenSet[str]) -> Tuple[int, ...]:
+    """Return the LSH band keys of a term set within one profile."""
+    hashes = [zlib.crc32(term.encode("utf-8")) for term in terms]
+    signature = [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+    return tuple(
+        hash((profile, start, *signature[start : start + _ROWS_PER_BAND]))
+        for start in range(0, _NUM_PERM, _ROWS_PER_BAND)
+    )
+
+
+class SimilarityIndex:
+    """Past diagnoses, searchable by symptom similarity on identical hardware.
+
+    Args:
+        threshold: Minimum Jaccard similarity of symptom terms for a reuse.
+        max_entries: Diagnoses kept before the oldest is dropped (0 disables).
+        max_bytes: Approximate size of the documents and entries kept before
+            the oldest is dropped.
+        ttl_seconds: How long a diagnosis may be reused, as in the result cache.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = SIMILARITY_MAX_ENTRIES,
+        max_bytes: int = SIMILARITY_MAX_BYTES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._buckets: Dict[int, List[_Entry]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    def add(self, telemetry: TelemetryInput, config: str, document: dict) -> None:
+        """Remember the full diagnosis document of canonical telemetry.
+
+        Args:
+            telemetry: The canonical telemetry the document answers.
+            config: Digest of the generation config that produced it (see
+                build_config_key).
+            document: The full, validated diagnosis document.
+        """
+        terms = symptom_terms(telemetry.symptoms)
+        if not self.max_entries or not terms:
+            return
+        profile = _profile(telemetry, config)
+        key = (profile, terms)
+        bands = _bands(profile, terms)
+        size = _ENTRY_OVERHEAD_BYTES + len(json.dumps(document, separators=(",", ":")))
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._drop(entry)
+            entry = self._entries[key] = _Entry(
+                profile, terms, document, bands, size, now + self.ttl_seconds
+            )
+            for band in bands:
+                self._buckets.setdefault(band, []).append(entry)
+            self._bytes += size
+            self._expire(now)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, oldest = self._entries.popitem(last=False)
+                self._drop(oldest)
+                self._evictions += 1
+
+    def lookup(
+        self, telemetry: TelemetryInput, config: str
+    ) -> Optional[Tuple[dict, float]]:
+        """Find the most similar past diagnosis of canonical telemetry.
+
+        Args:
+            telemetry: The canonical telemetry of the request.
+            config: Digest of the request's generation config; only
+                diagnoses produced under the same one are reused.
+
+        Returns:
+            Optional[Tuple[dict, float]]: The stored document and the
+            similarity of its symptoms, or None below the threshold. An
+            identical term set never matches: that is the cache's to serve.
+        """
+        terms = symptom_terms(telemetry.symptoms)
+        if not self.max_entries or not terms:
+            return None
+        profile = _profile(telemetry, config)
+        bands = _bands(profile, terms)
+        best: Optional[_Entry] = None
+        best_score = 0.0
+        with self._lock:
+            self._expire(time.monotonic())
+            seen = set()
+            for band in bands:
+                bucket = self._buckets.get(band, ())
+                if len(bucket) > _MAX_BUCKET_SCAN:
+                    continue
+                for entry in bucket:
+                    if id(entry) in seen:
+                        continue
+                    seen.add(id(entry))
+                    if entry.profile != profile or entry.terms == terms:
+                        continue
+                    score = len(terms & entry.terms) / len(terms | entry.terms)
+                    if score > best_score:
+                        best, best_score = entry, score
+            if best is None or best_score < self.threshold:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return best.document, best_score
+
+    def stats(self) -> dict:
+        """Return the entry count and size, evictions, and hits and misses of lookups."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            entries, size = len(self._entries), self._bytes
+            evictions, expirations = self._evictions, self._expirations
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "evictions": evictions,
+            "expirations": expirations,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _expire(self, now: float) -> None:
+        """Drop expired entries, oldest first (caller holds the lock).
+
+        Every entry lives for the same TTL and a re-added one moves to the
+        end, so the expired entries are always at the front.
+        """
+        while self._entries:
+            key = next(iter(self._entries))
+            entry = self._entries[key]
+            if entry.expires_at > now:
+                return
+            del self._entries[key]
+            self._drop(entry)
+            self._expirations += 1
+
+    def _drop(self, entry: _Entry) -> None:
+        """Remove an entry's size and band bucket slots (caller holds the lock)."""
+        self._bytes -= entry.size
+        for band in entry.bands:
+            bucket = self._buckets.get(band)
+            if bucket is None:
+                continue
+            bucket.remove(entry)
+            if not bucket:
+                del self._buckets[band]
+
+
+_shared_index: Optional[SimilarityIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_shared_similarity_index() -> SimilarityIndex:
+    """Return the process-wide SimilarityIndex, creating it on first use.
+
+    With SIMILARITY_REUSE off it keeps no entries, so every lookup misses.
+    """
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = SimilarityIndex(
+                    max_entries=SIMILARITY_MAX_ENTRIES if SIMILARITY_REUSE else 0
+                )
+    return _shared_index
@@ -0,0 +1,347 @@
+"""
+Zenith — Single-Flight Request Coalescing.
+
+Concurrent diagnoses of the same canonical telemetry share one upstream
+call. The first caller for a key becomes the leader: its work runs on a
+shared worker pool, not on the caller's thread. Every caller (the leader
+included) then waits on the resulting flight, for no longer than its own
+request deadline allows. Because no caller owns the work, a Streamlit
+session that reruns or disconnects mid-wait only stops waiting; the call
+still completes for everyone else and still fills the cache. The work
+runs under a deadline of its own that expires with the latest waiter's,
+and is cancelled once every waiter has given up.
+
+Work may publish intermediate items (streamed diagnosis sections) as it
+goes. Followers that join late replay everything published so far before
+blocking for more.
+
+The leader's work runs in a copy of the leader's context, so its metrics
+spans land in the leader's request trace; followers are annotated as
+coalesced.
+
+Thread-based and asyncio-based flights are tracked separately: an event
+loop coalesces its own coroutines with run_async. A shared task follows
+the same deadline rules, and is cancelled once every caller awaiting it
+has given up.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from config import COALESCE_MAX_WORKERS
+from domain.exceptions import DeadlineExceededError
+from metrics import annotate
+from repository.deadline import Deadline, current_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Flight(Generic[T]):
+    """One in-progress unit of work that any number of callers can wait on.
+
+    Args:
+        deadline: The work's own deadline, cancelled once every waiter has
+            given up (None for work without one).
+    """
+
+    def __init__(self, deadline: Optional[Deadline] = None) -> None:
+        self.deadline = deadline
+        self._items: List[Any] = []
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        self._waiters = 0
+        self._cond = threading.Condition()
+
+    def attach(self, caller: Optional[Deadline]) -> bool:
+        """Count a waiter, extending the work's deadline to cover the caller's.
+
+        Returns:
+            False, without attaching, if every earlier waiter has already
+            given up and the work is cancelled.
+        """
+        with self._cond:
+            if self.deadline is not None and self.deadline.cancelled:
+                return False
+            self._waiters += 1
+            if self.deadline is not None and caller is not None:
+                self.deadline.extend_to(caller)
+            return True
+
+    def publish(self, item: Any) -> None:
+        """Make an intermediate item visible to every follower."""
+        with self._cond:
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def finish(self, result: T) -> None:
+        with self._cond:
+            self._result = result
+            self._done = True
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        with self._cond:
+            self._error = error
+            self._done = True
+            self._cond.notify_all()
+
+    def follow(self, deadline: Optional[Deadline] = None) -> Iterator[Any]:
+        """Yield every published item, from the first, until the flight ends.
+
+        Closing the iterator early leaves the flight, like a passed deadline.
+
+        Raises:
+            DeadlineExceededError: If deadline passes while waiting for an item.
+            BaseException: The work's exception, after the items published before it.
+        """
+        index = 0
+        while True:
+            with self._cond:
+                while index == len(self._items) and not self._done:
+                    self._pause(deadline)
+                pending = self._items[index:]
+                done = self._done
+            try:
+                for item in pending:
+                    yield item
+            except GeneratorExit:
+                # The follower stopped reading (its session moved on)
+                self.abandon()
+                raise
+            index += len(pending)
+            if done and index == len(self._items):
+                break
+        if self._error is not None:
+            raise self._error
+
+    def wait(self, deadline: Optional[Deadline] = None) -> T:
+        """Block until the flight ends and return its result (or raise its error).
+
+        Raises:
+            DeadlineExceededError: If deadline passes first.
+        """
+        with self._cond:
+            while not self._done:
+                self._pause(deadline)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def abandon(self) -> None:
+        """Leave the flight without waiting for its result.
+
+        For a caller that joined but will not wait or follow after all. The
+        last waiter to leave an unfinished flight cancels its work.
+        """
+        with self._cond:
+            self._waiters -= 1
+            if self._waiters > 0 or self._done or self.deadline is None:
+                return
+            # Under the condition, so no caller can attach to the dying flight
+            self.deadline.cancel()
+        logger.info("Every waiter gave up; cancelling the shared call.")
+
+    def _pause(self, deadline: Optional[Deadline]) -> None:
+        """Wait for the next notification (caller holds the condition), within deadline.
+
+        A waiter whose deadline passes leaves the flight; the last one to
+        leave cancels the work.
+        """
+        if deadline is None:
+            self._cond.wait()
+            return
+        self._cond.wait(deadline.poll_interval())
+        if self._done:
+            return
+        try:
+            deadline.check("wait")
+        except DeadlineExceededError:
+            self.abandon()
+            raise
+
+
+class _SharedTask:
+    """A coroutine shared by run_async callers on one event loop.
+
+    Only touched from its loop's thread, so it needs no lock of its own.
+    """
+
+    def __init__(self, task: "asyncio.Task", deadline: Optional[Deadline]) -> None:
+        self.task = task
+        self.deadline = deadline
+        self.abandoned = False
+        self._awaiters = 0
+
+    def attach(self, caller: Optional[Deadline]) -> None:
+        """Count an awaiter, extending the task's deadline to cover the caller's."""
+        self._awaiters += 1
+        if self.deadline is not None and caller is not None:
+            self.deadline.extend_to(caller)
+
+    def leave(self) -> None:
+        """Count an awaiter out; the last to leave an unfinished task cancels it."""
+        self._awaiters -= 1
+        if self._awaiters == 0 and not self.task.done():
+            logger.info("Every waiter gave up; cancelling the shared call.")
+            self.abandoned = True
+            self.task.cancel()
+
+
+class SingleFlight:
+    """Registry of in-progress flights keyed by request identity.
+
+    Args:
+        max_workers: Size of the pool that runs leader work for the threaded API.
+    """
+
+    def __init__(self, max_workers: int = COALESCE_MAX_WORKERS) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="zenith-flight"
+        )
+        self._flights: Dict[str, Flight] = {}
+        self._tasks: Dict[tuple, _SharedTask] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._followers = 0
+
+    def join(self, key: str, work: Callable[[Callable[[Any], None]], T]) -> Flight[T]:
+        """Join the flight for key, starting work on the pool if none is in progress.
+
+        Args:
+            key: Identity of the request; equal keys share one execution.
+            work: Called as work(publish) on a pool thread; its return value
+                becomes the flight result.
+
+        Returns:
+            The Flight to follow() or wait() on.
+        """
+        caller = current_deadline()
+        with self._lock:
+            flight = self._flights.get(key)
+            # A cancelled flight is still winding down; start afresh beside it
+            if flight is not None and flight.attach(caller):
+                self._followers += 1
+                logger.info(f"Coalesced request onto in-flight call (key={key[:12]}).")
+                annotate(coalesced=True)
+                return flight
+            flight = Flight(caller.detached() if caller is not None else None)
+            flight.attach(caller)
+            self._flights[key] = flight
+            self._leaders += 1
+        context = contextvars.copy_context()
+        self._executor.submit(context.run, self._run, key, flight, work)
+        return flight
+
+    async def run_async(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await the coroutine for key, sharing it with concurrent callers on this loop.
+
+        A caller that is cancelled, or whose deadline passes, stops waiting;
+        the shared task keeps running for the others, and is cancelled when
+        the last of them gives up.
+
+        Raises:
+            DeadlineExceededError: If the caller's deadline passes first.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        caller = current_deadline()
+        with self._lock:
+            shared = self._tasks.get(task_key)
+            # An abandoned task is still winding down; start afresh beside it
+            if shared is None or shared.abandoned:
+                deadline = caller.detached() if caller is not None else None
+                shared = _SharedTask(
+                    asyncio.ensure_future(self._shared(factory, deadline)), deadline
+                )
+                self._tasks[task_key] = shared
+                self._leaders += 1
+                shared.task.add_done_callback(
+                    lambda done, shared=shared: self._forget_task(task_key, shared)
+                )
+            else:
+                self._followers += 1
+                logger.info(f"Coalesced request onto in-flight call (key={key[:12]}).")
+                annotate(coalesced=True)
+            shared.attach(caller)
+        try:
+            if caller is None:
+                return await asyncio.shield(shared.task)
+            # Sliced like Flight.wait, so a cancelled deadline is noticed too
+            while True:
+                done, _ = await asyncio.wait(
+                    {shared.task}, timeout=caller.poll_interval()
+                )
+                if done:
+                    return shared.task.result()
+                caller.check("wait")
+        finally:
+            shared.leave()
+
+    @staticmethod
+    async def _shared(
+        factory: Callable[[], Awaitable[T]], deadline: Optional[Deadline]
+    ) -> T:
+        """Run the shared coroutine under its own deadline, not the leader's."""
+        with deadline_scope(deadline):
+            return await factory()
+
+    def stats(self) -> dict:
+        """Return leader/follower counters and the number of flights in progress."""
+        with self._lock:
+            joined = self._leaders + self._followers
+            return {
+                "leaders": self._leaders,
+                "followers": self._followers,
+                "coalesced_rate": (self._followers / joined) if joined else 0.0,
+                "in_flight": len(self._flights) + len(self._tasks),
+            }
+
+    def _run(self, key: str, flight: Flight, work: Callable) -> None:
+        try:
+            # The work answers to its own deadline, not the leader's
+            with deadline_scope(flight.deadline):
+                flight.finish(work(flight.publish))
+        except BaseException as exc:
+            flight.fail(exc)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _forget_task(self, task_key: tuple, shared: _SharedTask) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is shared:
+                del self._tasks[task_key]
+        # Mark the outcome as retrieved even if every waiter was cancelled.
+        if not shared.task.cancelled():
+            shared.task.exception()
+
+
+_shared_single_flight: Optional[SingleFlight] = None
+_shared_single_flight_lock = threading.Lock()
+
+
+def get_shared_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight, creating it on first use."""
+    global _shared_single_flight
+    if _shared_single_flight is None:
+        with _shared_single_flight_lock:
+            if _shared_single_flight is None:
+                _shared_single_flight = SingleFlight()
+    return _shared_single_flight
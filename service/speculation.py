@@ -0,0 +1,211 @@
+"""
+Zenith — Speculative Diagnosis.
+
+Starts a diagnosis in the background while the user is still on the form,
+so the click that asks for it finds the result in flight or already
+cached. The controller reports the form on every rerun through observe().
+Once the required fields are filled in and the form has stayed unchanged
+for the debounce delay, the diagnosis starts.
+
+An edit before then reschedules it at no cost. An edit after it started
+supersedes it: its deadline is cancelled, so the call stops at its next
+checkpoint instead of generating a draft nobody will see (a request
+already sent upstream is still paid for), and it is counted as wasted.
+The click calls promote(), which cancels a speculation that has not
+started; the click's own diagnosis then joins the speculative call
+through single-flight coalescing, or reads its cached result. A form that
+was last clicked, or whose speculation completed, is not speculated
+again: its diagnosis is already cached.
+
+Waste is bounded twice: a session stops speculating once it has wasted its
+allowance of calls, and speculative calls in flight are capped process-wide.
+Speculative calls are charged to the session like any other; one that
+fails (over budget, upstream error) is logged and left to the click.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from config import (
+    SPECULATION_DEBOUNCE_SECONDS,
+    SPECULATION_MAX_IN_FLIGHT,
+    SPECULATION_MAX_SESSIONS,
+    SPECULATION_MAX_WASTED_PER_SESSION,
+)
+from metrics import registry, request_trace
+from domain.models import TelemetryInput
+from domain.exceptions import ZenithException
+from repository.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Speculation:
+    """One scheduled speculative diagnosis."""
+
+    telemetry: TelemetryInput
+    timer: Optional[threading.Timer] = None
+    started: bool = False
+    deadline: Optional[Deadline] = None
+
+
+@dataclass
+class _SessionState:
+    current: Optional[_Speculation] = None
+    wasted: int = 0
+    # Telemetry last diagnosed for the session, by a click or a speculation
+    settled: Optional[TelemetryInput] = None
+
+
+class Speculator:
+    """Debounced background diagnoses of forms that are still being edited.
+
+    Args:
+        diagnose: Runs one diagnosis for (telemetry, session_id, deadline),
+            such as DiagnosticsService.run_diagnostics; its result is
+            discarded.
+        debounce_seconds: How long the form must stay unchanged before a
+            speculation starts.
+        max_in_flight: Speculative calls allowed to run at once, process-wide.
+        max_wasted: Wasted calls after which a session stops speculating.
+        max_sessions: Sessions tracked before the least recent is forgotten.
+    """
+
+    def __init__(
+        self,
+        diagnose: Callable[[TelemetryInput, str, Deadline], object],
+        debounce_seconds: float = SPECULATION_DEBOUNCE_SECONDS,
+        max_in_flight: int = SPECULATION_MAX_IN_FLIGHT,
+        max_wasted: int = SPECULATION_MAX_WASTED_PER_SESSION,
+        max_sessions: int = SPECULATION_MAX_SESSIONS,
+    ) -> None:
+        self._diagnose = diagnose
+        self.debounce_seconds = max(0.0, debounce_seconds)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_wasted = max(0, max_wasted)
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, _SessionState]" = OrderedDict()
+        self._in_flight = 0
+        self._counts = {
+            "scheduled": 0,
+            "superseded": 0,
+            "started": 0,
+            "promoted": 0,
+            "wasted": 0,
+            "skipped": 0,
+        }
+        self._lock = threading.Lock()
+        registry.register_collector("speculation", self.stats)
+
+    def observe(self, telemetry: TelemetryInput, session_id: str) -> None:
+        """Report the current contents of a session's form (call on every rerun)."""
+        with self._lock:
+            state = self._session(session_id)
+            current = state.current
+            if current is not None and current.telemetry == telemetry:
+                return
+            self._retire(state)
+            if telemetry == state.settled:
+                return
+            if not telemetry.has_required_fields or state.wasted >= self.max_wasted:
+                return
+            speculation = _Speculation(telemetry)
+            speculation.timer = threading.Timer(
+                self.debounce_seconds, self._start, args=(session_id, speculation)
+            )
+            speculation.timer.daemon = True
+            state.current = speculation
+            self._counts["scheduled"] += 1
+        speculation.timer.start()
+
+    def promote(self, telemetry: TelemetryInput, session_id: str) -> bool:
+        """Hand the session's speculation over to a click asking for telemetry.
+
+        Returns:
+            bool: True if a started speculation matches, so the click joins
+            it or reads its cached result; otherwise it is cancelled or
+            counted as wasted.
+        """
+        with self._lock:
+            state = self._session(session_id)
+            state.settled = telemetry
+            current = state.current
+            if current is None:
+                return False
+            if current.started and current.telemetry == telemetry:
+                state.current = None
+                self._counts["promoted"] += 1
+                return True
+            self._retire(state)
+            return False
+
+    def stats(self) -> dict:
+        """Return speculation counters, calls in flight and the share wasted."""
+        with self._lock:
+            counts = dict(self._counts)
+            in_flight = self._in_flight
+        started = counts["started"]
+        return {
+            **counts,
+            "in_flight": in_flight,
+            "waste_rate": counts["wasted"] / started if started else 0.0,
+        }
+
+    def _session(self, session_id: str) -> _SessionState:
+        """Return the session's state, forgetting the least recent (caller holds the lock)."""
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionState()
+            if len(self._sessions) > self.max_sessions:
+                _, oldest = self._sessions.popitem(last=False)
+                self._retire(oldest)
+        else:
+            self._sessions.move_to_end(session_id)
+        return state
+
+    def _retire(self, state: _SessionState) -> None:
+        """Drop the session's current speculation (caller holds the lock)."""
+        current = state.current
+        state.current = None
+        if current is None:
+            return
+        if not current.started:
+            current.timer.cancel()
+            self._counts["superseded"] += 1
+            return
+        current.deadline.cancel()
+        state.wasted += 1
+        self._counts["wasted"] += 1
+        if state.wasted == self.max_wasted:
+            logger.info("Session wasted its speculative calls; no longer speculating.")
+
+    def _start(self, session_id: str, speculation: _Speculation) -> None:
+        """Timer callback: run the speculation unless it was superseded meanwhile."""
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None or state.current is not speculation:
+                return
+            if self._in_flight >= self.max_in_flight:
+                state.current = None
+                self._counts["skipped"] += 1
+                return
+            speculation.started = True
+            speculation.deadline = Deadline()
+            self._in_flight += 1
+            self._counts["started"] += 1
+        completed = False
+        try:
+            with request_trace("speculative"):
+                self._diagnose(speculation.telemetry, session_id, speculation.deadline)
+            completed = True
+        except ZenithException as exc:
+            logger.info(f"Speculative diagnosis failed: {exc}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if completed:
+                    state.settled = speculation.telemetry
@@ -0,0 +1,116 @@
+"""
+Zenith — Incremental Diagnosis JSON Parser.
+
+Consumes the diagnosis JSON document in arbitrary text chunks (as they
+arrive from a streaming generate call) and reports each top-level section
+the moment its closing brace is seen: the "diagnosis" and "compatibility"
+objects, and every element of the "tweaks" and "do_not_do" arrays.
+
+The scanner only tracks string/escape state and nesting depth, so each
+character is inspected exactly once; completed sections are decoded with
+json.loads on their own slice of the buffer.
+"""
+
+import json
+from typing import List, Optional, Tuple
+
+from domain.exceptions import DataParsingError
+
+# Top-level keys whose object value is emitted as a single section.
+_OBJECT_SECTIONS = {"diagnosis": "diagnosis", "compatibility": "compatibility"}
+# Top-level keys whose array elements are emitted one by one.
+_ARRAY_SECTIONS = {"tweaks": "tweak", "do_not_do": "do_not_do"}
+
+
+class IncrementalSectionParser:
+    """Streaming scanner that yields (kind, raw_dict) for each completed section."""
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._value_start = -1
+        self._element_start = -1
+
+    def feed(self, chunk: str) -> List[Tuple[str, dict]]:
+        """Consume the next chunk of response text.
+
+        Args:
+            chunk: The next fragment of the JSON document.
+
+        Returns:
+            The sections completed by this chunk, in document order, as
+            (kind, raw_dict) pairs where kind is one of "diagnosis",
+            "compatibility", "tweak" or "do_not_do".
+
+        Raises:
+            DataParsingError: If a completed section is not valid JSON.
+        """
+        completed: List[Tuple[str, dict]] = []
+        if not chunk:
+            return completed
+        self._text += chunk
+
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1 : i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._value_start = i
+                elif self._depth == 3 and self._current_key in _ARRAY_SECTIONS:
+                    self._element_start = i
+            elif ch == "}" or ch == "]":
+                if self._depth == 2 and self._current_key in _OBJECT_SECTIONS:
+                    raw = self._decode(text[self._value_start : i + 1])
+                    if isinstance(raw, dict):
+                        completed.append((_OBJECT_SECTIONS[self._current_key], raw))
+                elif self._depth == 3 and self._current_key in _ARRAY_SECTIONS:
+                    raw = self._decode(text[self._element_start : i + 1])
+                    if isinstance(raw, dict):
+                        completed.append((_ARRAY_SECTIONS[self._current_key], raw))
+                self._depth -= 1
+
+        self._pos = len(text)
+        return completed
+
+    def finish(self) -> dict:
+        """Decode and return the complete document once the stream has ended.
+
+        Raises:
+            DataParsingError: If the accumulated text is not a valid JSON object.
+        """
+        raw = self._decode(self._text)
+        if not isinstance(raw, dict):
+            raise DataParsingError("Streamed Gemini response is not a JSON object.")
+        return raw
+
+    @staticmethod
+    def _decode(fragment: str) -> object:
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError as exc:
+            raise DataParsingError(
+                f"Failed to parse streamed Gemini response as JSON: {exc}"
+            ) from exc
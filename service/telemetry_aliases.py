@@ -0,0 +1,293 @@
+"""
+Zenith — Telemetry Alias Tables.
+
+Static lookup tables used by the telemetry canonicaliser. All keys are
+lower-case and whitespace-collapsed; values are the canonical lower-case
+form (token tables) or the canonical display string (phrase tables).
+These are plain data with no runtime dependencies.
+"""
+
+# Token-level rewrites applied to hardware fields before vendor inference.
+# A value may expand one token into several ("r5" -> "ryzen 5").
+HARDWARE_TOKEN_ALIASES = {
+    "nvdia": "nvidia",
+    "nvida": "nvidia",
+    "nv": "nvidia",
+    "amd's": "amd",
+    "intels": "intel",
+    "r3": "ryzen 3",
+    "r5": "ryzen 5",
+    "r7": "ryzen 7",
+    "r9": "ryzen 9",
+    "ryzen3": "ryzen 3",
+    "ryzen5": "ryzen 5",
+    "ryzen7": "ryzen 7",
+    "ryzen9": "ryzen 9",
+    "tr": "threadripper",
+    "gforce": "geforce",
+    "rtx2060": "rtx 2060",
+    "rtx3050": "rtx 3050",
+    "rtx3060": "rtx 3060",
+    "rtx3070": "rtx 3070",
+    "rtx3080": "rtx 3080",
+    "rtx3090": "rtx 3090",
+    "rtx4060": "rtx 4060",
+    "rtx4070": "rtx 4070",
+    "rtx4080": "rtx 4080",
+    "rtx4090": "rtx 4090",
+    "gtx1050": "gtx 1050",
+    "gtx1060": "gtx 1060",
+    "gtx1650": "gtx 1650",
+    "gtx1660": "gtx 1660",
+    "rx580": "rx 580",
+    "rx6600": "rx 6600",
+    "rx6700": "rx 6700",
+    "rx7900": "rx 7900",
+}
+
+# Family tokens mapped to the vendor/brand tokens that must precede them.
+# The first family token found in a field decides the canonical prefix.
+FAMILY_PREFIXES = {
+    "ryzen": ("amd",),
+    "threadripper": ("amd", "ryzen"),
+    "athlon": ("amd",),
+    "radeon": ("amd",),
+    "rx": ("amd", "radeon"),
+    "core": ("intel",),
+    "xeon": ("intel",),
+    "pentium": ("intel",),
+    "celeron": ("intel",),
+    "arc": ("intel",),
+    "geforce": ("nvidia",),
+    "rtx": ("nvidia", "geforce"),
+    "gtx": ("nvidia", "geforce"),
+    "quadro": ("nvidia",),
+    "m1": ("apple",),
+    "m2": ("apple",),
+    "m3": ("apple",),
+    "m4": ("apple",),
+}
+
+# Display casing for well-known tokens; anything else falls back to the
+# generic rules in the canonicaliser.
+DISPLAY_CASE = {
+    "amd": "AMD",
+    "nvidia": "NVIDIA",
+    "intel": "Intel",
+    "apple": "Apple",
+    "ryzen": "Ryzen",
+    "threadripper": "Threadripper",
+    "athlon": "Athlon",
+    "radeon": "Radeon",
+    "rx": "RX",
+    "xt": "XT",
+    "xtx": "XTX",
+    "core": "Core",
+    "ultra": "Ultra",
+    "xeon": "Xeon",
+    "pentium": "Pentium",
+    "celeron": "Celeron",
+    "arc": "Arc",
+    "geforce": "GeForce",
+    "rtx": "RTX",
+    "gtx": "GTX",
+    "quadro": "Quadro",
+    "ti": "Ti",
+    "super": "SUPER",
+    "pro": "Pro",
+    "max": "Max",
+    "laptop": "Laptop",
+    "mobile": "Mobile",
+    "ddr3": "DDR3",
+    "ddr4": "DDR4",
+    "ddr5": "DDR5",
+    "lpddr5": "LPDDR5",
+    "of": "of",
+    "the": "the",
+    "ii": "II",
+    "iii": "III",
+    "iv": "IV",
+    "v": "V",
+}
+
+# Canonical display spellings for measurement units.
+UNIT_DISPLAY = {
+    "kb": "KB",
+    "mb": "MB",
+    "gb": "GB",
+    "tb": "TB",
+    "mhz": "MHz",
+    "ghz": "GHz",
+}
+
+# Whole-field aliases for operating systems (matched after normalisation).
+OS_ALIASES = {
+    "windows 10": "Windows 10",
+    "win 10": "Windows 10",
+    "win10": "Windows 10",
+    "w10": "Windows 10",
+    "windows10": "Windows 10",
+    "windows 11": "Windows 11",
+    "win 11": "Windows 11",
+    "win11": "Windows 11",
+    "w11": "Windows 11",
+    "windows11": "Windows 11",
+    "linux": "Linux",
+    "gnu/linux": "Linux",
+    "macos": "macOS",
+    "mac os": "macOS",
+    "mac": "macOS",
+    "osx": "macOS",
+    "os x": "macOS",
+    "mac os x": "macOS",
+}
+
+# Whole-field aliases for storage classes.
+STORAGE_ALIASES = {
+    "nvme ssd": "NVMe SSD",
+    "nvme": "NVMe SSD",
+    "m.2": "NVMe SSD",
+    "m.2 ssd": "NVMe SSD",
+    "m.2 nvme": "NVMe SSD",
+    "pcie ssd": "NVMe SSD",
+    "sata ssd": "SATA SSD",
+    "ssd": "SATA SSD",
+    "sata": "SATA SSD",
+    "hdd": "HDD",
+    "hard drive": "HDD",
+    "hard disk": "HDD",
+    "spinning disk": "HDD",
+}
+
+# Whole-field aliases for popular target applications.
+APPLICATION_ALIASES = {
+    "cs2": "Counter-Strike 2",
+    "cs 2": "Counter-Strike 2",
+    "counter strike 2": "Counter-Strike 2",
+    "counter-strike 2": "Counter-Strike 2",
+    "csgo": "Counter-Strike: Global Offensive",
+    "cs:go": "Counter-Strike: Global Offensive",
+    "gta v": "Grand Theft Auto V",
+    "gta 5": "Grand Theft Auto V",
+    "gta5": "Grand Theft Auto V",
+    "gtav": "Grand Theft Auto V",
+    "grand theft auto 5": "Grand Theft Auto V",
+    "grand theft auto v": "Grand Theft Auto V",
+    "lol": "League of Legends",
+    "league": "League of Legends",
+    "league of legends": "League of Legends",
+    "valorant": "Valorant",
+    "val": "Valorant",
+    "vscode": "Visual Studio Code",
+    "vs code": "Visual Studio Code",
+    "visual studio code": "Visual Studio Code",
+    "minecraft": "Minecraft Java Edition",
+    "minecraft java": "Minecraft Java Edition",
+    "minecraft java edition": "Minecraft Java Edition",
+    "mc": "Minecraft Java Edition",
+    "minecraft bedrock": "Minecraft Bedrock Edition",
+    "cyberpunk": "Cyberpunk 2077",
+    "cyberpunk 2077": "Cyberpunk 2077",
+    "cp2077": "Cyberpunk 2077",
+    "elden ring": "Elden Ring",
+    "eldenring": "Elden Ring",
+    "fortnite": "Fortnite",
+    "apex": "Apex Legends",
+    "apex legends": "Apex Legends",
+    "r6": "Rainbow Six Siege",
+    "r6s": "Rainbow Six Siege",
+    "rainbow six siege": "Rainbow Six Siege",
+    "pubg": "PUBG: Battlegrounds",
+    "pubg battlegrounds": "PUBG: Battlegrounds",
+    "warzone": "Call of Duty: Warzone",
+    "cod warzone": "Call of Duty: Warzone",
+    "call of duty warzone": "Call of Duty: Warzone",
+    "destiny 2": "Destiny 2",
+    "destiny2": "Destiny 2",
+    "skyrim": "The Elder Scrolls V: Skyrim",
+    "skyrim se": "The Elder Scrolls V: Skyrim Special Edition",
+    "dota 2": "Dota 2",
+    "dota2": "Dota 2",
+    "chrome": "Google Chrome",
+    "google chrome": "Google Chrome",
+    "blender": "Blender",
+    "premiere": "Adobe Premiere Pro",
+    "premiere pro": "Adobe Premiere Pro",
+    "adobe premiere pro": "Adobe Premiere Pro",
+    "photoshop": "Adobe Photoshop",
+    "adobe photoshop": "Adobe Photoshop",
+    "obs": "OBS Studio",
+    "obs studio": "OBS Studio",
+}
+
+# Symptom words that carry no signal for near-duplicate matching.
+SYMPTOM_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "at",
+        "be",
+        "but",
+        "during",
+        "every",
+        "for",
+        "from",
+        "game",
+        "games",
+        "gets",
+        "get",
+        "has",
+        "have",
+        "i",
+        "in",
+        "is",
+        "it",
+        "its",
+        "me",
+        "my",
+        "of",
+        "on",
+        "or",
+        "so",
+        "some",
+        "the",
+        "then",
+        "there",
+        "this",
+        "to",
+        "very",
+        "really",
+        "when",
+        "while",
+        "with",
+    }
+)
+
+# Symptom terms (after suffix stripping) folded onto one representative.
+SYMPTOM_SYNONYMS = {
+    "large": "big",
+    "huge": "big",
+    "massive": "big",
+    "heavy": "big",
+    "battle": "fight",
+    "teamfight": "fight",
+    "combat": "fight",
+    "hitch": "stutter",
+    "jitter": "stutter",
+    "freez": "freeze",
+    "hang": "freeze",
+    "ctd": "crash",
+    "framerate": "fps",
+    "frame": "fps",
+    "sluggish": "slow",
+    "startup": "launch",
+    "start": "launch",
+    "boot": "launch",
+    "hot": "heat",
+    "overheat": "heat",
+    "thermal": "heat",
+    "temp": "heat",
+    "temperature": "heat",
+}
@@ -0,0 +1,327 @@
+"""
+Zenith — Telemetry Canonicalisation.
+
+Normalises the free-text TelemetryInput fields so that equivalent machine
+profiles ("Ryzen 5 5600X", "amd ryzen5 5600x", "R5 5600X ") collapse to a
+single canonical form and a stable fingerprint. The canonical form is what
+gets sent to the model, cached, and deduplicated.
+
+Every per-field function is a pure function of its input and is memoised,
+since real traffic repeats the same handful of hardware strings heavily.
+
+CPU and GPU fields that name a model in the hardware catalog (even by bare
+model number, "3060") are replaced by the catalog name and carry its
+specification; the RAM field is parsed into capacity, generation and speed,
+and relabelled uniformly when that is all it holds.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+from domain.models import HardwareSpec, MemorySpec, TelemetryInput
+from service.hardware_catalog import get_catalog, memory_label, parse_memory
+from service.telemetry_aliases import (
+    APPLICATION_ALIASES,
+    DISPLAY_CASE,
+    FAMILY_PREFIXES,
+    HARDWARE_TOKEN_ALIASES,
+    OS_ALIASES,
+    STORAGE_ALIASES,
+    SYMPTOM_STOPWORDS,
+    SYMPTOM_SYNONYMS,
+    UNIT_DISPLAY,
+)
+
+NOT_SPECIFIED = "Not specified"
+
+_FIELD_CACHE_SIZE = 8192
+
+_SYMBOLS_RE = re.compile(r"\((?:tm|r|c)\)|[™®©,;|]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_UNIT_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*"
+    r"(gb|gib|gigs?|gigabytes?|tb|tib|terabytes?|mb|mib|megabytes?|kb|mhz|ghz)\b"
+)
+_INTEL_MODEL_RE = re.compile(r"\bi([3579])[\s-]?(\d{3,5}[a-z]{0,3})\b")
+_GPU_SUFFIX_RE = re.compile(r"\b(\d{3,4})(xtx|xt|ti|super)\b")
+_UNIT_TOKEN_RE = re.compile(r"^(\d+(?:\.\d+)?)(kb|mb|gb|tb|mhz|ghz)$")
+_INTEL_TOKEN_RE = re.compile(r"^i[3579]-")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_UNIT_SPELLINGS = {
+    "gib": "gb",
+    "gig": "gb",
+    "gigs": "gb",
+    "gigabyte": "gb",
+    "gigabytes": "gb",
+    "tib": "tb",
+    "terabyte": "tb",
+    "terabytes": "tb",
+    "mib": "mb",
+    "megabyte": "mb",
+    "megabytes": "mb",
+}
+
+
+@dataclass(frozen=True)
+class CanonicalTelemetry:
+    """A canonicalised TelemetryInput paired with its stable fingerprint."""
+
+    telemetry: TelemetryInput
+    fingerprint: str
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lower-case, strip trademark symbols and collapse whitespace."""
+    if not text:
+        return ""
+    text = _SYMBOLS_RE.sub(" ", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _unit_repl(match: "re.Match[str]") -> str:
+    unit = match.group(2)
+    return match.group(1) + _UNIT_SPELLINGS.get(unit, unit)
+
+
+def _display_token(token: str) -> str:
+    """Render a canonical lower-case token with its conventional casing."""
+    cased = DISPLAY_CASE.get(token)
+    if cased is not None:
+        return cased
+    unit = _UNIT_TOKEN_RE.match(token)
+    if unit:
+        return unit.group(1) + UNIT_DISPLAY[unit.group(2)]
+    if _INTEL_TOKEN_RE.match(token):
+        return "i" + token[1:].upper()
+    if any(ch.isdigit() for ch in token):
+        return token.upper()
+    return token[:1].upper() + token[1:]
+
+
+def _display(tokens: Tuple[str, ...]) -> str:
+    return " ".join(_display_token(t) for t in tokens)
+
+
+def _dedupe_adjacent(tokens: list) -> list:
+    out = []
+    for token in tokens:
+        if not out or out[-1] != token:
+            out.append(token)
+    return out
+
+
+def _hardware_tokens(norm: str) -> Tuple[str, ...]:
+    """Split a normalised hardware description into canonical lower-case tokens.
+
+    Normalises unit spellings, expands token aliases and guarantees the
+    vendor prefix implied by the product family.
+    """
+    norm = _UNIT_RE.sub(_unit_repl, norm)
+    norm = _INTEL_MODEL_RE.sub(r"core i\1-\2", norm)
+    norm = _GPU_SUFFIX_RE.sub(r"\1 \2", norm)
+
+    tokens = []
+    for token in norm.split(" "):
+        tokens.extend(HARDWARE_TOKEN_ALIASES.get(token, token).split(" "))
+    tokens = _dedupe_adjacent(tokens)
+
+    for token in tokens:
+        prefix = FAMILY_PREFIXES.get(token)
+        if prefix is not None:
+            tokens = list(prefix) + [t for t in tokens if t not in prefix]
+            break
+
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=_FIELD_CACHE_SIZE)
+def canonicalize_hardware(text: Optional[str]) -> str:
+    """Canonicalise a CPU, GPU or RAM description.
+
+    Normalises case, whitespace and unit spellings, expands token aliases
+    and guarantees the vendor prefix implied by the product family.
+    """
+    norm = _normalize(text)
+    if not norm:
+        return ""
+    if norm == "not specified":
+        return NOT_SPECIFIED
+    return _display(_hardware_tokens(norm))
+
+
+def resolve_hardware(canonical: str, kind: str) -> Optional[HardwareSpec]:
+    """Look up the catalog model named by a canonical CPU or GPU field.
+
+    A bare model number ("3060", "5800X3D") resolves when exactly one
+    catalog model of that kind ends with it.
+
+    Args:
+        canonical: Output of canonicalize_hardware.
+        kind: "cpu" or "gpu".
+    """
+    if not canonical or canonical == NOT_SPECIFIED:
+        return None
+    return get_catalog(kind).resolve(canonical)
+
+
+def suggest_hardware(
+    text: Optional[str], kind: str, limit: int = 5
+) -> List[HardwareSpec]:
+    """Return catalog models matching a partly typed CPU or GPU, for type-ahead.
+
+    The input goes through the same alias and vendor-prefix expansion as
+    canonicalize_hardware, so "rtx 30" or "i7 137" find their models.
+
+    Args:
+        text: The raw text typed so far.
+        kind: "cpu" or "gpu".
+        limit: Maximum number of suggestions.
+    """
+    norm = _normalize(text)
+    if not norm or norm == "not specified":
+        return []
+    return get_catalog(kind).suggest(" ".join(_hardware_tokens(norm)), limit)
+
+
+@lru_cache(maxsize=_FIELD_CACHE_SIZE)
+def canonicalize_application(text: Optional[str]) -> str:
+    """Canonicalise the target application name via the bundled alias table."""
+    norm = _normalize(text)
+    if not norm:
+        return ""
+    alias = APPLICATION_ALIASES.get(norm)
+    if alias is not None:
+        return alias
+    return _display(tuple(norm.split(" ")))
+
+
+@lru_cache(maxsize=256)
+def canonicalize_os(text: Optional[str]) -> str:
+    """Canonicalise the operating system name."""
+    norm = _normalize(text)
+    if not norm:
+        return ""
+    return OS_ALIASES.get(norm) or _display(tuple(norm.split(" ")))
+
+
+@lru_cache(maxsize=256)
+def canonicalize_storage(text: Optional[str]) -> str:
+    """Canonicalise the storage class."""
+    norm = _normalize(text)
+    if not norm:
+        return ""
+    return STORAGE_ALIASES.get(norm) or _display(tuple(norm.split(" ")))
+
+
+def canonicalize_symptoms(text: Optional[str]) -> str:
+    """Collapse whitespace in the symptom description, preserving its wording."""
+    collapsed = _WHITESPACE_RE.sub(" ", text or "").strip()
+    if not collapsed or collapsed.lower() == "not specified":
+        return NOT_SPECIFIED
+    return collapsed
+
+
+def _stem(word: str) -> str:
+    """Strip common English inflections ("stuttering", "fights") from a word."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouls":
+                word = word[:-1]
+            return word
+    if word.endswith(("shes", "ches", "xes", "sses", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=_FIELD_CACHE_SIZE)
+def symptom_terms(symptoms: str) -> FrozenSet[str]:
+    """Reduce a symptom description to its set of content terms.
+
+    Words are lower-cased and stemmed, stopwords dropped and synonyms folded,
+    so "stutters in big fights" and "stuttering during large fights" give
+    the same set. Used for near-duplicate matching, not for the fingerprint.
+    """
+    if symptoms == NOT_SPECIFIED:
+        return frozenset()
+    terms = set()
+    for word in _WORD_RE.findall(symptoms.lower()):
+        if word in SYMPTOM_STOPWORDS:
+            continue
+        stem = _stem(word)
+        terms.add(SYMPTOM_SYNONYMS.get(stem, stem))
+    return frozenset(terms)
+
+
+@lru_cache(maxsize=_FIELD_CACHE_SIZE)
+def _processor_field(
+    text: Optional[str], kind: str
+) -> Tuple[str, Optional[HardwareSpec]]:
+    """Canonical CPU or GPU field, replaced by the catalog name when recognised."""
+    canonical = canonicalize_hardware(text)
+    spec = resolve_hardware(canonical, kind)
+    return (spec.name if spec else canonical), spec
+
+
+@lru_cache(maxsize=_FIELD_CACHE_SIZE)
+def _memory_field(text: Optional[str]) -> Tuple[str, Optional[MemorySpec]]:
+    """Canonical RAM field, relabelled uniformly when it parses completely."""
+    canonical = canonicalize_hardware(text) or NOT_SPECIFIED
+    canonical = memory_label(canonical) or canonical
+    return canonical, parse_memory(canonical)
+
+
+def telemetry_fingerprint(telemetry: TelemetryInput) -> str:
+    """Return a stable hex fingerprint of an already-canonical TelemetryInput.
+
+    Symptoms are case-folded so that capitalisation alone never splits a key.
+    """
+    material = "\x1f".join(
+        (
+            telemetry.cpu,
+            telemetry.gpu,
+            telemetry.ram,
+            telemetry.storage,
+            telemetry.os_name,
+            telemetry.application,
+            telemetry.symptoms.casefold(),
+        )
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def canonicalize_telemetry(telemetry: TelemetryInput) -> CanonicalTelemetry:
+    """Canonicalise every field of a TelemetryInput and fingerprint the result.
+
+    Args:
+        telemetry: The raw telemetry captured from the user.
+
+    Returns:
+        CanonicalTelemetry: The canonical TelemetryInput and its fingerprint.
+    """
+    cpu, cpu_spec = _processor_field(telemetry.cpu, "cpu")
+    gpu, gpu_spec = _processor_field(telemetry.gpu, "gpu")
+    ram, ram_spec = _memory_field(telemetry.ram)
+    canonical = TelemetryInput(
+        cpu=cpu,
+        gpu=gpu,
+        ram=ram,
+        storage=canonicalize_storage(telemetry.storage),
+        os_name=canonicalize_os(telemetry.os_name),
+        application=canonicalize_application(telemetry.application),
+        symptoms=canonicalize_symptoms(telemetry.symptoms),
+        cpu_spec=cpu_spec,
+        gpu_spec=gpu_spec,
+        ram_spec=ram_spec,
+    )
+    return CanonicalTelemetry(
+        telemetry=canonical, fingerprint=telemetry_fingerprint(canonical)
+    )
@@ -0,0 +1,215 @@
+"""
+Zenith — Token Ledger and Budgets.
+
+Aggregates the tokens every diagnosis consumed per session, per model and
+per UTC day, and enforces the configured budgets before a request reaches
+the model. A request over budget is rejected with BudgetExceededError or,
+with action "downgrade", sent to the cheaper fallback model instead.
+Downgrading trades answer quality for cost; it is not a hard cap.
+
+Budgets are checked before a call and charged after it, so concurrent
+requests may overshoot a budget by at most one diagnosis each. Cache hits
+and coalesced followers spend nothing and are neither charged nor
+checked. A coalesced call is charged to the session that led it.
+
+Sessions are kept in least-recently-used order and the oldest are
+forgotten beyond max_sessions; per-model and per-day totals are kept for
+the life of the process.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    BUDGET_ACTION,
+    BUDGET_FALLBACK_MODEL,
+    LEDGER_MAX_SESSIONS,
+    TOKEN_BUDGET_PER_DAY,
+    TOKEN_BUDGET_PER_SESSION,
+)
+from metrics import registry
+from domain.models import TokenUsage
+from domain.exceptions import BudgetExceededError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ACTIONS = ("reject", "downgrade")
+
+registry.describe("zenith_tokens_total", "Model tokens consumed by model and kind.")
+
+
+@dataclass
+class UsageTotals:
+    """Running token totals for one session, model or day."""
+
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def add(self, usage: TokenUsage) -> None:
+        self.requests += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.output_tokens += usage.output_tokens
+
+
+class TokenLedger:
+    """Thread-safe token accounting with per-session and daily budgets.
+
+    Args:
+        session_budget: Tokens one session may spend (0 = unlimited).
+        daily_budget: Tokens all sessions together may spend per UTC day
+            (0 = unlimited).
+        action: "reject" or "downgrade" once a budget is spent.
+        fallback_model: Model used for downgraded requests.
+        max_sessions: Sessions tracked before the least recent is forgotten.
+        clock: Source of wall-clock time, used to bucket days.
+    """
+
+    def __init__(
+        self,
+        session_budget: int = TOKEN_BUDGET_PER_SESSION,
+        daily_budget: int = TOKEN_BUDGET_PER_DAY,
+        action: str = BUDGET_ACTION,
+        fallback_model: str = BUDGET_FALLBACK_MODEL,
+        max_sessions: int = LEDGER_MAX_SESSIONS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if action not in BUDGET_ACTIONS:
+            raise ConfigurationError(
+                f"Unknown budget action '{action}'; expected 'reject' or 'downgrade'."
+            )
+        self.session_budget = max(0, session_budget)
+        self.daily_budget = max(0, daily_budget)
+        self.action = action
+        self.fallback_model = fallback_model
+        self.max_sessions = max(1, max_sessions)
+        self._clock = clock
+        self._sessions: "OrderedDict[str, UsageTotals]" = OrderedDict()
+        self._models: Dict[str, UsageTotals] = {}
+        self._days: Dict[str, UsageTotals] = {}
+        self._rejected = 0
+        self._downgraded = 0
+        self._lock = threading.Lock()
+
+    def admit(self, session_id: str, model: str) -> str:
+        """Return the model a new diagnosis for the session may use.
+
+        Raises:
+            BudgetExceededError: If a budget is spent and the action is "reject".
+        """
+        with self._lock:
+            exceeded = self._exceeded(session_id)
+            if exceeded is None:
+                return model
+            if self.action == "downgrade":
+                self._downgraded += 1
+            else:
+                self._rejected += 1
+        if self.action == "downgrade":
+            logger.warning(
+                f"{exceeded} token budget spent; downgrading session "
+                f"{session_id[:8]} to {self.fallback_model}."
+            )
+            return self.fallback_model
+        logger.warning(
+            f"{exceeded} token budget spent; rejecting session {session_id[:8]}."
+        )
+        raise BudgetExceededError(
+            f"The {exceeded.lower()} token budget has been spent. Please try again later."
+        )
+
+    def record(self, session_id: str, usage: TokenUsage) -> None:
+        """Charge one call's usage to the session, its model and today."""
+        day = self._today()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = UsageTotals()
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            session.add(usage)
+            self._models.setdefault(usage.model, UsageTotals()).add(usage)
+            self._days.setdefault(day, UsageTotals()).add(usage)
+        for kind, count in (
+            ("prompt", usage.prompt_tokens),
+            ("cached", usage.cached_tokens),
+            ("output", usage.output_tokens),
+        ):
+            registry.inc("zenith_tokens_total", count, model=usage.model, kind=kind)
+
+    def session_totals(self, session_id: str) -> UsageTotals:
+        with self._lock:
+            totals = self._sessions.get(session_id)
+            return UsageTotals(**vars(totals)) if totals else UsageTotals()
+
+    def top_sessions(self, limit: int = 10) -> List[Tuple[str, UsageTotals]]:
+        """Return the sessions that spent the most tokens, largest first."""
+        with self._lock:
+            ranked = sorted(
+                self._sessions.items(),
+                key=lambda item: item[1].total_tokens,
+                reverse=True,
+            )
+            return [(sid, UsageTotals(**vars(t))) for sid, t in ranked[:limit]]
+
+    def by_model(self) -> Dict[str, UsageTotals]:
+        with self._lock:
+            return {m: UsageTotals(**vars(t)) for m, t in self._models.items()}
+
+    def by_day(self) -> Dict[str, UsageTotals]:
+        with self._lock:
+            return {d: UsageTotals(**vars(t)) for d, t in sorted(self._days.items())}
+
+    def stats(self) -> dict:
+        """Return today's totals, session count and budget enforcement counters."""
+        day = self._today()
+        with self._lock:
+            today = self._days.get(day, UsageTotals())
+            return {
+                "today_tokens": today.total_tokens,
+                "today_requests": today.requests,
+                "sessions": len(self._sessions),
+                "rejected": self._rejected,
+                "downgraded": self._downgraded,
+            }
+
+    def _exceeded(self, session_id: str) -> Optional[str]:
+        """Name the budget that is spent, if any (caller holds the lock)."""
+        if self.daily_budget:
+            today = self._days.get(self._today())
+            if today is not None and today.total_tokens >= self.daily_budget:
+                return "Daily"
+        if self.session_budget:
+            session = self._sessions.get(session_id)
+            if session is not None and session.total_tokens >= self.session_budget:
+                return "Session"
+        return None
+
+    def _today(self) -> str:
+        return time.strftime("%Y-%m-%d", time.gmtime(self._clock()))
+
+
+_shared_ledger: Optional[TokenLedger] = None
+_shared_ledger_lock = threading.Lock()
+
+
+def get_shared_ledger() -> TokenLedger:
+    """Return the process-wide TokenLedger, creating it on first use."""
+    global _shared_ledger
+    if _shared_ledger is None:
+        with _shared_ledger_lock:
+            if _shared_ledger is None:
+                _shared_ledger = TokenLedger()
+    return _shared_ledger
@@ -0,0 +1,110 @@
+"""
+Zenith — Batch Runner Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from service.batch_runner import run_batch
+
+
+class _StubService:
+    """Stands in for DiagnosticsService; answers with whatever respond returns."""
+
+    def __init__(self, respond) -> None:
+        self.respond = respond
+
+    def _validate_telemetry(self, telemetry) -> None:
+        pass
+
+    async def run_diagnostics_async(self, telemetry, session_id=None):
+        return self.respond(telemetry)
+
+
+@dataclass
+class _Result:
+    usage: None = None
+
+
+def _write_records(path, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as records:
+        for i in range(count):
+            record = {
+                "id": f"r{i}",
+                "cpu": "AMD Ryzen 5 5600X",
+                "gpu": "NVIDIA GeForce RTX 3060",
+                "os_name": "Windows 11",
+                "application": f"App {i}",
+            }
+            records.write(json.dumps(record) + "\n")
+
+
+def test_unexpected_record_error_fails_the_row(tmp_path):
+    def respond(telemetry):
+        raise KeyError("bottleneck_type")
+
+    _write_records(tmp_path / "in.jsonl", 10)
+    summary = asyncio.run(
+        asyncio.wait_for(
+            run_batch(
+                str(tmp_path / "in.jsonl"),
+                str(tmp_path / "out.jsonl"),
+                _StubService(respond),
+                concurrency=1,
+            ),
+            timeout=5,
+        )
+    )
+    assert summary.failed == 10
+    rows = (tmp_path / "out.jsonl").read_text().splitlines()
+    assert [json.loads(row)["error"]["type"] for row in rows] == ["KeyError"] * 10
+
+
+def test_worker_crash_stops_the_batch_instead_of_hanging(tmp_path):
+    def respond(telemetry):
+        # Not a dataclass, so recording the result itself fails
+        return object()
+
+    _write_records(tmp_path / "in.jsonl", 10)
+    with pytest.raises(TypeError):
+        asyncio.run(
+            asyncio.wait_for(
+                run_batch(
+                    str(tmp_path / "in.jsonl"),
+                    str(tmp_path / "out.jsonl"),
+                    _StubService(respond),
+                    concurrency=1,
+                ),
+                timeout=5,
+            )
+        )
+
+
+def test_resume_does_not_repeat_invalid_rows(tmp_path):
+    _write_records(tmp_path / "in.jsonl", 3)
+    with open(tmp_path / "in.jsonl", "a", encoding="utf-8") as records:
+        records.write("{not json\n")
+        records.write("[1, 2]\n")
+
+    def run():
+        return asyncio.run(
+            run_batch(
+                str(tmp_path / "in.jsonl"),
+                str(tmp_path / "out.jsonl"),
+                _StubService(lambda telemetry: _Result()),
+                concurrency=1,
+            )
+        )
+
+    first = run()
+    second = run()
+    assert (first.succeeded, first.invalid) == (3, 2)
+    assert (second.succeeded, second.invalid, second.resumed) == (0, 0, 5)
+    rows = (tmp_path / "out.jsonl").read_text().splitlines()
+    statuses = sorted(json.loads(row)["status"] for row in rows)
+    assert statuses == ["invalid", "invalid", "ok", "ok", "ok"]
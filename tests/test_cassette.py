@@ -0,0 +1,35 @@
+"""
+Zenith — Record/Replay Cassette Tests.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from domain.exceptions import ExternalServiceError
+from repository.cassette import CassetteStore, RecordingBackend, ReplayBackend
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+
+
+def test_replay_serves_the_recorded_response(tmp_path):
+    store = CassetteStore(str(tmp_path / "traffic.cassette"))
+    recorder = RecordingBackend(SyntheticDiagnosisBackend(latency_ms=0), store)
+    recorded = recorder.fetch_diagnosis("prompt", model="gemini-2.0-flash")
+    store.close()
+
+    replay = ReplayBackend(
+        CassetteStore(str(tmp_path / "traffic.cassette")), latency_scale=0
+    )
+    assert replay.fetch_diagnosis("prompt", model="gemini-2.0-flash") == recorded
+    assert replay.hits == 1
+
+
+def test_replay_of_an_unrecorded_request_fails(tmp_path):
+    store = CassetteStore(str(tmp_path / "traffic.cassette"))
+    RecordingBackend(SyntheticDiagnosisBackend(latency_ms=0), store).fetch_diagnosis(
+        "prompt", model="gemini-2.0-flash"
+    )
+    replay = ReplayBackend(store, latency_scale=0)
+    with pytest.raises(ExternalServiceError):
+        replay.fetch_diagnosis("prompt", model="gemini-2.5-pro")
+    assert replay.misses == 1
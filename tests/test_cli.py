@@ -0,0 +1,39 @@
+"""
+Zenith — Headless CLI Tests.
+
+Run with: python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs a diagnosis through the CLI, then reports whether Streamlit was loaded.
+_SCRIPT = """
+import sys
+from zenith.cli import main
+code = main(["diagnose", "--cpu", "Ryzen 5 5600X", "--gpu", "RTX 3060",
+             "--storage", "NVMe SSD", "--os", "Windows 11", "--app", "Elden Ring"])
+print(code, "streamlit" in sys.modules, file=sys.stderr)
+"""
+
+
+def test_diagnose_runs_headless_without_streamlit():
+    env = {
+        **os.environ,
+        "ZENITH_BACKEND": "synthetic",
+        "ZENITH_SYNTHETIC_LATENCY_MS": "0",
+    }
+    done = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert done.stderr.split()[-2:] == ["0", "False"], done.stderr
+    assert "diagnosis" in json.loads(done.stdout)
@@ -0,0 +1,67 @@
+"""
+Zenith — Diagnosis Cache Tests.
+
+Run with: python -m pytest tests
+"""
+
+import time
+
+from repository.diagnosis_cache import DiagnosisCache, build_cache_key
+
+PAYLOAD = {"diagnosis": {"bottleneck_type": "GPU"}}
+
+
+def _key(**overrides) -> str:
+    request = {
+        "fingerprint": "telemetry",
+        "model": "gemini-2.0-flash",
+        "temperature": 0.2,
+        "system_prompt": "prompt",
+        "schema_hash": "schema",
+        **overrides,
+    }
+    return build_cache_key(**request)
+
+
+def test_key_covers_every_generation_input():
+    base = _key()
+    assert _key() == base
+    for change in (
+        {"fingerprint": "other"},
+        {"model": "gemini-2.5-pro"},
+        {"temperature": 0.7},
+        {"system_prompt": "other prompt"},
+        {"schema_hash": "other schema"},
+        {"max_output_tokens": 512},
+    ):
+        assert _key(**change) != base, change
+
+
+def test_entries_expire_after_the_ttl():
+    cache = DiagnosisCache(ttl_seconds=0.05)
+    cache.set("key", PAYLOAD)
+    assert cache.get("key") == PAYLOAD
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_memory_tier_evicts_the_least_recently_used():
+    cache = DiagnosisCache(max_entries=2)
+    cache.set("a", PAYLOAD)
+    cache.set("b", PAYLOAD)
+    cache.get("a")
+    cache.set("c", PAYLOAD)
+    assert cache.get("b") is None
+    assert cache.get("a") == PAYLOAD
+
+
+def test_sqlite_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = DiagnosisCache(db_path=path)
+    first.set("key", PAYLOAD)
+    first.close()
+    second = DiagnosisCache(db_path=path)
+    assert second.get("key") == PAYLOAD
+    assert second.stats()["disk_hits"] == 1
+    second.close()
@@ -0,0 +1,127 @@
+"""
+Zenith — Diagnostics Service Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from domain.exceptions import ExternalServiceError, RequestCancelledError
+from domain.models import TelemetryInput
+from domain.schema import SECTION_GROUPS
+from repository.deadline import Deadline, bounded_sleep
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+from service.single_flight import SingleFlight
+
+TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Regression Test App",
+    symptoms="stutter in busy scenes",
+)
+
+
+class _CountingBackend(SyntheticDiagnosisBackend):
+    """The synthetic backend, remembering the sections of every call."""
+
+    def __init__(self) -> None:
+        super().__init__(latency_ms=0)
+        self.calls = []
+
+    def fetch_diagnosis(self, structured_prompt, sections=(), **kwargs):
+        self.calls.append(tuple(sections))
+        return super().fetch_diagnosis(structured_prompt, sections=sections, **kwargs)
+
+
+class _SlowAsyncBackend(SyntheticDiagnosisBackend):
+    """The synthetic backend with a fixed delay, counting asyncio calls."""
+
+    def __init__(self) -> None:
+        super().__init__(latency_ms=100, latency_distribution="fixed")
+        self.async_calls = 0
+
+    async def fetch_diagnosis_async(self, structured_prompt, **kwargs):
+        self.async_calls += 1
+        return await super().fetch_diagnosis_async(structured_prompt, **kwargs)
+
+
+class _FirstPartFails:
+    """Fails the first section group at once; the others take seconds."""
+
+    def __init__(self) -> None:
+        self.cancelled = []
+        self._lock = threading.Lock()
+
+    def fetch_diagnosis(self, structured_prompt, sections=(), **kwargs):
+        if tuple(sections) == SECTION_GROUPS[0]:
+            raise ExternalServiceError("upstream rejected the request")
+        try:
+            bounded_sleep(5.0, "network")
+        except RequestCancelledError:
+            with self._lock:
+                self.cancelled.append(tuple(sections))
+            raise
+        return {}
+
+
+def test_parallel_part_failure_cancels_the_other_parts():
+    backend = _FirstPartFails()
+    service = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=backend,
+        similar=SimilarityIndex(),
+        flights=SingleFlight(max_workers=len(SECTION_GROUPS)),
+    )
+    with pytest.raises(ExternalServiceError):
+        service.run_parallel_diagnostics(TELEMETRY, deadline=Deadline(30))
+    waited = time.monotonic() + 2.0
+    while len(backend.cancelled) < len(SECTION_GROUPS) - 1:
+        assert time.monotonic() < waited, "abandoned parts were not cancelled"
+        time.sleep(0.01)
+    assert sorted(backend.cancelled) == sorted(SECTION_GROUPS[1:])
+
+
+def test_two_phase_diagnosis_fetches_details_once():
+    backend = _CountingBackend()
+    service = DiagnosticsService(
+        cache=DiagnosisCache(), repository=backend, similar=SimilarityIndex()
+    )
+    triage = service.triage_diagnostics(TELEMETRY)
+    assert not triage.is_complete
+    assert triage.tweaks == []
+    details = service.detail_diagnostics(TELEMETRY, triage)
+    assert details.is_complete
+    assert details.diagnosis == triage.diagnosis
+    # The full document is cached: a repeat costs no call
+    repeat = service.detail_diagnostics(TELEMETRY, triage)
+    assert repeat.tweaks == details.tweaks
+    assert len(backend.calls) == 2
+
+
+def test_concurrent_async_requests_share_one_call():
+    backend = _SlowAsyncBackend()
+    service = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=backend,
+        similar=SimilarityIndex(),
+        flights=SingleFlight(),
+    )
+
+    async def scenario() -> list:
+        return await asyncio.gather(
+            *(service.run_diagnostics_async(TELEMETRY) for _ in range(5))
+        )
+
+    results = asyncio.run(scenario())
+    assert backend.async_calls == 1
+    assert all(result.diagnosis == results[0].diagnosis for result in results)
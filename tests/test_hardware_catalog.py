@@ -0,0 +1,27 @@
+"""
+Zenith — Hardware Catalog Tests.
+
+Run with: python -m pytest tests
+"""
+
+from service.hardware_catalog import get_catalog, memory_label, parse_memory
+
+
+def test_model_number_resolves_to_one_model():
+    gpus = get_catalog("gpu")
+    assert gpus.resolve("3060").name == "NVIDIA GeForce RTX 3060"
+    # Shared by many models, so it names none of them
+    assert gpus.resolve("ti") is None
+
+
+def test_suggestions_match_any_name_suffix_by_prefix():
+    names = [spec.name for spec in get_catalog("cpu").suggest("ryzen 5 56")]
+    assert names == ["AMD Ryzen 5 5600", "AMD Ryzen 5 5600X"]
+    assert len(get_catalog("gpu").suggest("rtx 40", limit=3)) == 3
+
+
+def test_memory_descriptions_parse_into_specs():
+    spec = parse_memory("16GB DDR4 3200MHz")
+    assert (spec.capacity_gb, spec.generation, spec.speed_mhz) == (16, "DDR4", 3200)
+    assert memory_label("16GB DDR4-3200") == "16GB DDR4 3200MHz"
+    assert memory_label("2x8GB") is None
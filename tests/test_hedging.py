@@ -0,0 +1,151 @@
+"""
+Zenith — Hedged Request Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import threading
+import time
+
+from domain.exceptions import RequestCancelledError
+from domain.models import GenerationSettings, TelemetryInput, TokenUsage
+from repository.deadline import Deadline, bounded_sleep, deadline_scope
+from repository.diagnosis_cache import DiagnosisCache
+from repository.hedging import HedgedBackend, HedgePolicy
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from repository.usage import metered, report_usage
+from service.diagnostics_service import DiagnosticsService
+from service.model_router import ComplexityRouter, ModelTier
+from service.similarity_index import SimilarityIndex
+from service.single_flight import SingleFlight
+from service.token_ledger import TokenLedger
+
+TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Regression Test App",
+    symptoms="stutter in busy scenes",
+)
+
+
+class _SlowPrimary:
+    """Answers at once, except prompt "slow" on the primary model "m".
+
+    A slow call either blocks uninterruptibly, like an HTTP request already
+    sent, or sleeps cooperatively, like a retry backoff.
+    """
+
+    def __init__(self, interruptible: bool) -> None:
+        self.interruptible = interruptible
+        self.stopped = threading.Event()
+
+    def fetch_diagnosis(self, structured_prompt, model="m", sections=(), settings=None):
+        if structured_prompt == "slow" and model == "m":
+            if self.interruptible:
+                try:
+                    bounded_sleep(2.0, "network")
+                except RequestCancelledError:
+                    self.stopped.set()
+                    raise
+            else:
+                time.sleep(0.3)
+        report_usage(TokenUsage(model=model, prompt_tokens=100, output_tokens=10))
+        return {"model": model}
+
+
+def _hedged(interruptible: bool) -> HedgedBackend:
+    policy = HedgePolicy(
+        min_samples=3, min_delay_seconds=0, max_rate=1.0, hedge_model="fallback"
+    )
+    backend = HedgedBackend(_SlowPrimary(interruptible), policy)
+    for _ in range(5):
+        backend.fetch_diagnosis("fast", model="m")
+    return backend
+
+
+def test_losing_hedge_usage_is_charged_late():
+    backend = _hedged(interruptible=False)
+    late = []
+    with metered(late=late.append) as reports:
+        assert backend.fetch_diagnosis("slow", model="m") == {"model": "fallback"}
+    assert [usage.model for usage in reports] == ["fallback"]
+    waited = time.monotonic() + 2.0
+    while not late:
+        assert time.monotonic() < waited, "the loser's usage was dropped"
+        time.sleep(0.01)
+    assert [usage.model for usage in late] == ["m"]
+
+
+def test_losing_hedge_is_stopped_through_its_deadline():
+    backend = _hedged(interruptible=True)
+    with deadline_scope(Deadline(30)):
+        assert backend.fetch_diagnosis("slow", model="m") == {"model": "fallback"}
+    assert backend.inner.stopped.wait(0.5)
+
+
+class _SlowModel:
+    """A synthetic backend whose primary model "m" answers late, uninterruptibly."""
+
+    def __init__(self) -> None:
+        self.synthetic = SyntheticDiagnosisBackend(latency_ms=0)
+
+    def fetch_diagnosis(self, structured_prompt, model="m", **kwargs):
+        if model == "m":
+            time.sleep(0.3)
+            report_usage(TokenUsage(model=model, prompt_tokens=100, output_tokens=10))
+            return {}
+        return self.synthetic.fetch_diagnosis(structured_prompt, model=model, **kwargs)
+
+
+def test_hedge_model_win_is_charged_per_model_and_not_cached():
+    policy = HedgePolicy(
+        min_samples=1, min_delay_seconds=0, max_rate=1.0, hedge_model="fallback"
+    )
+    policy.observe("m", "fetch", 0.01)
+    tier = ModelTier("standard", "m", GenerationSettings(0.2), 1.0)
+    ledger = TokenLedger()
+    cache = DiagnosisCache()
+    similar = SimilarityIndex()
+    service = DiagnosticsService(
+        cache=cache,
+        repository=HedgedBackend(_SlowModel(), policy),
+        flights=SingleFlight(),
+        ledger=ledger,
+        similar=similar,
+        router=ComplexityRouter((tier,), enabled=True),
+    )
+    result = service.run_diagnostics(TELEMETRY)
+    assert result.usage.model == "fallback"
+    # The fallback's document is not what model "m"'s key describes
+    assert cache.stats()["memory_entries"] == 0
+    assert similar.stats()["entries"] == 0
+    waited = time.monotonic() + 2.0
+    while "m" not in ledger.by_model():
+        assert time.monotonic() < waited, "the loser's usage was dropped"
+        time.sleep(0.01)
+    assert sorted(ledger.by_model()) == ["fallback", "m"]
+
+
+def test_usage_on_two_models_is_charged_to_each():
+    ledger = TokenLedger()
+    service = DiagnosticsService(
+        cache=DiagnosisCache(),
+        repository=SyntheticDiagnosisBackend(latency_ms=0),
+        ledger=ledger,
+    )
+    usage = service._charge(
+        "session",
+        [
+            TokenUsage(model="m", prompt_tokens=100, output_tokens=10),
+            TokenUsage(model="fallback", prompt_tokens=80, output_tokens=20),
+            TokenUsage(model="m", prompt_tokens=1, output_tokens=1),
+        ],
+    )
+    assert usage.model == "m+fallback"
+    assert usage.total_tokens == 212
+    totals = ledger.by_model()
+    assert totals["m"].total_tokens == 112
+    assert totals["fallback"].total_tokens == 100
@@ -0,0 +1,50 @@
+"""
+Zenith — Complexity Router Tests.
+
+Run with: python -m pytest tests
+"""
+
+from domain.models import GenerationSettings, TelemetryInput
+from service.model_router import STANDARD_TIER, ComplexityRouter, ModelTier
+from service.telemetry_canonicalizer import canonicalize_telemetry
+
+LIGHT = ModelTier("light", "gemini-2.0-flash-lite", GenerationSettings(0.1), 0.3)
+HEAVY = ModelTier("heavy", "gemini-2.5-pro", GenerationSettings(0.2), 1.0)
+
+SIMPLE = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Valorant",
+    symptoms="Not specified",
+)
+COMPLEX = TelemetryInput(
+    cpu="Some Unlisted Engineering Sample",
+    gpu="Prototype Graphics Board",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Custom In-House Simulator",
+    symptoms=(
+        "random crashes after long sessions, audio crackling, fps drops in "
+        "menus, textures flicker and the fans spin up while idle"
+    ),
+)
+
+
+def _canonical(telemetry: TelemetryInput) -> TelemetryInput:
+    return canonicalize_telemetry(telemetry).telemetry
+
+
+def test_simple_requests_go_to_the_light_tier():
+    router = ComplexityRouter((LIGHT, HEAVY), enabled=True)
+    assert router.route(_canonical(SIMPLE)) is LIGHT
+    assert router.route(_canonical(COMPLEX)) is HEAVY
+    assert router.stats()["light"]["routed"] == 1
+
+
+def test_disabled_routing_uses_the_standard_tier():
+    router = ComplexityRouter((LIGHT, HEAVY), enabled=False)
+    assert router.route(_canonical(COMPLEX)) is STANDARD_TIER
@@ -0,0 +1,98 @@
+"""
+Zenith — Resilience Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from domain.exceptions import DeadlineExceededError
+from repository.deadline import Deadline, deadline_scope
+from repository.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    CircuitBreaker,
+    ResilientCaller,
+    RetryPolicy,
+)
+
+
+def _half_open_caller() -> ResilientCaller:
+    """A caller whose breaker is open with its reset timeout already passed."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+    return ResilientCaller(RetryPolicy(max_attempts=1), breaker)
+
+
+def test_cancelled_async_probe_releases_half_open_slot():
+    caller = _half_open_caller()
+
+    async def scenario() -> None:
+        probe = asyncio.ensure_future(caller.call_async(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+
+        async def ok() -> str:
+            return "ok"
+
+        for _ in range(3):
+            assert await caller.call_async(ok) == "ok"
+
+    asyncio.run(scenario())
+    assert caller.breaker.state == CLOSED
+
+
+def test_interrupted_sync_probe_releases_half_open_slot():
+    caller = _half_open_caller()
+
+    def interrupted() -> None:
+        raise KeyboardInterrupt
+
+    try:
+        caller.call(interrupted)
+    except KeyboardInterrupt:
+        pass
+    assert caller.breaker.state == HALF_OPEN
+    assert caller.call(lambda: "ok") == "ok"
+    assert caller.breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    caller = _half_open_caller()
+
+    class Unavailable(Exception):
+        code = 503
+
+    def failing() -> None:
+        raise Unavailable()
+
+    try:
+        caller.call(failing)
+    except Unavailable:
+        pass
+    assert caller.breaker.stats()["opens"] == 2
+
+
+def test_transport_error_after_the_callers_deadline_spares_the_breaker():
+    caller = ResilientCaller(
+        RetryPolicy(max_attempts=3), CircuitBreaker(failure_threshold=1)
+    )
+
+    def timed_out() -> None:
+        time.sleep(0.1)
+        raise httpx.ReadTimeout("the caller's deadline cut the read short")
+
+    with deadline_scope(Deadline(0.05)):
+        with pytest.raises(DeadlineExceededError):
+            caller.call(timed_out)
+    assert caller.breaker.state == CLOSED
+    assert caller.stats()["breaker"]["consecutive_failures"] == 0
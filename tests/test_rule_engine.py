@@ -0,0 +1,48 @@
+"""
+Zenith — Local Rule Engine Tests.
+
+Run with: python -m pytest tests
+"""
+
+from dataclasses import replace
+
+from domain.models import TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from service.diagnostics_service import DiagnosticsService
+from service.similarity_index import SimilarityIndex
+
+BLOCKED = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="linux",
+    application="valorant",
+    symptoms="Not specified",
+)
+
+
+class _NoBackend:
+    """Fails the test if the model is ever called."""
+
+    def fetch_diagnosis(self, *args, **kwargs):
+        raise AssertionError("a rule-covered diagnosis called the model")
+
+
+def test_hard_blocker_is_answered_without_the_model():
+    service = DiagnosticsService(
+        cache=DiagnosisCache(), repository=_NoBackend(), similar=SimilarityIndex()
+    )
+    result = service.run_diagnostics(BLOCKED)
+    assert result.diagnosis.bottleneck_type == "Software"
+    assert result.compatibility.score == 0
+    assert result.tweaks == []
+    assert service.rules.hits()["vanguard_valorant"] >= 1
+
+
+def test_supported_platform_is_not_matched():
+    service = DiagnosticsService(
+        cache=DiagnosisCache(), repository=_NoBackend(), similar=SimilarityIndex()
+    )
+    supported = service._canonicalize(replace(BLOCKED, os_name="Windows 11"))[0]
+    assert service.rules.match(supported) is None
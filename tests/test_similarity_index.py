@@ -0,0 +1,91 @@
+"""
+Zenith — Near-Duplicate Index Tests.
+
+Run with: python -m pytest tests
+"""
+
+import time
+from dataclasses import replace
+
+from domain.models import GenerationSettings, TelemetryInput
+from repository.diagnosis_cache import DiagnosisCache
+from repository.synthetic_backend import SyntheticDiagnosisBackend
+from service.diagnostics_service import DiagnosticsService
+from service.model_router import ComplexityRouter, ModelTier
+from service.similarity_index import SimilarityIndex
+from service.telemetry_canonicalizer import canonicalize_telemetry
+
+TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="stutters in big fights with fps drops",
+)
+REWORDED = replace(TELEMETRY, symptoms="fps drops and stutters in big fights at night")
+DOCUMENT = {"diagnosis": {"bottleneck_type": "GPU"}}
+
+
+def _canonical(telemetry: TelemetryInput) -> TelemetryInput:
+    return canonicalize_telemetry(telemetry).telemetry
+
+
+def test_reworded_symptoms_reuse_a_past_diagnosis():
+    index = SimilarityIndex(threshold=0.5)
+    index.add(_canonical(TELEMETRY), "config", DOCUMENT)
+    document, similarity = index.lookup(_canonical(REWORDED), "config")
+    assert document is DOCUMENT
+    assert 0.5 <= similarity < 1.0
+
+
+def test_identical_terms_are_left_to_the_cache():
+    index = SimilarityIndex(threshold=0.5)
+    index.add(_canonical(TELEMETRY), "config", DOCUMENT)
+    assert index.lookup(_canonical(TELEMETRY), "config") is None
+
+
+def test_other_generation_config_is_not_reused():
+    index = SimilarityIndex(threshold=0.5)
+    index.add(_canonical(TELEMETRY), "config", DOCUMENT)
+    assert index.lookup(_canonical(REWORDED), "other config") is None
+
+
+def test_entries_expire_with_the_ttl():
+    index = SimilarityIndex(threshold=0.5, ttl_seconds=0.05)
+    index.add(_canonical(TELEMETRY), "config", DOCUMENT)
+    time.sleep(0.1)
+    assert index.lookup(_canonical(REWORDED), "config") is None
+    assert index.stats()["entries"] == 0
+
+
+def test_size_cap_evicts_the_oldest_entries():
+    document = {"diagnosis": {"plain_english_explanation": "x" * 10_000}}
+    index = SimilarityIndex(threshold=0.5, max_bytes=30_000)
+    for i in range(5):
+        index.add(
+            _canonical(replace(TELEMETRY, application=f"App {i}")), "config", document
+        )
+    stats = index.stats()
+    assert stats["bytes"] <= 30_000
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 3
+
+
+def test_service_reuse_respects_generation_settings():
+    def service(settings: GenerationSettings) -> DiagnosticsService:
+        tier = ModelTier("standard", "gemini-2.0-flash", settings, 1.0)
+        return DiagnosticsService(
+            cache=DiagnosisCache(),
+            repository=SyntheticDiagnosisBackend(latency_ms=0),
+            similar=similar,
+            router=ComplexityRouter((tier,), enabled=True),
+        )
+
+    similar = SimilarityIndex(threshold=0.5)
+    service(GenerationSettings(0.2)).run_diagnostics(TELEMETRY)
+    same = service(GenerationSettings(0.2)).run_diagnostics(REWORDED)
+    assert same.reused_similarity is not None
+    other = service(GenerationSettings(0.9)).run_diagnostics(REWORDED)
+    assert other.reused_similarity is None
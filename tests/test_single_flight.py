@@ -0,0 +1,94 @@
+"""
+Zenith — Single-Flight Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from domain.exceptions import DeadlineExceededError, RequestCancelledError
+from repository.deadline import (
+    Deadline,
+    bounded_sleep_async,
+    checkpoint,
+    deadline_scope,
+)
+from service.single_flight import SingleFlight
+
+
+def _blocking_work(seconds: float):
+    """Work that cannot be interrupted for a while, then checks its deadline."""
+
+    def work(publish):
+        time.sleep(seconds)
+        checkpoint("network")
+        return "done"
+
+    return work
+
+
+def test_join_after_every_waiter_left_starts_a_fresh_flight():
+    flights = SingleFlight(max_workers=4)
+    gone = threading.Event()
+    with deadline_scope(Deadline(30, abandoned=gone.is_set)) as first:
+        abandoned = flights.join("key", _blocking_work(0.5))
+    gone.set()
+    with pytest.raises(RequestCancelledError):
+        abandoned.wait(first)
+    # The cancelled work is still blocked; a live caller must not inherit it
+    with deadline_scope(Deadline(30)) as second:
+        fresh = flights.join("key", _blocking_work(0.05))
+    assert fresh is not abandoned
+    assert fresh.wait(second) == "done"
+    assert flights.stats()["leaders"] == 2
+
+
+def test_async_follower_extends_the_shared_deadline():
+    flights = SingleFlight()
+
+    async def work() -> str:
+        await bounded_sleep_async(0.3, "network")
+        return "done"
+
+    async def caller(timeout: float) -> str:
+        with deadline_scope(Deadline(timeout)):
+            return await flights.run_async("key", work)
+
+    async def scenario() -> list:
+        return await asyncio.gather(caller(0.1), caller(5.0), return_exceptions=True)
+
+    leader, follower = asyncio.run(scenario())
+    assert isinstance(leader, DeadlineExceededError)
+    assert follower == "done"
+
+
+def test_async_task_is_cancelled_when_every_caller_gives_up():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def work() -> str:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "done"
+
+    async def caller() -> str:
+        with deadline_scope(Deadline(0.1)):
+            return await flights.run_async("key", work)
+
+    async def scenario() -> list:
+        results = await asyncio.gather(caller(), caller(), return_exceptions=True)
+        await asyncio.sleep(0.05)
+        # Checked while the loop still runs, before shutdown cancels leftovers
+        assert cancelled == [True]
+        assert flights.stats()["in_flight"] == 0
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, DeadlineExceededError) for r in results)
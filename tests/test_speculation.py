@@ -0,0 +1,71 @@
+"""
+Zenith — Speculative Diagnosis Regression Tests.
+
+Run with: python -m pytest tests
+"""
+
+import threading
+from dataclasses import replace
+
+from domain.exceptions import RequestCancelledError
+from domain.models import TelemetryInput
+from service.speculation import Speculator
+
+FORM = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="Not specified",
+)
+
+
+def test_superseded_speculation_is_cancelled():
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def diagnose(telemetry, session_id, deadline):
+        started.set()
+        try:
+            deadline.sleep(5.0, "network")
+        except RequestCancelledError:
+            cancelled.set()
+            raise
+
+    speculator = Speculator(diagnose, debounce_seconds=0.0)
+    speculator.observe(FORM, "session")
+    assert started.wait(1.0)
+    speculator.observe(replace(FORM, symptoms="stutters in big fights"), "session")
+    assert cancelled.wait(1.0)
+    assert speculator.stats()["wasted"] == 1
+
+
+def test_promoted_form_is_not_speculated_again():
+    finished = threading.Event()
+
+    def diagnose(telemetry, session_id, deadline):
+        finished.set()
+
+    speculator = Speculator(diagnose, debounce_seconds=0.0)
+    speculator.observe(FORM, "session")
+    assert finished.wait(1.0)
+    assert speculator.promote(FORM, "session")
+    # The reruns after the click report the form it just diagnosed
+    speculator.observe(FORM, "session")
+    speculator.observe(FORM, "session")
+    assert speculator.stats()["scheduled"] == 1
+    speculator.observe(replace(FORM, symptoms="stutters in big fights"), "session")
+    stats = speculator.stats()
+    assert stats["scheduled"] == 2
+    assert stats["wasted"] == 0
+
+
+def test_clicked_form_is_not_speculated_after_its_diagnosis():
+    speculator = Speculator(lambda *args: None, debounce_seconds=30.0)
+    assert not speculator.promote(FORM, "session")
+    speculator.observe(FORM, "session")
+    stats = speculator.stats()
+    assert stats["scheduled"] == 0
+    assert stats["wasted"] == 0
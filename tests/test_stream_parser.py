@@ -0,0 +1,42 @@
+"""
+Zenith — Incremental Section Parser Tests.
+
+Run with: python -m pytest tests
+"""
+
+import json
+
+import pytest
+
+from domain.exceptions import DataParsingError
+from service.stream_parser import IncrementalSectionParser
+
+DOCUMENT = {
+    "diagnosis": {"bottleneck_type": "GPU", "note": 'braces "{" in strings'},
+    "compatibility": None,
+    "tweaks": [{"title": "Lower shadows"}, {"title": "Cap fps \\ 60"}],
+    "do_not_do": [{"title": "Do not overvolt"}],
+}
+
+
+def test_sections_complete_in_order_across_any_chunking():
+    text = json.dumps(DOCUMENT)
+    for size in (1, 7, len(text)):
+        parser = IncrementalSectionParser()
+        sections = []
+        for start in range(0, len(text), size):
+            sections += parser.feed(text[start : start + size])
+        assert sections == [
+            ("diagnosis", DOCUMENT["diagnosis"]),
+            ("tweak", DOCUMENT["tweaks"][0]),
+            ("tweak", DOCUMENT["tweaks"][1]),
+            ("do_not_do", DOCUMENT["do_not_do"][0]),
+        ]
+        assert parser.finish() == DOCUMENT
+
+
+def test_truncated_stream_fails_to_finish():
+    parser = IncrementalSectionParser()
+    parser.feed(json.dumps(DOCUMENT)[:-5])
+    with pytest.raises(DataParsingError):
+        parser.finish()
@@ -0,0 +1,31 @@
+"""
+Zenith — Streamlit Internals Contract Tests.
+
+app.request_deadline reads private state of the pinned Streamlit release;
+these fail if an upgrade moves it.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from streamlit.runtime.scriptrunner.script_requests import (  # noqa: E402
+    RerunData,
+    ScriptRequests,
+    ScriptRequestType,
+)
+
+
+def test_script_requests_state_reports_a_pending_rerun():
+    requests = ScriptRequests()
+    assert requests._state == ScriptRequestType.CONTINUE
+    assert requests.request_rerun(RerunData())
+    assert requests._state == ScriptRequestType.RERUN
+
+
+def test_script_requests_state_reports_a_pending_stop():
+    requests = ScriptRequests()
+    requests.request_stop()
+    assert requests._state == ScriptRequestType.STOP
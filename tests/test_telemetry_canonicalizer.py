@@ -0,0 +1,52 @@
+"""
+Zenith — Telemetry Canonicalization Tests.
+
+Run with: python -m pytest tests
+"""
+
+from dataclasses import replace
+
+from domain.models import TelemetryInput
+from service.telemetry_canonicalizer import canonicalize_telemetry
+
+TELEMETRY = TelemetryInput(
+    cpu="AMD Ryzen 5 5600X",
+    gpu="NVIDIA GeForce RTX 3060",
+    ram="16GB",
+    storage="NVMe SSD",
+    os_name="Windows 11",
+    application="Elden Ring",
+    symptoms="Stutters in big fights",
+)
+SPELLED_DIFFERENTLY = TelemetryInput(
+    cpu="ryzen 5 5600x",
+    gpu="rtx 3060",
+    ram="16 gb",
+    storage="nvme ssd",
+    os_name="win 11",
+    application="ELDEN RING",
+    symptoms="stutters in  big fights",
+)
+
+
+def test_spellings_of_the_same_system_share_a_fingerprint():
+    canonical = canonicalize_telemetry(SPELLED_DIFFERENTLY)
+    assert canonical.fingerprint == canonicalize_telemetry(TELEMETRY).fingerprint
+    assert canonical.telemetry.cpu == "AMD Ryzen 5 5600X"
+    assert canonical.telemetry.gpu == "NVIDIA GeForce RTX 3060"
+    assert canonical.telemetry.os_name == "Windows 11"
+
+
+def test_different_hardware_gets_a_different_fingerprint():
+    other = replace(SPELLED_DIFFERENTLY, gpu="rtx 3070")
+    assert (
+        canonicalize_telemetry(other).fingerprint
+        != canonicalize_telemetry(TELEMETRY).fingerprint
+    )
+
+
+def test_canonicalization_is_idempotent():
+    once = canonicalize_telemetry(SPELLED_DIFFERENTLY)
+    twice = canonicalize_telemetry(once.telemetry)
+    assert twice.fingerprint == once.fingerprint
+    assert twice.telemetry == once.telemetry
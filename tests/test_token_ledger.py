@@ -0,0 +1,43 @@
+"""
+Zenith — Token Ledger Tests.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from domain.exceptions import BudgetExceededError
+from domain.models import TokenUsage
+from service.token_ledger import TokenLedger
+
+USAGE = TokenUsage(model="gemini-2.0-flash", prompt_tokens=800, output_tokens=200)
+
+
+def test_spent_session_budget_rejects_only_that_session():
+    ledger = TokenLedger(session_budget=1000, daily_budget=0, action="reject")
+    ledger.record("spender", USAGE)
+    with pytest.raises(BudgetExceededError):
+        ledger.admit("spender", "gemini-2.0-flash")
+    assert ledger.admit("other", "gemini-2.0-flash") == "gemini-2.0-flash"
+    assert ledger.stats()["rejected"] == 1
+
+
+def test_spent_daily_budget_downgrades_every_session():
+    ledger = TokenLedger(
+        session_budget=0,
+        daily_budget=1000,
+        action="downgrade",
+        fallback_model="gemini-2.0-flash-lite",
+    )
+    ledger.record("spender", USAGE)
+    assert ledger.admit("other", "gemini-2.5-pro") == "gemini-2.0-flash-lite"
+
+
+def test_daily_budget_resets_on_the_next_utc_day():
+    now = [0.0]
+    ledger = TokenLedger(
+        session_budget=0, daily_budget=1000, action="reject", clock=lambda: now[0]
+    )
+    ledger.record("spender", USAGE)
+    now[0] += 24 * 3600
+    assert ledger.admit("spender", "gemini-2.0-flash") == "gemini-2.0-flash"
@@ -8,11 +8,22 @@ to mitigate XSS risk.
 """
 
 import html
-from typing import List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 import streamlit as st
 
-from domain.models import DiagnosticResponse, Diagnosis, Compatibility, Tweak, DoNotDo
+from domain.models import (
+    DiagnosticResponse,
+    DiagnosticSection,
+    Diagnosis,
+    Compatibility,
+    Tweak,
+    DoNotDo,
+    HardwareSpec,
+)
+
+if TYPE_CHECKING:
+    from service.token_ledger import UsageTotals
 
 
 def _sanitize(text: str) -> str:
@@ -171,19 +182,24 @@ def render_tweak_card(idx: int, tweak: Tweak) -> None:
     st.markdown(html_content, unsafe_allow_html=True)
 
 
+def render_do_not_do_item(item: DoNotDo) -> None:
+    """Render a single 'Do Not Do' warning card."""
+    action = _sanitize(item.action)
+    reason = _sanitize(item.reason)
+    html_content = (
+        '<div class="warning-card fade-in">'
+        f'<div style="font-weight:600; color:var(--status-red); font-size:0.85rem; margin-bottom:0.3rem;">✕ {action}</div>'
+        f'<p style="margin:0; font-size:0.8rem; color:var(--text-dim);">{reason}</p>'
+        "</div>"
+    )
+    st.markdown(html_content, unsafe_allow_html=True)
+
+
 def render_do_not_do(items: List[DoNotDo]) -> None:
     """Render the 'Do Not Do' warnings section."""
     st.markdown("### ⚠ Do Not Do")
     for item in items:
-        action = _sanitize(item.action)
-        reason = _sanitize(item.reason)
-        html_content = (
-            '<div class="warning-card fade-in">'
-            f'<div style="font-weight:600; color:var(--status-red); font-size:0.85rem; margin-bottom:0.3rem;">✕ {action}</div>'
-            f'<p style="margin:0; font-size:0.8rem; color:var(--text-dim);">{reason}</p>'
-            "</div>"
-        )
-        st.markdown(html_content, unsafe_allow_html=True)
+        render_do_not_do_item(item)
 
 
 def render_error(error_code: str, error_message: str) -> None:
@@ -206,8 +222,57 @@ def render_error(error_code: str, error_message: str) -> None:
     st.markdown(html_content, unsafe_allow_html=True)
 
 
+def render_reuse_notice(similarity: float) -> None:
+    """Render the label of a diagnosis reused from near-identical telemetry."""
+    html_content = (
+        '<div class="terminal-prompt fade-in" style="margin-bottom:1rem;">'
+        "reused: past diagnosis of identical hardware, "
+        f"symptoms {similarity:.0%} similar</div>"
+    )
+    st.markdown(html_content, unsafe_allow_html=True)
+
+
+def _pick_hardware(widget_key: str, name: str) -> None:
+    """Button callback: replace the typed text with the chosen catalog model."""
+    st.session_state[widget_key] = name
+
+
+def render_hardware_hint(
+    spec: Optional[HardwareSpec], suggestions: List[HardwareSpec], widget_key: str
+) -> None:
+    """Render the catalog spec of a recognised CPU/GPU, or type-ahead buttons.
+
+    Args:
+        spec: The catalog model the input resolves to, if any.
+        suggestions: Catalog models matching the partly typed input.
+        widget_key: Session-state key of the text input a suggestion fills.
+    """
+    if spec is not None:
+        st.markdown(
+            '<div class="terminal-prompt" style="font-size:0.75rem;">'
+            f"&gt; {_sanitize(spec.name)}: {_sanitize(spec.describe())}</div>",
+            unsafe_allow_html=True,
+        )
+        return
+    for suggestion in suggestions:
+        st.button(
+            suggestion.name,
+            key=f"{widget_key}_suggest_{suggestion.name}",
+            on_click=_pick_hardware,
+            args=(widget_key, suggestion.name),
+        )
+
+
 def render_full_results(result: DiagnosticResponse) -> None:
     """Orchestrate rendering of the full diagnostic result typed objects."""
+    render_triage_results(result)
+    render_detail_results(result)
+
+
+def render_triage_results(result: DiagnosticResponse) -> None:
+    """Render the verdict of a diagnosis: the diagnosis and compatibility sections."""
+    if result.reused_similarity is not None:
+        render_reuse_notice(result.reused_similarity)
     st.markdown("## Diagnosis")
     render_diagnosis_header(result.diagnosis)
     render_plain_english(result.diagnosis)
@@ -216,6 +281,9 @@ def render_full_results(result: DiagnosticResponse) -> None:
         st.markdown("## Compatibility")
         render_compatibility(result.compatibility)
 
+
+def render_detail_results(result: DiagnosticResponse) -> None:
+    """Render the optimizations and do-not-do warnings of a diagnosis."""
     if result.tweaks:
         st.markdown("## Optimizations")
         for idx, tweak in enumerate(result.tweaks[:3]):
@@ -224,3 +292,78 @@ def render_full_results(result: DiagnosticResponse) -> None:
     if result.do_not_do:
         st.markdown("---")
         render_do_not_do(result.do_not_do)
+
+
+def render_streaming_results(
+    sections: Iterable[DiagnosticSection], progress: Optional[object] = None
+) -> None:
+    """Render diagnostic sections progressively as they arrive from a stream.
+
+    Section headings are drawn the first time a section of that kind
+    arrives, so the page builds up in the same layout as render_full_results.
+
+    Args:
+        sections: Completed sections in arrival order.
+        progress: Optional st.empty() placeholder holding a progress message,
+            cleared as soon as the first section is ready.
+    """
+    tweak_count = 0
+    seen = set()
+    for section in sections:
+        if progress is not None:
+            progress.empty()
+            progress = None
+
+        kind = section.kind
+        if kind == "reused":
+            render_reuse_notice(section.value)
+        elif kind == "diagnosis":
+            st.markdown("## Diagnosis")
+            render_diagnosis_header(section.value)
+            render_plain_english(section.value)
+        elif kind == "compatibility":
+            st.markdown("## Compatibility")
+            render_compatibility(section.value)
+        elif kind == "tweak":
+            if tweak_count >= 3:
+                continue
+            if kind not in seen:
+                st.markdown("## Optimizations")
+            render_tweak_card(tweak_count, section.value)
+            tweak_count += 1
+        elif kind == "do_not_do":
+            if kind not in seen:
+                st.markdown("---")
+                st.markdown("### ⚠ Do Not Do")
+            render_do_not_do_item(section.value)
+        seen.add(kind)
+
+
+def _usage_table(label: str, rows: Iterable[Tuple[str, "UsageTotals"]]) -> str:
+    """Build a markdown table of token totals, one row per (key, totals) pair."""
+    lines = [
+        f"| {label} | requests | prompt | cached | output | total |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for key, totals in rows:
+        lines.append(
+            f"| {_sanitize(key)} | {totals.requests:,} | {totals.prompt_tokens:,} "
+            f"| {totals.cached_tokens:,} | {totals.output_tokens:,} "
+            f"| {totals.total_tokens:,} |"
+        )
+    return "\n".join(lines)
+
+
+def render_token_admin(
+    top_sessions: List[Tuple[str, "UsageTotals"]],
+    by_model: Dict[str, "UsageTotals"],
+    by_day: Dict[str, "UsageTotals"],
+) -> None:
+    """Render the token usage admin view: top consumers, then totals per model and per day."""
+    st.markdown("## >>> TOKEN_LEDGER")
+    st.markdown("### Top Sessions")
+    st.markdown(_usage_table("session", top_sessions))
+    st.markdown("### By Model")
+    st.markdown(_usage_table("model", by_model.items()))
+    st.markdown("### By Day (UTC)")
+    st.markdown(_usage_table("day", by_day.items()))
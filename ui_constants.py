@@ -1,9 +1,10 @@
 """
 Zenith — UI Constants.
 
-Contains the application's CSS theme (BRUTALIST_CSS) and the
-Gemini system prompt (SYSTEM_PROMPT). These are static strings
-with no runtime dependencies.
+Contains the application's CSS theme (BRUTALIST_CSS), the
+Gemini system prompt (SYSTEM_PROMPT) and the prompt scopes of a
+two-phase diagnosis. These are static strings with no runtime
+dependencies.
 """
 
 BRUTALIST_CSS = """
@@ -386,37 +387,35 @@ and always explain the risk
 
 ## Output Format
 
-Return a strictly valid JSON object with this exact schema — no markdown, no \
-explanation outside the JSON:
-
-{
-  "diagnosis": {
-    "bottleneck_type": "CPU | GPU | RAM | Storage | Thermal | Software | Mixed",
-    "severity": <integer 1-10>,
-    "secondary_bottleneck": "<type or null>",
-    "plain_english": "<2-3 sentence human-readable diagnosis>",
-    "reasoning": "<technical reasoning for this determination>"
-  },
-  "compatibility": {
-    "score": <integer 1-100>,
-    "note": "<one-line compatibility summary>"
-  },
-  "tweaks": [
-    {
-      "title": "<short descriptive title>",
-      "type": "Software | OS | Driver | Config | In-App",
-      "safety": "Safe | Caution | Advanced",
-      "steps": ["<step 1>", "<step 2>", "..."],
-      "commands": ["<CLI/PowerShell/terminal command to apply tweak>", "<another command>"],
-      "revert": "<how to undo this tweak>",
-      "rationale": "<why this helps for the diagnosed bottleneck>"
-    }
-  ],
-  "do_not_do": [
-    {
-      "action": "<what NOT to do>",
-      "reason": "<why it's dangerous or counterproductive>"
-    }
-  ]
-}
+Return a single JSON object. Its structure, allowed values and field meanings are enforced by the response schema supplied with this request — no markdown, no explanation outside the JSON.
+"""
+
+# Appended to the telemetry prompt of a two-phase or parallel diagnosis.
+# Triage asks for the verdict only; phase two restates it (as JSON) and asks
+# for the rest, while a parallel diagnosis asks for each part on its own.
+TRIAGE_INSTRUCTION = """
+## Response Scope
+Triage only: classify the system and determine the bottleneck and compatibility \
+(steps 0-3). Optimization tweaks and non-recommendations are requested separately.
+"""
+
+DETAILS_INSTRUCTION = """
+## Established Diagnosis
+The diagnosis and compatibility below are final. Provide only the optimization \
+tweaks and non-recommendations (steps 4-5), consistent with this diagnosis.
+```json
+{triage}
+```
+"""
+
+TWEAKS_INSTRUCTION = """
+## Response Scope
+Provide only the optimization tweaks (step 4) for the bottleneck you determine. \
+The diagnosis and non-recommendations are requested separately.
+"""
+
+DO_NOT_DO_INSTRUCTION = """
+## Response Scope
+Provide only the non-recommendations (step 5) for the bottleneck you determine. \
+The diagnosis and optimization tweaks are requested separately.
 """
@@ -0,0 +1 @@
+# zenith — Headless command-line entry point (`python -m zenith`); never imports Streamlit.
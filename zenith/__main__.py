@@ -0,0 +1,7 @@
+"""Allow `python -m zenith`."""
+
+import sys
+
+from zenith.cli import main
+
+sys.exit(main())
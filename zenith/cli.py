@@ -0,0 +1,213 @@
+"""
+Zenith — Headless Command-Line Interface.
+
+Runs diagnoses straight through DiagnosticsService without Streamlit, for
+cron jobs, CI pipelines and fleet tooling. This module must never import
+streamlit or the ui/ package.
+
+Usage:
+    python -m zenith diagnose --cpu "Ryzen 5 5600X" --gpu "RTX 3060" \\
+        --os "Windows 11" --storage "NVMe SSD" --app "Elden Ring"
+    python -m zenith diagnose --file machine.json --format summary
+    cat machine.json | python -m zenith diagnose --file -
+    python -m zenith batch fleet.jsonl results.jsonl --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from dataclasses import asdict
+from typing import List, Optional
+
+from domain.models import DiagnosticResponse
+from domain.exceptions import (
+    BudgetExceededError,
+    ConfigurationError,
+    DataParsingError,
+    ExternalServiceError,
+    ValidationError,
+    ZenithException,
+)
+
+# Exit codes, so scripts can tell failure classes apart.
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_VALIDATION = 2
+EXIT_EXTERNAL = 3
+EXIT_PARSING = 4
+EXIT_CONFIGURATION = 5
+EXIT_BUDGET = 6
+
+_EXIT_CODES = {
+    ValidationError: EXIT_VALIDATION,
+    ExternalServiceError: EXIT_EXTERNAL,
+    DataParsingError: EXIT_PARSING,
+    ConfigurationError: EXIT_CONFIGURATION,
+    BudgetExceededError: EXIT_BUDGET,
+}
+
+_FLAG_FIELDS = {
+    "cpu": "cpu",
+    "gpu": "gpu",
+    "ram": "ram",
+    "storage": "storage",
+    "os": "os_name",
+    "app": "application",
+    "symptoms": "symptoms",
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="zenith", description="ZENITH headless system diagnostics."
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log progress to stderr"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diagnose = commands.add_parser("diagnose", help="diagnose a single machine")
+    diagnose.add_argument(
+        "--file",
+        help="JSON object with telemetry fields ('-' reads stdin); flags override it",
+    )
+    diagnose.add_argument("--cpu")
+    diagnose.add_argument("--gpu")
+    diagnose.add_argument("--ram")
+    diagnose.add_argument("--storage", help="e.g. 'NVMe SSD', 'SATA SSD', 'HDD'")
+    diagnose.add_argument("--os", help="e.g. 'Windows 11', 'Linux', 'macOS'")
+    diagnose.add_argument("--app", help="target application or game")
+    diagnose.add_argument("--symptoms")
+    diagnose.add_argument(
+        "--format",
+        choices=("json", "summary"),
+        default="json",
+        help="output format (default: json)",
+    )
+
+    batch = commands.add_parser("batch", help="diagnose a JSONL/CSV fleet file")
+    batch.add_argument("input", help="JSONL or CSV file of telemetry records")
+    batch.add_argument("output", help="JSONL file results are appended to")
+    batch.add_argument("--concurrency", type=int, default=8)
+    batch.add_argument("--rate", type=float, help="max diagnoses started per second")
+    batch.add_argument("--checkpoint", help="checkpoint file for resuming")
+    return parser
+
+
+def _read_record(args: argparse.Namespace) -> dict:
+    record: dict = {}
+    if args.file:
+        if args.file == "-":
+            record = json.load(sys.stdin)
+        else:
+            with open(args.file, encoding="utf-8") as handle:
+                record = json.load(handle)
+        if not isinstance(record, dict):
+            raise ValidationError("Telemetry file must contain a JSON object.")
+    for flag, field_name in _FLAG_FIELDS.items():
+        value = getattr(args, flag)
+        if value is not None:
+            record[field_name] = value
+    return record
+
+
+def format_summary(result: DiagnosticResponse) -> str:
+    """Render a DiagnosticResponse as a compact plain-text terminal summary."""
+    diagnosis = result.diagnosis
+    lines = [
+        "ZENITH // DIAGNOSIS",
+        f"Bottleneck : {diagnosis.bottleneck_type} (severity {diagnosis.severity}/10)"
+        + (
+            f", secondary {diagnosis.secondary_bottleneck}"
+            if diagnosis.secondary_bottleneck
+            else ""
+        ),
+        f"Summary    : {diagnosis.plain_english}",
+    ]
+    if result.reused_similarity is not None:
+        lines.insert(
+            1,
+            f"Reused     : past diagnosis, symptoms "
+            f"{result.reused_similarity:.0%} similar",
+        )
+    if result.compatibility:
+        lines.append(
+            f"Compat.    : {result.compatibility.score}% — {result.compatibility.note}"
+        )
+    for idx, tweak in enumerate(result.tweaks[:3], start=1):
+        lines.append("")
+        lines.append(f"[{idx:02d}] {tweak.title} ({tweak.type}, {tweak.safety})")
+        lines.extend(f"     - {step}" for step in tweak.steps)
+        lines.extend(f"     $ {cmd}" for cmd in tweak.commands if cmd and cmd != "null")
+        if tweak.revert:
+            lines.append(f"     revert: {tweak.revert}")
+    if result.do_not_do:
+        lines.append("")
+        lines.append("DO NOT:")
+        lines.extend(f"  x {item.action} — {item.reason}" for item in result.do_not_do)
+    if result.usage:
+        lines.append("")
+        lines.append(
+            f"Tokens     : {result.usage.prompt_tokens} prompt "
+            f"({result.usage.cached_tokens} cached), "
+            f"{result.usage.output_tokens} output on {result.usage.model}"
+        )
+    return "\n".join(lines)
+
+
+def _diagnose(args: argparse.Namespace) -> int:
+    from service.batch_runner import telemetry_from_record
+    from service.diagnostics_service import DiagnosticsService
+
+    telemetry = telemetry_from_record(_read_record(args))
+    result = DiagnosticsService(warm_up=False).run_diagnostics(
+        telemetry, session_id="cli"
+    )
+    if args.format == "summary":
+        print(format_summary(result))
+    else:
+        print(json.dumps(asdict(result), indent=2, ensure_ascii=False))
+    return EXIT_OK
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from service.batch_runner import run_batch
+    from service.diagnostics_service import DiagnosticsService
+
+    summary = asyncio.run(
+        run_batch(
+            args.input,
+            args.output,
+            DiagnosticsService(warm_up=False),
+            concurrency=args.concurrency,
+            rate_per_second=args.rate,
+            checkpoint_path=args.checkpoint,
+        )
+    )
+    print(json.dumps(asdict(summary)), file=sys.stderr)
+    return EXIT_OK if not summary.failed else EXIT_EXTERNAL
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments, run the requested command, and return an exit code."""
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+    try:
+        if args.command == "batch":
+            return _batch(args)
+        return _diagnose(args)
+    except ZenithException as exc:
+        print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+        for exc_type, code in _EXIT_CODES.items():
+            if isinstance(exc, exc_type):
+                return code
+        return EXIT_ERROR
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"Input error: {exc}", file=sys.stderr)
+        return EXIT_ERROR